@@ -0,0 +1,298 @@
+"""
+Streaming statistics over game transcripts.
+Transcripts, from a game log or from the move history of GameState objects, are
+processed chunk by chunk as NumPy arrays in the game log record layout. The running
+aggregates have a fixed size (counters per packed state, a histogram), so memory does
+not grow with the number of games, and aggregates of separate shards can be merged.
+Run this module with the path of a game log to print its statistics.
+"""
+
+import time
+from functools import lru_cache
+from math import ceil
+import numpy as np
+import settings
+from state_space import StateSpace, encode_move
+from distance_table import DistanceTable, UNREACHABLE
+from batch_validator import BatchValidator
+from game_log import GameLogReader, OUTCOMES, record_dtype
+
+
+@lru_cache(maxsize=None)
+def get_puzzle_tables(size):
+    """
+    Get the tables shared by every aggregate of a puzzle size.
+    :param size: Tuple (missionaries, cannibals, capacity) representing the puzzle size.
+    :return: Tuple (game graph, distances as an int32 array, move index by packed move code,
+    -1 for codes that are not moves).
+    """
+    graph = StateSpace(*size)
+    distances = np.frombuffer(DistanceTable(graph).distances, dtype=np.uint16).astype(np.int32)
+    move_index = np.full(256, -1, dtype=np.int32)
+    for index, move in enumerate(graph.moves):
+        move_index[encode_move(move)] = index
+    return graph, distances, move_index
+
+
+def iter_game_transcripts(game_states):
+    """
+    Get the transcripts of finished games.
+    :param game_states: Iterable of GameState objects.
+    :return: Generator of tuples (outcome, packed moves, moves made).
+    """
+    for game_state in game_states:
+        moves = bytes(encode_move(move) for move in game_state.move_history)
+        yield game_state.outcome, moves, game_state.moves_made
+
+
+def iter_chunks(transcripts, chunk_size=settings.GAME_LOG_CHUNK_SIZE, max_moves=settings.GAME_LOG_MAX_MOVES):
+    """
+    Pack transcripts into chunks of game log records. The same buffer is filled for
+    every chunk, so a chunk must be processed before the next one is requested.
+    :param transcripts: Iterable of tuples (outcome, packed moves, moves made).
+    :param chunk_size: Integer representing the number of games per chunk.
+    :param max_moves: Integer representing the number of move slots, longer games keep their first moves.
+    :return: Generator of NumPy structured arrays, see `game_log.record_dtype`.
+    """
+    records = np.zeros(chunk_size, dtype=record_dtype(max_moves))
+    count = 0
+    for outcome, moves, moves_made in transcripts:
+        moves = moves[:max_moves]
+        record = records[count]
+        record["outcome"] = OUTCOMES.index(outcome)
+        record["length"] = len(moves)
+        record["moves_made"] = moves_made
+        record["moves"][:len(moves)] = np.frombuffer(bytes(moves), dtype=np.uint8)
+        record["moves"][len(moves):] = 0
+        count += 1
+        if count == chunk_size:
+            yield records
+            count = 0
+    if count:
+        yield records[:count]
+
+
+def iter_log_chunks(path, chunk_size=settings.GAME_LOG_CHUNK_SIZE, start=0, stop=None):
+    """
+    Read the records of a game log in chunks without copying them.
+    :param path: String representing the path of the game log.
+    :param chunk_size: Integer representing the number of games per chunk.
+    :param start: (optional) Integer representing the index of the first record.
+    :param stop: (optional) Integer representing the index after the last record, defaults to the end.
+    :return: Generator of NumPy structured arrays, views of the mapped log.
+    """
+    with GameLogReader(path) as reader:
+        stop = len(reader) if stop is None else stop
+        for first in range(start, stop, chunk_size):
+            yield reader.records[first:min(first + chunk_size, stop)]
+
+
+class GameStats:
+    """
+    Running aggregates of many games of one puzzle size.
+    Attributes:
+        size: Tuple (missionaries, cannibals, capacity) representing the puzzle size.
+        outcomes: Array counting the games per outcome, indexed like OUTCOMES.
+        moves_histogram: Array counting the games per number of moves made, the last bin
+        counts every game with at least `len(moves_histogram) - 1` moves.
+        moves_made_total: Integer representing the sum of the moves made.
+        moves_made_max: Integer representing the largest number of moves made.
+        losing_states: Array counting per packed state how many games were lost in it,
+        the state reached by the losing move.
+        suboptimal_moves: 2-D array counting per packed state and move (indexed like
+        StateSpace.moves) how often the move was made although it does not shorten the way to the goal.
+    """
+
+    def __init__(self, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                 capacity=settings.BOAT_CAPACITY, histogram_size=settings.GAME_STATS_HISTOGRAM_SIZE):
+        self.size = (missionaries, cannibals, capacity)
+        graph = get_puzzle_tables(self.size)[0]
+        self.outcomes = np.zeros(len(OUTCOMES), dtype=np.int64)
+        self.moves_histogram = np.zeros(histogram_size, dtype=np.int64)
+        self.moves_made_total = 0
+        self.moves_made_max = 0
+        self.losing_states = np.zeros(graph.size, dtype=np.int64)
+        self.suboptimal_moves = np.zeros((graph.size, len(graph.moves)), dtype=np.int64)
+
+    @property
+    def games(self):
+        """
+        Number of games aggregated.
+        """
+        return int(self.outcomes.sum())
+
+    def update(self, chunk):
+        """
+        Add a chunk of games.
+        :param chunk: NumPy structured array of game log records.
+        :return: None
+        """
+        if len(chunk) == 0:
+            return
+        distances, move_index = get_puzzle_tables(self.size)[1:]
+        moves_made = chunk["moves_made"]
+        self.outcomes += np.bincount(chunk["outcome"], minlength=len(OUTCOMES))
+        self.moves_histogram += np.bincount(
+            np.minimum(moves_made, len(self.moves_histogram) - 1),
+            minlength=len(self.moves_histogram)
+        )
+        self.moves_made_total += int(moves_made.sum(dtype=np.int64))
+        self.moves_made_max = max(self.moves_made_max, int(moves_made.max()))
+
+        moves = chunk["moves"]
+        result = BatchValidator(*self.size).validate(moves)
+        current, following = result.states[:, :-1], result.states[:, 1:]
+        made = following >= 0
+        before, after = current[made], following[made]
+        # like DistanceTable.rate_move: not one step closer to the goal, or the goal is out of reach
+        suboptimal = (distances[after] != distances[before] - 1) | (distances[before] == UNREACHABLE)
+        codes = moves[made][suboptimal]
+        np.add.at(self.suboptimal_moves, (before[suboptimal], move_index[codes]), 1)
+
+        lost = np.flatnonzero(result.lost)
+        if len(lost):
+            step = result.first_illegal[lost]
+            packed = result.states[lost, step]
+            code = moves[lost, step].astype(np.int32)
+            shores, boat = np.divmod(packed, 2)
+            cannibals, missionaries = np.divmod(shores, self.size[0] + 1)
+            direction = 2 * boat - 1
+            cannibals += direction * (code >> 4)
+            missionaries += direction * (code & 0x0F)
+            np.add.at(self.losing_states, (cannibals * (self.size[0] + 1) + missionaries) * 2 + 1 - boat, 1)
+
+    def merge(self, other):
+        """
+        Add the aggregates of another GameStats object, e.g. computed by another process.
+        :param other: GameStats object of the same puzzle size.
+        :return: GameStats object, self.
+        """
+        if other.size != self.size or len(other.moves_histogram) != len(self.moves_histogram):
+            raise ValueError("Cannot merge statistics of different puzzle or histogram sizes")
+        self.outcomes += other.outcomes
+        self.moves_histogram += other.moves_histogram
+        self.moves_made_total += other.moves_made_total
+        self.moves_made_max = max(self.moves_made_max, other.moves_made_max)
+        self.losing_states += other.losing_states
+        self.suboptimal_moves += other.suboptimal_moves
+        return self
+
+    def win_rate(self):
+        """
+        Share of the games that were won.
+        :return: Float between 0 and 1, 0 if there are no games.
+        """
+        games = self.games
+        return self.outcomes[OUTCOMES.index("win")] / games if games else 0.0
+
+    def mean_moves(self):
+        """
+        Average number of moves made.
+        :return: Float, 0 if there are no games.
+        """
+        games = self.games
+        return self.moves_made_total / games if games else 0.0
+
+    def quantile(self, fraction):
+        """
+        Nearest-rank quantile of the moves made, read from the histogram. It is exact
+        unless it falls in the last bin, then the largest number of moves made is returned.
+        :param fraction: Float between 0 and 1 representing the quantile (0.5 for the median).
+        :return: Integer representing the number of moves made, 0 if there are no games.
+        """
+        games = self.games
+        if not games:
+            return 0
+        rank = max(1, ceil(games * fraction))
+        index = int(np.searchsorted(np.cumsum(self.moves_histogram), rank))
+        if index == len(self.moves_histogram) - 1:
+            return self.moves_made_max
+        return index
+
+    def most_common_losing_state(self):
+        """
+        The state games were lost in most often.
+        :return: Tuple (game state, number of games), or None if no game was lost.
+        """
+        packed = int(np.argmax(self.losing_states))
+        if not self.losing_states[packed]:
+            return None
+        return get_puzzle_tables(self.size)[0].unpack(packed), int(self.losing_states[packed])
+
+    def most_common_suboptimal_moves(self):
+        """
+        The suboptimal move made most often in every state it was made in.
+        :return: Dictionary mapping game states to tuples (move, number of times).
+        """
+        graph = get_puzzle_tables(self.size)[0]
+        indexes = self.suboptimal_moves.argmax(axis=1)
+        counts = self.suboptimal_moves.max(axis=1)
+        return {
+            graph.unpack(int(packed)): (graph.moves[indexes[packed]], int(counts[packed]))
+            for packed in np.flatnonzero(counts)
+        }
+
+    def report(self):
+        """
+        Summarize the statistics.
+        :return: String representing the report.
+        """
+        lines = [
+            f"games: {self.games}, win rate: {self.win_rate():.3f}, "
+            + ", ".join(f"{name}: {count}" for name, count in zip(OUTCOMES, self.outcomes)),
+            f"moves made: mean {self.mean_moves():.1f}, p50 {self.quantile(0.5)}, "
+            f"p90 {self.quantile(0.9)}, p99 {self.quantile(0.99)}, max {self.moves_made_max}"
+        ]
+        losing_state = self.most_common_losing_state()
+        if losing_state is not None:
+            lines.append(f"most common losing state: {losing_state[0]} ({losing_state[1]} games)")
+        for state, (move, count) in sorted(self.most_common_suboptimal_moves().items()):
+            lines.append(f"most common suboptimal move in {state}: {move} ({count} times)")
+        return "\n".join(lines)
+
+
+def aggregate(chunks, stats=None):
+    """
+    Consume chunks of games into running aggregates.
+    :param chunks: Iterable of NumPy structured arrays of game log records.
+    :param stats: (optional) GameStats object to add to, defaults to a new one for the default puzzle size.
+    :return: GameStats object.
+    """
+    if stats is None:
+        stats = GameStats()
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats
+
+
+def aggregate_log(path, start=0, stop=None, chunk_size=settings.GAME_LOG_CHUNK_SIZE):
+    """
+    Aggregate a range of the records of a game log.
+    :param path: String representing the path of the game log.
+    :param start: (optional) Integer representing the index of the first record.
+    :param stop: (optional) Integer representing the index after the last record, defaults to the end.
+    :param chunk_size: Integer representing the number of games per chunk.
+    :return: GameStats object.
+    """
+    with GameLogReader(path) as reader:
+        size = reader.size
+    return aggregate(iter_log_chunks(path, chunk_size, start, stop), GameStats(*size))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the statistics of a game log")
+    parser.add_argument("path", help="game log written by game_log.GameLogWriter")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes, 0 uses every core")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.workers == 1:
+        game_stats = aggregate_log(args.path)
+    else:
+        from parallel import ParallelPool
+        with ParallelPool(args.workers or None) as pool:
+            game_stats = pool.aggregate_log(args.path)
+    print(game_stats.report())
+    print(f"aggregated in {time.perf_counter() - started:.2f}s")
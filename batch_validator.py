@@ -0,0 +1,232 @@
+"""
+Vectorized validation of many move sequences at once.
+Every game of a batch is advanced in lockstep with NumPy arrays,
+so the only Python loop runs over the move index, not over the games.
+Run this module directly to benchmark it against the scalar GameState path.
+"""
+
+import time
+import random
+import numpy as np
+import settings
+from state_space import StateSpace, encode_move, decode_move
+
+
+class BatchResult:
+    """
+    Outcome of a validated batch, one entry per game (row).
+    Attributes:
+        states: 2-D int32 array of the packed states visited after each move,
+        the first column holds the start state and -1 marks steps after the game ended.
+        first_illegal: 1-D int32 array of the index of the first move that could not be made
+        or lost the game, -1 if there was none.
+        won: 1-D boolean array, True where the game was won.
+        lost: 1-D boolean array, True where a move left more cannibals than missionaries on a shore.
+        moves_made: 1-D int32 array of the number of boat crossings made.
+    """
+
+    def __init__(self, states, first_illegal, won, lost, moves_made):
+        self.states = states
+        self.first_illegal = first_illegal
+        self.won = won
+        self.lost = lost
+        self.moves_made = moves_made
+
+    def outcome(self, game):
+        """
+        Get the outcome of one game with the same labels as the headless engine.
+        :param game: Integer representing the row of the game.
+        :return: String "win", "lose", "invalid" or "pass".
+        """
+        if self.won[game]:
+            return "win"
+        if self.lost[game]:
+            return "lose"
+        if self.first_illegal[game] >= 0:
+            return "invalid"
+        return "pass"
+
+
+class BatchValidator:
+    """
+    Validates batches of move sequences for one puzzle size.
+    Moves are packed with `state_space.encode_move`, 0 marks the end of a shorter sequence.
+    Attributes:
+        missionaries: Integer representing the number of missionaries in the game.
+        cannibals: Integer representing the number of cannibals in the game.
+        capacity: Integer representing the boat capacity.
+    """
+
+    def __init__(self, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                 capacity=settings.BOAT_CAPACITY):
+        self.missionaries = missionaries
+        self.cannibals = cannibals
+        self.capacity = capacity
+
+    def pack(self, cannibals, missionaries, boat):
+        """
+        Pack arrays of game states the same way as `StateSpace.pack`.
+        :param cannibals: Array of the number of cannibals on the left shore.
+        :param missionaries: Array of the number of missionaries on the left shore.
+        :param boat: Array of the boat sides (0: left 1: right).
+        :return: Array of the packed states.
+        """
+        return (cannibals * (self.missionaries + 1) + missionaries) * 2 + boat
+
+    def validate(self, moves):
+        """
+        Advance every game of the batch move by move.
+        :param moves: 2-D integer array of packed moves, one row per game.
+        :return: BatchResult object holding the states and outcomes of every game.
+        """
+        moves = np.asarray(moves, dtype=np.uint8)
+        if moves.ndim != 2:
+            raise ValueError("Moves must be a 2-D array with one row per game")
+        games, steps = moves.shape
+
+        cannibals = np.full(games, self.cannibals, dtype=np.int32)
+        missionaries = np.full(games, self.missionaries, dtype=np.int32)
+        boat = np.zeros(games, dtype=np.int32)
+
+        states = np.full((games, steps + 1), -1, dtype=np.int32)
+        states[:, 0] = self.pack(cannibals, missionaries, boat)
+        first_illegal = np.full(games, -1, dtype=np.int32)
+        won = np.zeros(games, dtype=bool)
+        lost = np.zeros(games, dtype=bool)
+        moves_made = np.zeros(games, dtype=np.int32)
+        active = np.ones(games, dtype=bool)
+
+        for step in range(steps):
+            codes = moves[:, step]
+            active &= codes != 0
+            if not active.any():
+                break
+
+            move_cannibals = (codes >> 4).astype(np.int32)
+            move_missionaries = (codes & 0x0F).astype(np.int32)
+            direction = 2 * boat - 1  # boat on the left moves people away from it
+            next_cannibals = cannibals + direction * move_cannibals
+            next_missionaries = missionaries + direction * move_missionaries
+
+            people = move_cannibals + move_missionaries
+            possible = (
+                (people > 0) & (people <= self.capacity) &
+                (next_cannibals >= 0) & (next_cannibals <= self.cannibals) &
+                (next_missionaries >= 0) & (next_missionaries <= self.missionaries)
+            )
+
+            right_cannibals = self.cannibals - next_cannibals
+            right_missionaries = self.missionaries - next_missionaries
+            safe = ~(
+                ((next_cannibals > next_missionaries) & (next_missionaries > 0)) |
+                ((right_cannibals > right_missionaries) & (right_missionaries > 0))
+            )
+
+            crossed = active & possible
+            moved = crossed & safe
+            failed = active & ~moved
+            moves_made += crossed
+            lost |= crossed & ~safe
+            first_illegal[failed] = step
+
+            cannibals = np.where(moved, next_cannibals, cannibals)
+            missionaries = np.where(moved, next_missionaries, missionaries)
+            boat = np.where(moved, 1 - boat, boat)
+            states[moved, step + 1] = self.pack(cannibals, missionaries, boat)[moved]
+
+            finished = moved & (cannibals == 0) & (missionaries == 0) & (boat == 1)
+            won |= finished
+            active &= ~(failed | finished)
+
+        return BatchResult(states, first_illegal, won, lost, moves_made)
+
+
+def random_move_lists(games, length, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                      capacity=settings.BOAT_CAPACITY, seed=0):
+    """
+    Generate move sequences that mostly follow legal moves, with an occasional random one.
+    :param games: Integer representing the number of sequences.
+    :param length: Integer representing the maximum length of a sequence.
+    :param missionaries: Integer representing the number of missionaries in the game.
+    :param cannibals: Integer representing the number of cannibals in the game.
+    :param capacity: Integer representing the boat capacity.
+    :param seed: Integer seed of the random generator.
+    :return: List of lists of tuples representing the moves.
+    """
+    rng = random.Random(seed)
+    graph = StateSpace(missionaries, cannibals, capacity)
+    move_lists = []
+    for _ in range(games):
+        state = graph.start
+        moves = []
+        for _ in range(rng.randrange(1, length + 1)):
+            next_states = graph[state]
+            if not next_states or rng.random() < 0.05:
+                moves.append(rng.choice(graph.moves))
+                break
+            move = rng.choice(list(next_states))
+            moves.append(move)
+            state = next_states[move]
+            if state == graph.goal:
+                break
+        move_lists.append(moves)
+    return move_lists
+
+
+def to_array(move_lists, length):
+    """
+    Pack move sequences into a 2-D array padded with 0.
+    :param move_lists: List of lists of tuples representing the moves.
+    :param length: Integer representing the number of columns.
+    :return: 2-D uint8 array of packed moves.
+    """
+    array = np.zeros((len(move_lists), length), dtype=np.uint8)
+    for row, moves in enumerate(move_lists):
+        array[row, :len(moves)] = [encode_move(move) for move in moves]
+    return array
+
+
+def benchmark(games=20000, length=40, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+              capacity=settings.BOAT_CAPACITY):
+    """
+    Time the batch validator against the scalar headless path and check that they agree.
+    :param games: Integer representing the number of games in the batch.
+    :param length: Integer representing the maximum number of moves per game.
+    :param missionaries: Integer representing the number of missionaries in the game.
+    :param cannibals: Integer representing the number of cannibals in the game.
+    :param capacity: Integer representing the boat capacity.
+    :return: Dictionary with the timings in seconds and the speedup.
+    """
+    from headless import run_batch
+
+    move_lists = random_move_lists(games, length, missionaries, cannibals, capacity)
+    moves = to_array(move_lists, length)
+
+    started = time.perf_counter()
+    result = BatchValidator(missionaries, cannibals, capacity).validate(moves)
+    vectorized = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scalar_results = run_batch(
+        [[decode_move(code) for code in row if code] for row in moves],
+        missionaries, cannibals, capacity
+    )
+    scalar = time.perf_counter() - started
+
+    for game, scalar_result in enumerate(scalar_results):
+        if (scalar_result.outcome != result.outcome(game) or
+                scalar_result.moves_made != result.moves_made[game]):
+            raise AssertionError(f"Results differ for game {game}")
+
+    return {
+        "games": games,
+        "vectorized": vectorized,
+        "scalar": scalar,
+        "speedup": scalar / vectorized
+    }
+
+
+if __name__ == "__main__":
+    report = benchmark()
+    print(f"{report['games']} games: vectorized {report['vectorized'] * 1000:.1f}ms, "
+          f"scalar {report['scalar'] * 1000:.1f}ms, speedup {report['speedup']:.1f}x")
@@ -0,0 +1,353 @@
+"""
+Benchmark suite for the hot paths of the model, the view and the controller.
+Runs headless with the SDL dummy video driver, saves the timings as JSON and
+compares them with a stored baseline, failing if a benchmark got slower than its threshold.
+
+    python benchmark.py --save-baseline      # record the baseline
+    python benchmark.py                      # compare against it, exit status 1 on a regression
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import platform
+from statistics import median
+import settings
+
+
+def measure(function, repeats=settings.BENCHMARK_REPEATS, min_time=settings.BENCHMARK_MIN_TIME):
+    """
+    Time a function. The number of calls per run is doubled until a run takes at least
+    `min_time`, then `repeats` runs are timed.
+    :param function: Function without arguments to time.
+    :param repeats: Integer representing the number of timed runs.
+    :param min_time: Float representing the shortest duration of a run in seconds.
+    :return: Dictionary with the median, minimum and maximum seconds per call,
+    the number of calls per run and the number of runs.
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        if time.perf_counter() - started >= min_time:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - started) / number)
+    return {
+        "median": median(timings),
+        "min": min(timings),
+        "max": max(timings),
+        "number": number,
+        "repeats": repeats
+    }
+
+
+def model_benchmarks(sizes=settings.BENCHMARK_SIZES):
+    """
+    Benchmarks of the game graph, the solver and the hover hit-tests, none of them needs pygame.
+    :param sizes: List of tuples (missionaries, cannibals, capacity) to build and solve.
+    :return: Dictionary mapping benchmark names to functions without arguments.
+    """
+    from model import GameState
+    from solver import Solver
+
+    benchmarks = {}
+    for size in sizes:
+        label = "x".join(str(value) for value in size)
+        benchmarks[f"graph.build[{label}]"] = lambda size=size: GameState.get_game_graph(*size)
+        graph = GameState.get_game_graph(*size)
+        solver = Solver(graph)
+        for strategy in Solver.STRATEGIES:
+            benchmarks[f"solver.{strategy}[{label}]"] = (
+                lambda solver=solver, start=graph.start, strategy=strategy: solver.shortest_path(start, strategy)
+            )
+
+    game_state = GameState()
+    points = [
+        (x, y)
+        for x in range(0, settings.SIZE[0], settings.SIZE[0] // 16)
+        for y in range(300, 700, 100)
+    ]
+
+    def hit_test():
+        for point in points:
+            game_state.collisions.get_hovered_entity(game_state, point)
+
+    def hit_test_rebuild():
+        game_state.collisions.grid_key = None  # as after an entity changed shore
+        game_state.collisions.get_hovered_entity(game_state, points[0])
+
+    benchmarks[f"hover.hit_test[{len(points)} points]"] = hit_test
+    benchmarks["hover.grid_rebuild"] = hit_test_rebuild
+    return benchmarks
+
+
+def view_benchmarks(view):
+    """
+    Benchmarks of full frames of every action, the text rendering and the sprite loading.
+    :param view: View object to render with, its sprites must be loaded.
+    :return: Dictionary mapping benchmark names to functions without arguments.
+    """
+    from model import Model
+    from view import SpriteLoader
+
+    model = Model()
+    ferry = Model()
+    ferry.game_state.entities.move_entity_to_boat("cannibal1")
+    ferry.game_state.entities.move_entity_to_boat("missionary1")
+    ferry.game_state.entities.start_ferry("right")
+    for _ in range(settings.SIMULATION_RATE // 4):
+        ferry.game_state.entities.ferry()
+
+    def render_frame(state, action):
+        # forget the cached screens so that every call draws the whole frame
+        view.compositor.invalidate()
+        view.last_frame = None
+        if view.dirty_renderer is not None:
+            view.dirty_renderer.reset()
+        view.render(state.game_state, state.menu_state, action, state.game_state.moves_made)
+
+    benchmarks = {}
+    for action in ("menu", "rules", "pause", "listen", "win", "lose"):
+        benchmarks[f"render.frame[{action}]"] = lambda action=action: render_frame(model, action)
+    benchmarks["render.frame[ferry]"] = lambda: render_frame(ferry, "ferry")
+    benchmarks["render.game_renderer"] = lambda: view.game_renderer.render(
+        model.game_state, view.screen, view.sprite_loader
+    )
+
+    def display_text_uncached():
+        view.text_cache.surfaces.clear()
+        view.display_text("Moves: 0", settings.MOVES_MADE_POS, settings.TEXT_COLOR,
+                          settings.MOVES_MADE_FONT_SIZE, settings.FONT)
+
+    benchmarks["text.display_text"] = lambda: view.display_text(
+        "Moves: 0", settings.MOVES_MADE_POS, settings.TEXT_COLOR, settings.MOVES_MADE_FONT_SIZE, settings.FONT
+    )
+    benchmarks["text.display_text_uncached"] = display_text_uncached
+
+    cache_dir = tempfile.mkdtemp()
+    SpriteLoader(cache_dir)  # fill the cache for the warm start
+    benchmarks["assets.atlas_cold"] = lambda: SpriteLoader(None)
+    benchmarks["assets.atlas_warm"] = lambda: SpriteLoader(cache_dir)
+    return benchmarks
+
+
+def controller_benchmarks(view, sessions=(), outcomes=None):
+    """
+    Benchmarks of the controller: the fixed simulation steps of a ferry crossing and
+    unthrottled replays of recorded sessions. A replay that ends differently from its
+    first run raises an AssertionError.
+    :param view: View object the controller is created with.
+    :param sessions: (optional) List of paths of input logs recorded with `main.py --record`.
+    :param outcomes: (optional) Dictionary filled with the outcome of every replay by benchmark name.
+    :return: Dictionary mapping benchmark names to functions without arguments.
+    """
+    from model import Model
+    from controller import Controller
+    from recording import replay_session
+
+    def crossing():
+        model = Model()
+        controller = Controller(model, view)
+        model.game_state.entities.move_entity_to_boat("cannibal1")
+        model.game_state.entities.move_entity_to_boat("missionary1")
+        controller.move_ferry()
+        while controller.action == "ferry":
+            controller.update(settings.SIMULATION_STEP)
+
+    benchmarks = {"controller.ferry_crossing": crossing}
+    for path in sessions:
+        name = f"replay[{os.path.basename(path)}]"
+        expected = replay_session(path, view)
+        if outcomes is not None:
+            outcomes[name] = expected
+
+        def replay(path=path, expected=expected):
+            if replay_session(path, view) != expected:
+                raise AssertionError(f"The replay of {path} ended differently")
+
+        benchmarks[name] = replay
+    return benchmarks
+
+
+def create_view():
+    """
+    Create the view headless and wait until every sprite is loaded.
+    :return: View object.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from view import View
+
+    view = View()
+    while view.sprite_loader.is_loading():
+        view.sprite_loader.poll()
+        time.sleep(0.001)
+    return view
+
+
+def run_benchmarks(benchmarks, name_filter=None, repeats=settings.BENCHMARK_REPEATS,
+                   min_time=settings.BENCHMARK_MIN_TIME):
+    """
+    Time every benchmark whose name contains the filter, printing them as they finish.
+    :param benchmarks: Dictionary mapping benchmark names to functions without arguments.
+    :param name_filter: (optional) String that the names of the benchmarks to run contain.
+    :param repeats: Integer representing the number of timed runs of each benchmark.
+    :param min_time: Float representing the shortest duration of a run in seconds.
+    :return: Dictionary mapping benchmark names to their timings.
+    """
+    results = {}
+    for name, function in benchmarks.items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(function, repeats, min_time)
+        print(f"{name:<36}{results[name]['min'] * 1000:10.3f} ms")
+    return results
+
+
+def get_threshold(name, default=settings.BENCHMARK_THRESHOLD, thresholds=settings.BENCHMARK_THRESHOLDS):
+    """
+    Get the allowed slowdown of a benchmark, the longest matching name prefix wins.
+    :param name: String representing the name of the benchmark.
+    :param default: Float representing the threshold of benchmarks without a matching prefix.
+    :param thresholds: Dictionary mapping name prefixes to thresholds.
+    :return: Float representing the allowed slowdown (0.25 = 25% slower).
+    """
+    prefixes = [prefix for prefix in thresholds if name.startswith(prefix)]
+    if not prefixes:
+        return default
+    return thresholds[max(prefixes, key=len)]
+
+
+def compare(results, baseline, default=settings.BENCHMARK_THRESHOLD, thresholds=settings.BENCHMARK_THRESHOLDS):
+    """
+    Compare the fastest runs with the baseline, they are the least disturbed by other processes.
+    A replay also fails if it ended differently than in the baseline.
+    :param results: Dictionary mapping benchmark names to their timings.
+    :param baseline: Dictionary mapping benchmark names to their baseline timings.
+    :param default: Float representing the threshold of benchmarks without a matching prefix.
+    :param thresholds: Dictionary mapping name prefixes to thresholds.
+    :return: List of tuples (name, minimum, baseline minimum, ratio, failed) for the benchmarks
+    found in both.
+    """
+    rows = []
+    for name, timings in results.items():
+        if name not in baseline:
+            continue
+        ratio = timings["min"] / baseline[name]["min"]
+        rows.append((
+            name,
+            timings["min"],
+            baseline[name]["min"],
+            ratio,
+            (ratio > 1 + get_threshold(name, default, thresholds) or
+             timings.get("outcome") != baseline[name].get("outcome"))
+        ))
+    return rows
+
+
+def save_results(path, results):
+    """
+    Write benchmark timings to a JSON file together with the machine they were measured on.
+    :param path: String representing the path of the file.
+    :param results: Dictionary mapping benchmark names to their timings.
+    :return: None
+    """
+    with open(path, "w") as file:
+        json.dump({
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results
+        }, file, indent=2)
+
+
+def load_results(path):
+    """
+    Read benchmark timings saved by `save_results`.
+    :param path: String representing the path of the file.
+    :return: Dictionary mapping benchmark names to their timings, or None if the file does not exist.
+    """
+    try:
+        with open(path) as file:
+            return json.load(file)["results"]
+    except FileNotFoundError:
+        return None
+
+
+def report(rows):
+    """
+    Print the comparison with the baseline.
+    :param rows: List of tuples returned by `compare`.
+    :return: None
+    """
+    for name, current, base, ratio, failed in rows:
+        print(f"{name:<36}{current * 1000:10.3f} ms {base * 1000:10.3f} ms "
+              f"{(ratio - 1) * 100:+7.1f}%{'  REGRESSION' if failed else ''}")
+
+
+def main(argv=None):
+    """
+    Run the benchmarks, save them and compare them with the baseline.
+    :param argv: (optional) List of command line arguments, defaults to sys.argv.
+    :return: Integer exit status, 1 if a benchmark regressed.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the game hot paths")
+    parser.add_argument("--filter", help="only run the benchmarks whose name contains this string")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=settings.BENCHMARK_BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=settings.BENCHMARK_THRESHOLD,
+                        help="allowed slowdown of benchmarks without a threshold in the settings")
+    parser.add_argument("--repeats", type=int, default=settings.BENCHMARK_REPEATS)
+    parser.add_argument("--no-view", action="store_true", help="skip the benchmarks that need pygame")
+    parser.add_argument("--session", action="append", default=[], metavar="PATH",
+                        help="replay an input log recorded with main.py --record, can be repeated")
+    args = parser.parse_args(argv)
+
+    benchmarks = model_benchmarks()
+    outcomes = {}
+    if not args.no_view:
+        view = create_view()
+        benchmarks.update(view_benchmarks(view))
+        benchmarks.update(controller_benchmarks(view, args.session, outcomes))
+    results = run_benchmarks(benchmarks, args.filter, args.repeats)
+    for name, outcome in outcomes.items():
+        if name in results:
+            results[name]["outcome"] = outcome
+
+    if args.output:
+        save_results(args.output, results)
+    if args.save_baseline:
+        baseline = load_results(args.baseline) or {}
+        baseline.update(results)
+        save_results(args.baseline, baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}, run with --save-baseline first")
+        return 0
+    rows = compare(results, baseline, args.threshold)
+    print()
+    report(rows)
+    failed = [row[0] for row in rows if row[4]]
+    if failed:
+        print(f"{len(failed)} benchmark(s) regressed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
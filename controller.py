@@ -4,9 +4,12 @@ application. Handles user input and delegates logic
 and rendering to the model and view.
 """
 
+import time
 import pygame
 from model import Model
 from view import View
+from profiler import FrameProfiler
+from recording import LiveInput
 import settings
 
 
@@ -21,15 +24,42 @@ class Controller:
         running (bool): Flag to keep the game loop running.
         action (str): The current state of the game (e.g., "menu", "listen", "ferry").
         fps (pygame.time.Clock): Clock object to control the frame rate.
+        events_handled (int): Number of events processed by the last event handler call.
+        idle_stats (IdleStats): Time spent sleeping while waiting for input.
+        accumulator (float): Seconds of real time not yet simulated.
+        last_time (float): Time stamp of the start of the previous frame.
+        profiler (FrameProfiler): Times the phases of every frame, None while profiling is off.
+        input (LiveInput): Source of the events, the mouse position and the frame times,
+        read live, recorded or replayed.
     """
 
-    def __init__(self, model: Model, view: View):
+    def __init__(self, model: Model, view: View, input_source=None):
+        """
+        :param model: Model object holding the game state.
+        :param view: View object rendering the game.
+        :param input_source: (optional) LiveInput object to read the input from, defaults to live input.
+        """
         self.model = model
         self.view = view
+        self.input = input_source if input_source is not None else LiveInput()
         self.running = False
         self.action = "menu"
 
         self.fps = pygame.time.Clock()
+        self.events_handled = 0
+        self.idle_stats = IdleStats()
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+        self.profiler = FrameProfiler() if settings.PROFILE_FRAMES else None
+
+    def toggle_profiler(self):
+        """
+        Show or hide the frame-time overlay, starting the profiler on first use.
+        :return: None
+        """
+        if self.profiler is None:
+            self.profiler = FrameProfiler()
+        self.profiler.overlay = not self.profiler.overlay
 
     def handle_escape(self):
         """
@@ -109,13 +139,17 @@ class Controller:
         :param action: String representing the current game action ("menu", "pause", or "listen").
         :return: None
         """
-        for event in pygame.event.get():
+        events = self.input.get_events()
+        self.events_handled = len(events)
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
 
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_ESCAPE and not settings.LOST:
                     self.handle_escape()
+                if event.key == pygame.K_F3:
+                    self.toggle_profiler()
 
             if (event.type == pygame.MOUSEBUTTONUP and
                     button is not None):
@@ -127,6 +161,9 @@ class Controller:
                     self.action == "listen"):
                 self.handle_click_entity(event, hovered_entity)
 
+        if self.profiler is not None:
+            self.profiler.mark("events")
+
     def play(self):
         """
         Starts the game by setting the action to 'listen' and marking the game as started.
@@ -181,18 +218,22 @@ class Controller:
         Triggers the win view and stops the game after a short delay.
         """
         self.view.render_end("win", self.model.game_state.moves_made)
-        pygame.time.delay(settings.GAME_END_DELAY)
+        if self.input.throttled:
+            pygame.time.delay(settings.GAME_END_DELAY)
         self.running = False
 
-    def lose(self):
+    def lose(self, dt=settings.SIMULATION_STEP):
         """
         Handles the lose condition.
-        Checks if the loss animation logic is complete, then triggers the lose view.
+        Advances the loss animation by one simulation step and, once it is complete,
+        triggers the lose view.
+        :param dt: (optional) Float representing the duration of the simulation step in seconds.
         """
         settings.LOST = True
-        if self.model.game_state.lose():
+        if self.model.game_state.lose(dt=dt):
             self.view.render_end("lose", self.model.game_state.moves_made)
-            pygame.time.delay(settings.GAME_END_DELAY)
+            if self.input.throttled:
+                pygame.time.delay(settings.GAME_END_DELAY)
             self.running = False
 
     def action_menu_pause(self):
@@ -202,9 +243,11 @@ class Controller:
         """
         hovered_button = self.model.game_state.collisions.get_hovered_button(
             self.model.menu_state,
-            pygame.mouse.get_pos(),
+            self.input.get_mouse_pos(),
             self.action
         )
+        if self.profiler is not None:
+            self.profiler.mark("hover")
         if hovered_button is not None:
             self.model.menu_state.set_button_color(hovered_button, True)
 
@@ -224,18 +267,28 @@ class Controller:
         """
         hovered_entity = self.model.game_state.collisions.get_hovered_entity(
             self.model.game_state,
-            pygame.mouse.get_pos()
+            self.input.get_mouse_pos()
         )
+        if self.profiler is not None:
+            self.profiler.mark("hover")
 
         self.event_handler(None, hovered_entity)
 
     def action_ferry(self):
         """
         Logic for the 'ferry' state (boat moving).
+        The boat itself is moved by the simulation steps, see `update_ferry`.
+        """
+        self.event_handler()
+
+    def update_ferry(self, dt):
+        """
+        Simulation step of the 'ferry' state.
         Updates the boat position, checks for arrival, and determines the game outcome
         (win, lose, or continue listening).
+        :param dt: Float representing the duration of the simulation step in seconds.
         """
-        arrived = self.model.game_state.entities.ferry()
+        arrived = self.model.game_state.entities.ferry(dt)
         if arrived:
             self.model.game_state.moves_made += 1
             self.model.game_state.entities.stop_ferry()
@@ -246,7 +299,6 @@ class Controller:
                 self.action = "win"
             else:
                 self.action = "lose"
-        self.event_handler()
 
     def action_win(self):
         """
@@ -256,29 +308,129 @@ class Controller:
 
     def action_lose(self):
         """
-        Logic for the 'lose' state. Calls the lose handler and event handler
-        to allow the lose animation to play out.
+        Logic for the 'lose' state. Calls the event handler while the simulation
+        steps play the lose animation out.
         """
-        self.lose()
         self.event_handler()
 
+    def is_simulating(self):
+        """
+        Check whether the current state is advanced by simulation steps.
+        :return: Boolean True while the ferry is moving or the cannibals are eating.
+        """
+        return self.action in ["ferry", "lose"]
+
+    def update(self, dt):
+        """
+        Advances the simulation by one fixed step.
+        :param dt: Float representing the duration of the simulation step in seconds.
+        :return: None
+        """
+        self.model.game_state.entities.save_positions()
+        if self.action == "ferry":
+            self.update_ferry(dt)
+        elif self.action == "lose":
+            self.lose(dt)
+
+    def simulate(self):
+        """
+        Runs as many fixed simulation steps as the real time since the previous frame
+        covers (one step per frame when settings.REALTIME_SIMULATION is off).
+        The rest of the time is kept for the next frame.
+        :return: Float between 0 and 1 representing how far the frame is between the
+        previous and the last simulation step, used to interpolate the rendering.
+        """
+        now = time.perf_counter()
+        frame_time = min(self.input.get_frame_time(now - self.last_time), settings.MAX_FRAME_TIME)
+        self.last_time = now
+
+        if not self.is_simulating():
+            self.accumulator = 0.0
+            return 1.0
+
+        if not settings.REALTIME_SIMULATION:
+            self.update(settings.SIMULATION_STEP)
+            return 1.0
+
+        self.accumulator += frame_time
+        while self.running and self.is_simulating() and self.accumulator >= settings.SIMULATION_STEP:
+            self.update(settings.SIMULATION_STEP)
+            self.accumulator -= settings.SIMULATION_STEP
+
+        if not self.is_simulating():
+            self.accumulator = 0.0
+            return 1.0
+        return self.accumulator / settings.SIMULATION_STEP
+
+    def is_animating(self):
+        """
+        Check whether something changes on screen without user input.
+        :return: Boolean True while the ferry is moving, the cannibals are eating
+        or sprites are still loading.
+        """
+        return self.action in ["ferry", "win", "lose"] or self.view.sprite_loader.is_loading()
+
+    def wait_for_event(self):
+        """
+        Sleep until the next input event arrives or the idle timeout passes.
+        The event is handled with the others in the next frame, in the order it arrived.
+        :return: None
+        """
+        started = time.perf_counter()
+        self.input.wait_for_event(settings.IDLE_WAIT_TIMEOUT)
+        self.idle_stats.add_idle(time.perf_counter() - started)
+        self.fps.tick()  # restart the frame clock after sleeping
+
+    def next_frame(self):
+        """
+        Wait for the next frame. Ticks at the fixed frame rate while something is
+        animating or input was just handled, otherwise sleeps until the next event.
+        A replay is paced by the recorded frame times, or not at all when unthrottled.
+        :return: None
+        """
+        if self.input.replaying:
+            self.input.wait()
+            return
+        if (not settings.ADAPTIVE_FRAMERATE or self.is_animating()
+                or self.events_handled > 0):
+            self.fps.tick(settings.FRAMERATE)
+        else:
+            self.wait_for_event()
+
     def run(self):
         """
         The main game loop.
         Continuously renders the game state and delegates logic execution
-        based on the current `action` state.
+        based on the current `action` state. Movement is simulated in fixed
+        steps, independent of the frame rate.
         """
         self.running = True
         self.action = "menu"
+        self.idle_stats.start()
+        self.last_time = time.perf_counter()
 
         while self.running:
+            self.idle_stats.frames += 1
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
+
+            alpha = self.simulate()
+            if not self.running:
+                break
+            if profiler is not None:
+                profiler.mark("simulate")
 
             self.view.render(
                 self.model.game_state,
                 self.model.menu_state,
                 self.action,
-                self.model.game_state.moves_made
+                self.model.game_state.moves_made,
+                alpha,
+                profiler.overlay_lines if profiler is not None and profiler.overlay else None
             )
+            if profiler is not None:
+                profiler.mark("render")
 
             if self.action == "menu" or self.action == "pause":
                 self.action_menu_pause()
@@ -298,4 +450,77 @@ class Controller:
             elif self.action == "lose":
                 self.action_lose()
 
-            self.fps.tick(settings.FRAMERATE)
+            self.input.end_frame()
+            self.next_frame()
+            if profiler is not None:
+                profiler.mark("tick")
+                profiler.end_frame()
+            if self.input.is_finished():
+                self.running = False
+
+        self.input.close()
+        self.idle_stats.stop()
+        if settings.REPORT_IDLE_STATS:
+            print(self.idle_stats.report())
+        if self.profiler is not None and settings.PROFILE_DUMP_PATH is not None:
+            self.profiler.dump(settings.PROFILE_DUMP_PATH)
+
+
+class IdleStats:
+    """
+    Measures how much of the game loop was spent sleeping instead of rendering.
+    Attributes:
+        frames: Integer representing the number of frames rendered.
+        idle_waits: Integer representing the number of times the loop slept waiting for input.
+        idle_time: Float representing the seconds spent sleeping.
+        wall_time: Float representing the seconds the loop ran.
+        cpu_time: Float representing the CPU seconds used by the process while the loop ran.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.idle_waits = 0
+        self.idle_time = 0.0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.started = None
+
+    def start(self):
+        """
+        Start measuring the game loop.
+        :return: None
+        """
+        self.started = (time.perf_counter(), time.process_time())
+
+    def stop(self):
+        """
+        Stop measuring the game loop.
+        :return: None
+        """
+        if self.started is None:
+            return
+        self.wall_time += time.perf_counter() - self.started[0]
+        self.cpu_time += time.process_time() - self.started[1]
+        self.started = None
+
+    def add_idle(self, seconds):
+        """
+        Record one sleep of the game loop.
+        :param seconds: Float representing the duration of the sleep.
+        :return: None
+        """
+        self.idle_waits += 1
+        self.idle_time += seconds
+
+    def report(self):
+        """
+        Summarize the savings: frames a fixed-rate loop would have rendered while
+        the game slept, and the CPU usage of the loop.
+        :return: String representing the report.
+        """
+        skipped_frames = int(self.idle_time * settings.FRAMERATE)
+        cpu_usage = self.cpu_time / self.wall_time * 100 if self.wall_time else 0.0
+        idle_share = self.idle_time / self.wall_time * 100 if self.wall_time else 0.0
+        return (f"frames rendered: {self.frames}, frames skipped while idle: {skipped_frames}, "
+                f"idle: {self.idle_time:.1f}s ({idle_share:.0f}% of {self.wall_time:.1f}s), "
+                f"CPU usage: {cpu_usage:.0f}%")
@@ -0,0 +1,153 @@
+"""
+Precomputed distance-to-goal table for the cannibals and missionaries puzzle.
+Answers hints and rates moves in constant time without searching the game graph.
+"""
+
+import os
+import tempfile
+from array import array
+from collections import deque
+import settings
+
+
+UNREACHABLE = 0xFFFF
+
+
+class DistanceTable:
+    """
+    Holds the number of moves left to the winning game state for every packed state,
+    filled by a breadth-first search backwards from the goal. The table is cached on
+    disk keyed by the puzzle size.
+    Attributes:
+        game_graph: StateSpace object representing the game graph.
+        distances: Array of unsigned shorts mapping each packed state to its distance
+        to the goal, or UNREACHABLE.
+        cache_path: String representing the path of the cache file, or None if caching is disabled.
+    """
+
+    def __init__(self, game_graph, cache_dir=settings.DISTANCE_CACHE_DIR):
+        self.game_graph = game_graph
+        self.cache_path = None
+        if cache_dir is not None:
+            self.cache_path = os.path.join(
+                cache_dir,
+                f"distances_{game_graph.missionaries}_{game_graph.cannibals}_{game_graph.capacity}.bin"
+            )
+
+        self.distances = self.load()
+        if self.distances is None:
+            self.distances = self.compute()
+            self.save()
+
+    def compute(self):
+        """
+        Fill the table with a breadth-first search starting at the goal. Moves can be
+        undone by the same move, so the successors are also the predecessors.
+        :return: Array of unsigned shorts representing the distances.
+        """
+        graph = self.game_graph
+        distances = array("H", [UNREACHABLE]) * graph.size
+        goal = graph.pack(graph.goal)
+        distances[goal] = 0
+        queue = deque([goal])
+        while queue:
+            packed = queue.popleft()
+            distance = distances[packed] + 1
+            if distance >= UNREACHABLE:
+                raise OverflowError("Distance to the goal does not fit in the table")
+            for previous in graph.successor_ids(packed):
+                if distances[previous] == UNREACHABLE:
+                    distances[previous] = distance
+                    queue.append(previous)
+        return distances
+
+    def load(self):
+        """
+        Load the table from the cache file if it exists and matches the puzzle size.
+        :return: Array of unsigned shorts representing the distances, or None on a cache miss.
+        """
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return None
+        distances = array("H")
+        if os.path.getsize(self.cache_path) != self.game_graph.size * distances.itemsize:
+            return None
+        with open(self.cache_path, "rb") as file:
+            distances.fromfile(file, self.game_graph.size)
+        return distances
+
+    def save(self):
+        """
+        Write the table to the cache file. It is written to a temporary file of its own
+        first, so processes saving the same table at once do not overwrite each other.
+        :return: None
+        """
+        if self.cache_path is None:
+            return
+        cache_dir = os.path.dirname(self.cache_path) or "."
+        os.makedirs(cache_dir, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                self.distances.tofile(file)
+            os.replace(temporary_path, self.cache_path)
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    def distance(self, gamestate):
+        """
+        Get the number of moves an optimal solution needs from a game state.
+        :param gamestate: Tuple representing the game state.
+        :return: Integer representing the number of moves left, or None if the goal cannot be reached.
+        """
+        if gamestate not in self.game_graph:
+            return None
+        distance = self.distances[self.game_graph.pack(gamestate)]
+        if distance == UNREACHABLE:
+            return None
+        return distance
+
+    def hint(self, gamestate):
+        """
+        Get the first move of an optimal solution from a game state.
+        :param gamestate: Tuple representing the current game state.
+        :return: Tuple representing the move (cannibals moved, missionaries moved),
+        or None if the game is already won or cannot be won.
+        """
+        distance = self.distance(gamestate)
+        if not distance:
+            return None
+        for move, next_state in self.game_graph[gamestate].items():
+            if self.distance(next_state) == distance - 1:
+                return move
+        return None
+
+    def rate_move(self, gamestate, move):
+        """
+        Compare a move against the optimal solution.
+        :param gamestate: Tuple representing the game state the move is made from.
+        :param move: Tuple representing the move (cannibals moved, missionaries moved).
+        :return: String "optimal" if the move shortens the way to the goal, "suboptimal"
+        if it does not, "illegal" if the move loses the game.
+        """
+        next_state = self.game_graph[gamestate].get(move)
+        if next_state is None:
+            return "illegal"
+        distance = self.distance(gamestate)
+        if distance is not None and self.distance(next_state) == distance - 1:
+            return "optimal"
+        return "suboptimal"
+
+    def efficiency(self, moves_made, gamestate=None):
+        """
+        Score a finished game against the optimal solution.
+        :param moves_made: Integer representing the number of moves made.
+        :param gamestate: (optional) Tuple representing the starting game state, defaults to the puzzle start.
+        :return: Float between 0 and 1 representing the optimal number of moves divided by
+        the moves made, or 0 if the puzzle cannot be solved.
+        """
+        optimal = self.distance(gamestate or self.game_graph.start)
+        if not optimal or moves_made <= 0:
+            return 0.0
+        return min(optimal / moves_made, 1.0)
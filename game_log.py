@@ -0,0 +1,283 @@
+"""
+Binary log of finished games for the analytics.
+Every game is a fixed-width record, so the reader memory-maps the file and
+exposes the records as NumPy views without creating an object per game.
+
+Layout, little endian: a header of HEADER.size bytes (MAGIC, version, puzzle size
+and the number of move slots per record), then the records. A record holds the
+outcome (u1), the number of moves stored (u2), the number of moves made (u4) and
+the moves packed with `state_space.encode_move`, one byte each, padded with 0.
+The game states are not stored, `GameLogReader.get_states` replays the moves.
+"""
+
+import os
+import mmap
+import struct
+import time
+import numpy as np
+import settings
+from state_space import MAX_MOVE_SIDE, encode_move
+from batch_validator import BatchValidator
+
+
+MAGIC = b"CMGL"
+VERSION = 1
+HEADER = struct.Struct("<4sBxHHHH2x")  # magic, version, missionaries, cannibals, capacity, move slots
+RECORD = struct.Struct("<BHI")  # outcome, moves stored, moves made, followed by the move slots
+OUTCOMES = ("pass", "win", "lose", "invalid")
+
+
+def record_dtype(max_moves):
+    """
+    Get the NumPy type of a record.
+    :param max_moves: Integer representing the number of move slots of a record.
+    :return: NumPy structured dtype with the fields outcome, length, moves_made and moves.
+    """
+    return np.dtype([
+        ("outcome", "u1"),
+        ("length", "<u2"),
+        ("moves_made", "<u4"),
+        ("moves", "u1", (max_moves,))
+    ])
+
+
+class GameLogWriter:
+    """
+    Appends finished games to a log. Games with more moves than the record has slots
+    keep their first moves, their `moves_made` tells how many there were.
+    Attributes:
+        path: String representing the path of the log.
+        size: Tuple (missionaries, cannibals, capacity) representing the puzzle size of the games.
+        max_moves: Integer representing the number of move slots of a record.
+        dtype: NumPy structured dtype of a record.
+        file: Binary file object of the log.
+        records: Integer representing the number of records written.
+    """
+
+    def __init__(self, path, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                 capacity=settings.BOAT_CAPACITY, max_moves=settings.GAME_LOG_MAX_MOVES):
+        """
+        :param path: String representing the path of the log. An existing log is appended to
+        and must have the same puzzle size and number of move slots. Puzzles whose moves
+        can carry more than MAX_MOVE_SIDE cannibals or missionaries cannot be logged.
+        :param missionaries: Integer representing the number of missionaries in the games.
+        :param cannibals: Integer representing the number of cannibals in the games.
+        :param capacity: Integer representing the boat capacity.
+        :param max_moves: Integer representing the number of move slots of a record.
+        """
+        if min(capacity, max(missionaries, cannibals)) > MAX_MOVE_SIDE:
+            raise ValueError(f"Moves of a {missionaries}x{cannibals}x{capacity} puzzle do not fit in one byte")
+        self.path = path
+        self.size = (missionaries, cannibals, capacity)
+        self.max_moves = max_moves
+        self.dtype = record_dtype(max_moves)
+        self.records = 0
+
+        header = HEADER.pack(MAGIC, VERSION, missionaries, cannibals, capacity, max_moves)
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as file:
+                if file.read(HEADER.size) != header:
+                    raise ValueError(f"{path} is a game log of another version, puzzle size or record size")
+            self.file = open(path, "ab")
+        else:
+            self.file = open(path, "wb")
+            self.file.write(header)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Write the buffered records and close the log.
+        :return: None
+        """
+        self.file.close()
+
+    def write(self, outcome, moves, moves_made=None):
+        """
+        Append one game.
+        :param outcome: String "win", "lose", "invalid" or "pass".
+        :param moves: Bytes-like object of the moves packed with `encode_move`.
+        :param moves_made: (optional) Integer representing the number of boat crossings,
+        defaults to the number of moves.
+        :return: None
+        """
+        moves = bytes(moves[:self.max_moves])
+        if moves_made is None:
+            moves_made = len(moves)
+        self.file.write(RECORD.pack(OUTCOMES.index(outcome), len(moves), moves_made))
+        self.file.write(moves.ljust(self.max_moves, b"\0"))
+        self.records += 1
+
+    def write_game(self, game_state, outcome):
+        """
+        Append a finished game, called by `GameState.check_win_lose`.
+        :param game_state: GameState object of the game.
+        :param outcome: String "win" or "lose".
+        :return: None
+        """
+        moves = bytes(encode_move(move) for move in game_state.move_history[:self.max_moves])
+        self.write(outcome, moves, game_state.moves_made)
+
+    def write_batch(self, moves, result):
+        """
+        Append a batch of games validated by BatchValidator. A game keeps the moves it made,
+        up to the winning move, and the move that lost it or could not be made.
+        :param moves: 2-D uint8 array of packed moves, one row per game.
+        :param result: BatchResult object returned by `BatchValidator.validate` for the moves.
+        :return: None
+        """
+        moves = np.asarray(moves, dtype=np.uint8)
+        games, steps = moves.shape
+        if steps > self.max_moves:
+            raise ValueError(f"Games have more than {self.max_moves} move slots")
+
+        lengths = (result.states >= 0).sum(axis=1) - 1 + (result.first_illegal >= 0)
+        records = np.zeros(games, dtype=self.dtype)
+        records["outcome"] = np.select(
+            [result.won, result.lost, result.first_illegal >= 0],
+            [OUTCOMES.index("win"), OUTCOMES.index("lose"), OUTCOMES.index("invalid")],
+            OUTCOMES.index("pass")
+        )
+        records["length"] = lengths
+        records["moves_made"] = result.moves_made
+        records["moves"][:, :steps] = np.where(np.arange(steps) < lengths[:, None], moves, 0)
+        self.file.write(records.tobytes())
+        self.records += games
+
+
+class GameLogReader:
+    """
+    Memory-maps a game log. The record fields are NumPy views of the mapped file, so
+    scanning them allocates no object per game and reads only the pages it touches.
+    A record left incomplete by an interrupted writer is ignored.
+    Attributes:
+        path: String representing the path of the log.
+        size: Tuple (missionaries, cannibals, capacity) representing the puzzle size of the games.
+        max_moves: Integer representing the number of move slots of a record.
+        dtype: NumPy structured dtype of a record.
+        file: Binary file object of the log.
+        map: mmap object of the log.
+        records: NumPy structured array of the records, a view of the map.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            header = self.file.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError(f"{path} is not a game log")
+            magic, version, missionaries, cannibals, capacity, max_moves = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a game log of version {VERSION}")
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            self.file.close()
+            raise
+        self.size = (missionaries, cannibals, capacity)
+        self.max_moves = max_moves
+        self.dtype = record_dtype(max_moves)
+        count = (len(self.map) - HEADER.size) // self.dtype.itemsize
+        self.records = np.frombuffer(self.map, dtype=self.dtype, count=count, offset=HEADER.size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.records)
+
+    def close(self):
+        """
+        Close the log. The file stays mapped until the views handed out before are released.
+        :return: None
+        """
+        self.records = None
+        try:
+            self.map.close()
+        except BufferError:
+            pass  # still exported, unmapped when the last view is garbage collected
+        self.file.close()
+
+    @property
+    def outcomes(self):
+        """
+        1-D uint8 view of the outcome codes, indexes of OUTCOMES.
+        """
+        return self.records["outcome"]
+
+    @property
+    def lengths(self):
+        """
+        1-D view of the number of moves stored per game.
+        """
+        return self.records["length"]
+
+    @property
+    def moves_made(self):
+        """
+        1-D view of the number of boat crossings per game.
+        """
+        return self.records["moves_made"]
+
+    @property
+    def moves(self):
+        """
+        2-D uint8 view of the packed moves, one row per game, padded with 0.
+        """
+        return self.records["moves"]
+
+    def get_record(self, index):
+        """
+        Get the raw bytes of one record without copying them.
+        :param index: Integer representing the index of the record.
+        :return: Read-only memoryview of the record.
+        """
+        start = HEADER.size + index * self.dtype.itemsize
+        return memoryview(self.map)[start:start + self.dtype.itemsize]
+
+    def iter_chunks(self, chunk_size=settings.GAME_LOG_CHUNK_SIZE):
+        """
+        Iterate over the records in chunks.
+        :param chunk_size: Integer representing the number of records per chunk.
+        :return: Generator of NumPy structured arrays, views of the map.
+        """
+        for start in range(0, len(self.records), chunk_size):
+            yield self.records[start:start + chunk_size]
+
+    def get_states(self, start=0, stop=None):
+        """
+        Replay the moves of a range of games to get the game states they visited.
+        :param start: (optional) Integer representing the index of the first game.
+        :param stop: (optional) Integer representing the index after the last game, defaults to the end.
+        :return: 2-D int32 array of packed states, see `BatchResult.states`.
+        """
+        return BatchValidator(*self.size).validate(self.moves[start:stop]).states
+
+
+if __name__ == "__main__":
+    import tempfile
+    from batch_validator import random_move_lists, to_array
+
+    games, length = 100000, 40
+    batch = to_array(random_move_lists(games, length), length)
+    batch_result = BatchValidator().validate(batch)
+    log_path = os.path.join(tempfile.mkdtemp(), "games.log")
+    with GameLogWriter(log_path, max_moves=length) as writer:
+        for _ in range(10):
+            writer.write_batch(batch, batch_result)
+
+    started = time.perf_counter()
+    with GameLogReader(log_path) as reader:
+        win_rate = np.count_nonzero(reader.outcomes == OUTCOMES.index("win")) / len(reader)
+        mean_moves = reader.moves_made.mean()
+        count = len(reader)
+    elapsed = time.perf_counter() - started
+    print(f"{count} games ({os.path.getsize(log_path) / 2 ** 20:.0f} MiB) scanned in {elapsed * 1000:.1f}ms: "
+          f"win rate {win_rate:.3f}, {mean_moves:.1f} moves on average")
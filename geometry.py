@@ -0,0 +1,166 @@
+"""
+Lightweight rectangle for the model layer.
+Behaves like pygame.Rect for the operations the model uses (integer
+coordinates, hit tests, scaling around the center), so the model and
+the solver can be imported without pygame.
+"""
+
+from struct import pack, unpack
+
+
+def float32(value):
+    """
+    Round a number to single precision, the precision pygame scales rectangles in.
+    :param value: Float to round.
+    :return: Float representing the nearest single precision value.
+    """
+    return unpack("f", pack("f", value))[0]
+
+
+class Rect:
+    """
+    Axis-aligned rectangle with integer coordinates. Floats are truncated like pygame does.
+    It is a sequence of (x, y, width, height), so pygame accepts it wherever it takes a Rect.
+    Attributes:
+        x: Integer representing the left edge.
+        y: Integer representing the top edge.
+        w: Integer representing the width.
+        h: Integer representing the height.
+    """
+
+    __slots__ = ("x", "y", "w", "h")
+
+    def __init__(self, *args):
+        """
+        :param args: (x, y, width, height), ((x, y), (width, height)) or one rectangle-like sequence.
+        """
+        if len(args) == 1:
+            args = tuple(args[0])
+        if len(args) == 2:
+            args = (args[0][0], args[0][1], args[1][0], args[1][1])
+        if len(args) != 4:
+            raise TypeError("Argument must be rect style object")
+        self.x, self.y, self.w, self.h = (int(value) for value in args)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.w, self.h))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.w, self.h)[index]
+
+    def __eq__(self, other):
+        try:
+            return tuple(self) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<rect({self.x}, {self.y}, {self.w}, {self.h})>"
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def top(self):
+        return self.y
+
+    @property
+    def width(self):
+        return self.w
+
+    @property
+    def height(self):
+        return self.h
+
+    @property
+    def right(self):
+        return self.x + self.w
+
+    @property
+    def bottom(self):
+        return self.y + self.h
+
+    @property
+    def topleft(self):
+        return self.x, self.y
+
+    @property
+    def size(self):
+        return self.w, self.h
+
+    @property
+    def centerx(self):
+        return self.x + int(self.w / 2)
+
+    @property
+    def centery(self):
+        return self.y + int(self.h / 2)
+
+    @property
+    def center(self):
+        return self.x + int(self.w / 2), self.y + int(self.h / 2)
+
+    def copy(self):
+        """
+        Create a copy of the rectangle.
+        :return: Rect object with the same position and size.
+        """
+        return Rect(self.x, self.y, self.w, self.h)
+
+    def collidepoint(self, *point):
+        """
+        Check whether a point is inside the rectangle. The right and bottom edges are outside.
+        :param point: Tuple (x, y) or the two coordinates.
+        :return: Boolean True if the point is inside, False otherwise.
+        """
+        if len(point) == 1:
+            point = point[0]
+        x, y = int(point[0]), int(point[1])
+        return self.x <= x < self.x + self.w and self.y <= y < self.y + self.h
+
+    def colliderect(self, other):
+        """
+        Check whether two rectangles overlap. Rectangles that only touch or are empty do not collide.
+        :param other: Rect, pygame.Rect or sequence (x, y, width, height).
+        :return: Boolean True if the rectangles overlap, False otherwise.
+        """
+        x, y, w, h = other
+        if self.w == 0 or self.h == 0 or w == 0 or h == 0:
+            return False
+        return (min(self.x, self.x + self.w) < max(x, x + w) and
+                min(self.y, self.y + self.h) < max(y, y + h) and
+                max(self.x, self.x + self.w) > min(x, x + w) and
+                max(self.y, self.y + self.h) > min(y, y + h))
+
+    def scale_by_ip(self, x, y=None):
+        """
+        Scale the rectangle in place, keeping its center.
+        :param x: Float representing the horizontal scale factor.
+        :param y: (optional) Float representing the vertical scale factor, defaults to `x`.
+        :return: None
+        """
+        if y is None:
+            y = x
+        width = float32(self.w * float32(abs(x)))
+        height = float32(self.h * float32(abs(y)))
+        self.x = int(float32(self.x + int(self.w / 2) - width / 2))
+        self.y = int(float32(self.y + int(self.h / 2) - height / 2))
+        self.w = int(width)
+        self.h = int(height)
+
+    def scale_by(self, x, y=None):
+        """
+        Create a scaled copy of the rectangle, keeping its center.
+        :param x: Float representing the horizontal scale factor.
+        :param y: (optional) Float representing the vertical scale factor, defaults to `x`.
+        :return: Rect object representing the scaled rectangle.
+        """
+        rect = self.copy()
+        rect.scale_by_ip(x, y)
+        return rect
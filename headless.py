@@ -0,0 +1,146 @@
+"""
+Headless simulation of the cannibals and missionaries game.
+Runs the game logic from move sequences without a display,
+a frame clock or animations.
+"""
+
+import settings
+from model import GameState
+from distance_table import DistanceTable
+
+
+class GameResult:
+    """
+    Outcome of a simulated game.
+    Attributes:
+        outcome: String representing how the game ended: "win", "lose", "invalid" if a move
+        could not be made (empty or overloaded boat, not enough people on the shore)
+        or "pass" if the moves ran out before the game ended.
+        moves_made: Integer representing the number of boat crossings made.
+        states: List of tuples representing the game states visited, starting with the initial one.
+    """
+
+    def __init__(self, outcome, moves_made, states):
+        self.outcome = outcome
+        self.moves_made = moves_made
+        self.states = states
+
+    def __repr__(self):
+        return f"GameResult(outcome={self.outcome!r}, moves_made={self.moves_made})"
+
+
+class HeadlessGame:
+    """
+    Drives a GameState from a sequence of moves. Boarding uses the EntityManager logic,
+    while ferry crossings and the eating animation resolve instantly.
+    Attributes:
+        game_state: GameState object representing the simulated game.
+        states: List of tuples representing the game states visited.
+    """
+
+    def __init__(self, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                 capacity=settings.BOAT_CAPACITY, game_graph=None, distance_table=None, game_log=None):
+        self.game_state = GameState(
+            missionaries,
+            cannibals,
+            capacity,
+            game_graph=game_graph,
+            distance_table=distance_table,
+            game_log=game_log
+        )
+        self.states = [self.game_state.gamestate]
+
+    def play(self, moves):
+        """
+        Play a sequence of moves until the game ends or the moves run out.
+        :param moves: Iterable of tuples representing the moves (cannibals moved, missionaries moved).
+        :return: GameResult object representing the outcome of the game.
+        """
+        outcome = "pass"
+        for move in moves:
+            outcome = self.play_move(move)
+            if outcome != "pass":
+                break
+        return GameResult(outcome, self.game_state.moves_made, self.states)
+
+    def play_move(self, move):
+        """
+        Board the entities of a move, ferry them across and check the outcome.
+        :param move: Tuple representing the move (cannibals moved, missionaries moved).
+        :return: String "win", "lose", "pass" or "invalid".
+        """
+        if not self.board(move):
+            return "invalid"
+
+        self.ferry()
+        output = self.game_state.check_win_lose()
+        if output == "lose":
+            self.game_state.lose(instant=True)
+            return output
+
+        self.states.append(self.game_state.gamestate)
+        self.unload()
+        return output
+
+    def board(self, move):
+        """
+        Put the entities of a move on the boat.
+        :param move: Tuple representing the move (cannibals moved, missionaries moved).
+        :return: Boolean True if the move fits on the boat and the shore has enough entities, False otherwise.
+        """
+        entities = self.game_state.entities
+        move_cannibals, move_missionaries = move
+        if not 0 < move_cannibals + move_missionaries <= entities.boat.capacity:
+            return False
+
+        cannibals, missionaries = self.game_state.get_ent_on_shore(entities.boat.which_shore)
+        if move_cannibals > len(cannibals) or move_missionaries > len(missionaries):
+            return False
+
+        for name in cannibals[:move_cannibals] + missionaries[:move_missionaries]:
+            entities.move_entity_to_boat(name)
+        return True
+
+    def ferry(self):
+        """
+        Move the boat to the other shore at once.
+        :return: None
+        """
+        entities = self.game_state.entities
+        if entities.boat.which_shore == "left":
+            entities.start_ferry("right")
+            entities.boat.pos = settings.BOAT_RIGHT_POS
+        else:
+            entities.start_ferry("left")
+            entities.boat.pos = settings.BOAT_LEFT_POS
+        entities.stop_ferry()
+        self.game_state.moves_made += 1
+
+    def unload(self):
+        """
+        Put every entity on the boat on the shore the boat is at.
+        :return: None
+        """
+        entities = self.game_state.entities
+        for name in list(entities.get_entities_on_boat()):
+            entities.remove_entity_from_boat(name)
+
+
+def run_batch(move_lists, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+              capacity=settings.BOAT_CAPACITY, game_log=None):
+    """
+    Replay many games of the same puzzle, sharing one game graph and distance table.
+    :param move_lists: Iterable of move sequences, each an iterable of tuples (cannibals moved, missionaries moved).
+    :param missionaries: Integer representing the number of missionaries in the game.
+    :param cannibals: Integer representing the number of cannibals in the game.
+    :param capacity: Integer representing the boat capacity.
+    :param game_log: (optional) GameLogWriter object the won and lost games are written to.
+    :return: List of GameResult objects, one per move sequence.
+    """
+    game_graph = GameState.get_game_graph(missionaries, cannibals, capacity)
+    distance_table = DistanceTable(game_graph) if settings.RATE_MOVES else None
+    results = []
+    for moves in move_lists:
+        game = HeadlessGame(missionaries, cannibals, capacity, game_graph, distance_table, game_log)
+        results.append(game.play(moves))
+    return results
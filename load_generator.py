@@ -0,0 +1,179 @@
+"""
+Load generator for the session server.
+Opens a number of connections, each playing whole sessions one after another:
+a new session, the moves of an optimal solution and a close. Every request
+waits for its response, so the latencies include the round trip over the socket.
+Without an address of a running server, one is started in the same process.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import settings
+from profiler import percentile
+from server import SessionServer
+
+
+def get_solution(game_graph):
+    """
+    Get the moves of an optimal solution of a puzzle.
+    :param game_graph: StateSpace object of the puzzle.
+    :return: List of lists [cannibals moved, missionaries moved], the moves as sent to the server.
+    """
+    from solver import Solver
+
+    path = Solver(game_graph).shortest_path(game_graph.start)
+    return [list(game_graph.move_between(state, following)) for state, following in zip(path, path[1:])]
+
+
+async def request(reader, writer, message, latencies):
+    """
+    Send a request and wait for its response.
+    :param reader: asyncio StreamReader of the connection.
+    :param writer: asyncio StreamWriter of the connection.
+    :param message: Dictionary representing the request.
+    :param latencies: List the latency in seconds is appended to.
+    :return: Dictionary representing the response.
+    """
+    started = time.perf_counter()
+    writer.write((json.dumps(message) + "\n").encode())
+    line = await reader.readline()
+    latencies.append(time.perf_counter() - started)
+    response = json.loads(line)
+    if "error" in response:
+        raise RuntimeError(f"Server answered {message} with an error: {response['error']}")
+    return response
+
+
+async def run_connection(connect, sessions, moves, latencies):
+    """
+    Play sessions over one connection.
+    :param connect: Function returning a coroutine that opens a connection.
+    :param sessions: Integer representing the number of sessions to play.
+    :param moves: List of the moves to play in every session.
+    :param latencies: List the latencies of the requests are appended to.
+    :return: Dictionary counting the sessions per outcome.
+    """
+    reader, writer = await connect()
+    outcomes = {}
+    try:
+        for _ in range(sessions):
+            session = (await request(reader, writer, {"op": "new"}, latencies))["session"]
+            outcome = "pass"
+            for move in moves:
+                response = await request(reader, writer, {"op": "move", "session": session, "move": move}, latencies)
+                outcome = response["outcome"]
+                if outcome != "pass":
+                    break
+            await request(reader, writer, {"op": "close", "session": session}, latencies)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return outcomes
+
+
+async def generate_load(sessions=settings.LOAD_SESSIONS, connections=settings.LOAD_CONNECTIONS,
+                        host=settings.SERVER_HOST, port=settings.SERVER_PORT, path=None, moves=None):
+    """
+    Play sessions on a running server over concurrent connections.
+    :param sessions: Integer representing the number of sessions to play in total.
+    :param connections: Integer representing the number of concurrent connections.
+    :param host: (optional) String representing the address of the server.
+    :param port: (optional) Integer representing the TCP port of the server.
+    :param path: (optional) String representing the path of the Unix socket of the server instead.
+    :param moves: (optional) List of the moves to play in every session, defaults to the
+    optimal solution of the default puzzle size.
+    :return: Dictionary with the number of sessions and requests, the elapsed seconds,
+    the sessions per outcome and the sorted request latencies in seconds.
+    """
+    if moves is None:
+        from model import GameState
+        moves = get_solution(GameState.get_game_graph())
+
+    if path is not None:
+        def connect():
+            return asyncio.open_unix_connection(path)
+    else:
+        def connect():
+            return asyncio.open_connection(host, port)
+
+    shares = [sessions // connections + (index < sessions % connections) for index in range(connections)]
+    latencies = []
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run_connection(connect, share, moves, latencies) for share in shares if share))
+    elapsed = time.perf_counter() - started
+
+    outcomes = {}
+    for result in results:
+        for outcome, count in result.items():
+            outcomes[outcome] = outcomes.get(outcome, 0) + count
+    latencies.sort()
+    return {
+        "sessions": sessions,
+        "requests": len(latencies),
+        "elapsed": elapsed,
+        "outcomes": outcomes,
+        "latencies": latencies
+    }
+
+
+def report(result):
+    """
+    Summarize a load test.
+    :param result: Dictionary returned by `generate_load`.
+    :return: String representing the report.
+    """
+    elapsed = result["elapsed"]
+    latencies = result["latencies"]
+    return "\n".join([
+        f"{result['sessions']} sessions, {result['requests']} requests in {elapsed:.2f}s: "
+        f"{result['sessions'] / elapsed:.0f} sessions/s, {result['requests'] / elapsed:.0f} requests/s",
+        "latency: " + ", ".join(
+            f"p{round(fraction * 100)} {percentile(latencies, fraction) * 1000:.3f}ms"
+            for fraction in (0.5, 0.95, 0.99)
+        ) + f", max {latencies[-1] * 1000 if latencies else 0:.3f}ms",
+        "outcomes: " + ", ".join(f"{outcome}: {count}" for outcome, count in sorted(result["outcomes"].items()))
+    ])
+
+
+async def main(sessions=settings.LOAD_SESSIONS, connections=settings.LOAD_CONNECTIONS,
+               host=None, port=settings.SERVER_PORT, path=None):
+    """
+    Run a load test and print its report.
+    :param sessions: Integer representing the number of sessions to play in total.
+    :param connections: Integer representing the number of concurrent connections.
+    :param host: (optional) String representing the address of a running server.
+    :param port: (optional) Integer representing the TCP port of a running server.
+    :param path: (optional) String representing the path of the Unix socket of a running server.
+    Without a host or a path, a server is started on a Unix socket in this process.
+    :return: None
+    """
+    session_server = None
+    if host is None and path is None:
+        session_server = SessionServer()
+        path = os.path.join(tempfile.mkdtemp(), "server.sock")
+        await session_server.start(path=path)
+
+    try:
+        result = await generate_load(sessions, connections, host, port, path)
+    finally:
+        if session_server is not None:
+            session_server.server.close()
+            await session_server.server.wait_closed()
+    print(report(result))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play many sessions on the session server and report its speed")
+    parser.add_argument("--sessions", type=int, default=settings.LOAD_SESSIONS)
+    parser.add_argument("--connections", type=int, default=settings.LOAD_CONNECTIONS)
+    parser.add_argument("--host", help="address of a running server, one is started in process without it")
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="Unix socket of a running server")
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.connections, args.host, args.port, args.unix))
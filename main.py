@@ -1,22 +1,95 @@
 """
 Main file to run the MVC game.
+The controller and the view are imported when the game starts,
+so that importing this module does not load pygame.
 """
 
-from controller import Controller
-from model import Model
-from view import View
+import argparse
+import time
+import settings
 
 
-def main():
+def main(argv=None):
     """
     Initializes the MVC components and
     runs the game.
+    :param argv: (optional) List of command line arguments, defaults to sys.argv.
     :return: None
     """
-    model = Model()
+    parser = argparse.ArgumentParser(description="Cannibals and missionaries")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="report the time spent in each startup step up to the first frame, then exit"
+    )
+    parser.add_argument("--record", metavar="PATH", help="record the input of the session to a log")
+    parser.add_argument("--replay", metavar="PATH", help="play the input recorded in a log back")
+    parser.add_argument(
+        "--unthrottled",
+        action="store_true",
+        help="replay as fast as possible instead of at the recorded speed"
+    )
+    args = parser.parse_args(argv)
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be combined")
+
+    timings = {}
+    started = time.perf_counter()
+    from model import Model
+    timings["import model"] = time.perf_counter() - started
+
+    step_started = time.perf_counter()
+    from controller import Controller
+    from view import View
+    from recording import InputRecorder, InputReplayer
+    timings["import view (pygame)"] = time.perf_counter() - step_started
+
+    game_log = None
+    if settings.GAME_LOG_PATH is not None:
+        from game_log import GameLogWriter
+        game_log = GameLogWriter(settings.GAME_LOG_PATH)
+
+    step_started = time.perf_counter()
+    model = Model(game_log)
+    timings["model"] = time.perf_counter() - step_started
+
     view = View()
-    game = Controller(model, view)
+    timings.update(view.startup_timings)
+    input_source = None
+    if args.record:
+        input_source = InputRecorder(args.record)
+    elif args.replay:
+        input_source = InputReplayer(args.replay, throttled=not args.unthrottled)
+    game = Controller(model, view, input_source)
+
+    if args.profile_startup:
+        step_started = time.perf_counter()
+        view.render(model.game_state, model.menu_state, "menu", model.game_state.moves_made)
+        timings["first frame"] = time.perf_counter() - step_started
+        report_startup(timings, time.perf_counter() - started)
+        if game_log is not None:
+            game_log.close()
+        return
+
+    step_started = time.perf_counter()
     game.run()
+    if game_log is not None:
+        game_log.close()
+    if args.replay:
+        print(f"replayed {input_source.index} frames in {time.perf_counter() - step_started:.2f}s: "
+              f"{game.action}, state {model.game_state.gamestate}, {model.game_state.moves_made} moves")
+
+
+def report_startup(timings, total):
+    """
+    Print the startup timings.
+    :param timings: Dictionary mapping startup steps to their duration in seconds.
+    :param total: Float representing the seconds from the start of `main` to the first frame.
+    :return: None
+    """
+    for step, duration in timings.items():
+        print(f"{step:<22}{duration * 1000:9.1f} ms")
+    print(f"{'total':<22}{total * 1000:9.1f} ms")
 
 
 if __name__ == "__main__":
@@ -4,9 +4,25 @@ Contains classes for managing the game state
 and entities.
 """
 
-import pygame
 import settings
 from math import sin, cos, atan2
+from geometry import Rect
+from state_space import StateSpace, LazyStateSpace
+from distance_table import DistanceTable
+
+
+def interpolate(start, end, alpha):
+    """
+    Linearly interpolate between two positions.
+    :param start: Tuple representing the first position (x, y).
+    :param end: Tuple representing the second position (x, y).
+    :param alpha: Float between 0 (start) and 1 (end).
+    :return: Tuple representing the interpolated position (x, y).
+    """
+    return (
+        start[0] + (end[0] - start[0]) * alpha,
+        start[1] + (end[1] - start[1]) * alpha
+    )
 
 
 class Model:
@@ -19,8 +35,11 @@ class Model:
         menu_state (MenuState): The state of the menu (buttons, UI).
     """
 
-    def __init__(self):
-        self.game_state = GameState()
+    def __init__(self, game_log=None):
+        """
+        :param game_log: (optional) GameLogWriter object to write the finished game to.
+        """
+        self.game_state = GameState(game_log=game_log)
         self.menu_state = MenuState()
 
 
@@ -33,30 +52,55 @@ class GameState:
         collisions (CollisionManager): Helper for collision detection.
         entities (EntityManager): Manager for all game entities.
         gamestate (tuple): A representation of the current state (cannibals, missionaries, boat side).
-        game_graph (dict): A pre-calculated graph of all valid game states and moves.
+        game_graph (StateSpace): A graph of all valid game states and moves, either
+        pre-calculated or computed on demand (LazyStateSpace).
         moves_made (int): Counter for the number of moves made.
+        move_ratings (list): Labels ("optimal" or "suboptimal") of the moves made.
+        distance_table (DistanceTable): Distances to the goal, created on first use.
+        move_history (list): Moves made (cannibals moved, missionaries moved), including the losing one.
+        outcome (str): "win" or "lose" once the game is over, "pass" before.
+        game_log (GameLogWriter): Log the finished game is written to, None to not log it.
     """
 
-    def __init__(self):
+    def __init__(self, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                 capacity=settings.BOAT_CAPACITY, lazy=settings.LAZY_GAME_GRAPH,
+                 game_graph=None, distance_table=None, game_log=None):
+        """
+        :param missionaries: Integer representing the number of missionaries in the game.
+        :param cannibals: Integer representing the number of cannibals in the game.
+        :param capacity: Integer representing the boat capacity.
+        :param lazy: Boolean True to compute the game graph on demand.
+        :param game_graph: (optional) StateSpace object to share between games instead of building one.
+        :param distance_table: (optional) DistanceTable object to share between games.
+        :param game_log: (optional) GameLogWriter object to write the game to once it is won or lost.
+        """
         self.collisions = CollisionManager()
-        self.entities = EntityManager()
-        self.gamestate = (3, 3, 0)
-        self.game_graph = self.get_game_graph()
+        self.entities = EntityManager(missionaries, cannibals, capacity)
+        self.gamestate = (cannibals, missionaries, 0)
+        if game_graph is None:
+            game_graph = self.get_game_graph(missionaries, cannibals, capacity, lazy)
+        self.game_graph = game_graph
         self.moves_made = 0
+        self.move_ratings = []
+        self.distance_table = distance_table
+        self.move_history = []
+        self.outcome = "pass"
+        self.game_log = game_log
 
-    def lose(self):
+    def lose(self, instant=False, dt=settings.SIMULATION_STEP):
         """
         Checks if the game is lost based on current positions.
         If rules are broken, it initiates the eating animation logic.
 
+        :param instant: (optional) Boolean True to place the cannibals on their missionaries
+        right away instead of walking there step by step.
+        :param dt: (optional) Float representing the duration of the simulation step in seconds.
         :return: True if the game is lost and animation is ongoing or finished, False otherwise.
         """
         side = "left"
-        cannibals, missionaries = self.get_ent_on_shore(side)
-
-        if not self.were_rules_broken(cannibals, missionaries):
+        if not self.is_shore_lost(side):
             side = "right"
-            cannibals, missionaries = self.get_ent_on_shore(side)
+        cannibals, missionaries = self.get_ent_on_shore(side)
 
         assigned_missionaries = []
 
@@ -67,15 +111,23 @@ class GameState:
                 cannibal.assign_missionary_to_eat(missionaries, assigned_missionaries)
                 assigned_missionaries.append(cannibal.missionary_to_eat)
 
-                cannibal.sprite_name = ["CANNIBAL_MOUTH"]
+                cannibal.sprite_name = ("CANNIBAL_MOUTH",)
 
-                cannibal.pos = cannibal.get_position(self.entities.boat.get_position())
+                cannibal.set_position(cannibal.get_position(self.entities.boat.get_position()))
+            if instant:
+                cannibal.set_position(self.entities.ents[cannibal.missionary_to_eat].get_position(
+                    self.entities.boat.get_position()
+                ))
+                continue
             if not self.collisions.check_collision(
                     cannibal,
                     self.entities.ents[cannibal.missionary_to_eat],
                     self.entities.boat.get_position()
             ):
-                self.entities.move_to_missionary(cannibal)
+                self.entities.move_to_missionary(cannibal, dt)
+
+        if instant:
+            return True
 
         for cannibal_name in cannibals:
             cannibal = self.entities.ents[cannibal_name]
@@ -93,21 +145,23 @@ class GameState:
         :param side: String representing the shoreside ("left" or "right").
         :return: Two lists of entity names: cannibals and missionaries.
         """
-        cannibals = [ent.name for ent in self.entities.ents.values() if ent.type == "cannibal" and (
-                    ent.which_shore == side or (ent.on_boat and self.entities.boat.which_shore == side))]
-        missionaries = [ent.name for ent in self.entities.ents.values() if ent.type == "missionary" and (
-                    ent.which_shore == side or (ent.on_boat and self.entities.boat.which_shore == side))]
-        return cannibals, missionaries
+        return self.entities.get_names_on_shore(side)
 
-    @staticmethod
-    def were_rules_broken(cannibals, missionaries):
+    def is_shore_lost(self, side):
+        """
+        Check the rules on one shore using the entity counters, without listing the entities.
+        :param side: String representing the shoreside ("left" or "right").
+        :return: boolean True if the cannibals outnumber the missionaries there, False otherwise.
+        """
+        cannibals, missionaries = self.entities.count_on_shore(side)
+        return cannibals > missionaries > 0
+
+    def are_rules_broken(self):
         """
-        Check if the game rules are broken on a given shore.
-        :param cannibals: List of cannibal names on the shore.
-        :param missionaries: List of missionary names on the shore.
-        :return: boolean True if the rules are broken, False otherwise.
+        Check the rules on both shores.
+        :return: boolean True if the cannibals outnumber the missionaries on any shore, False otherwise.
         """
-        return len(cannibals) > len(missionaries) > 0
+        return self.is_shore_lost("left") or self.is_shore_lost("right")
 
     def check_win_lose(self):
         """
@@ -119,10 +173,16 @@ class GameState:
         if move in self.game_graph[self.gamestate].keys():
             self.append_gamestate(move)
             if self.gamestate == (0, 0, 1):
-                return "win"
+                output = "win"
             else:
                 return "pass"
-        return "lose"
+        else:
+            self.move_history.append(move)
+            output = "lose"
+        self.outcome = output
+        if self.game_log is not None:
+            self.game_log.write_game(self, output)
+        return output
 
     def append_gamestate(self, move):
         """
@@ -130,116 +190,126 @@ class GameState:
         :param move: Tuple representing the move made (cannibals moved, missionaries moved).
         :return: None
         """
+        if settings.RATE_MOVES:
+            self.move_ratings.append(self.get_distance_table().rate_move(self.gamestate, move))
+        self.move_history.append(move)
         self.gamestate = self.game_graph[self.gamestate][move]
 
+    def get_distance_table(self):
+        """
+        Get the distance-to-goal table of the game graph, computing or loading it on first use.
+        :return: DistanceTable object for the game graph.
+        """
+        if self.distance_table is None:
+            self.distance_table = DistanceTable(self.game_graph)
+        return self.distance_table
+
+    def get_hint(self):
+        """
+        Get the first move of an optimal solution from the current game state.
+        :return: Tuple representing the move (cannibals moved, missionaries moved), or None.
+        """
+        return self.get_distance_table().hint(self.gamestate)
+
+    def get_efficiency(self):
+        """
+        Score the moves made against the optimal solution.
+        :return: Float between 0 and 1, 1 meaning the game was won in the fewest moves possible.
+        """
+        return self.get_distance_table().efficiency(self.moves_made)
+
     def identify_move(self):
         """
         Identifies the move made based on the current positions of the entities on the boat.
         :return: Tuple representing the move made (cannibals moved, missionaries moved).
         """
-        held_entities = self.entities.get_entities_on_boat()
-        move = (0, 0)
-        for ent_name in held_entities:
-            if ent_name[0:-1] == "cannibal":
-                move = (move[0] + 1, move[1])
-            else:
-                move = (move[0], move[1] + 1)
-        return move
-
-    def get_game_graph(self):
-        """
-        Generating the game graph.
-        :return: Nested dictionary representing the game graph.
-        """
-        max_missionaries = 3
-        max_cannibals = 3
-
-        moves = [
-            (1, 0), (2, 0),  # cannibals
-            (0, 1), (0, 2),  # missionaries
-            (1, 1)
-        ]
-
-        graph = {}
-        for state in self.get_all_valid_states(max_missionaries, max_cannibals):
-            graph[state] = self.get_next_gamestates(state, moves)
-
-        return graph
-
-    def get_next_gamestates(self, gamestate, moves):
-        """
-        Generate the next possible game states from a given game state and a list of moves.
-        :param gamestate: Tuple representing the current game state (cannibals
-        on the left, missionaries on the left, boat: 0: left 1: right).
-        :param moves: List of possible moves (cannibals moved, missionaries moved).
-        :return: Dictionary representing the next possible game states, mapping each move to
-        its corresponding game state.
-        """
-        cannibals, missionaries, boat = gamestate
-        direction = -1 if boat == 0 else 1
-        next_states = {}
-        for move in moves:
-            next_state = (
-                cannibals + move[0] * direction,
-                missionaries + move[1] * direction,
-                1 - boat
-            )
-            if self.is_valid_gamestate(next_state):
-                next_states[move] = next_state
-        return next_states
-
-    def get_all_valid_states(self, max_missionaries, max_cannibals):
-        """
-        Generate all possible and valid game states given the maximum number
-        of missionaries and cannibals on the shores.
-        :param max_missionaries: Integer representing the maximum number of missionaries on the shores.
-        :param max_cannibals: Integer representing the maximum number of cannibals on the shores.
-        :return: List of tuples representing all possible and valid game states.
-        """
-        states = []
-        for missionary in range(max_missionaries + 1):
-            for cannibal in range(max_cannibals + 1):
-                for boat in [0, 1]:
-                    state = (cannibal, missionary, boat)
-                    if self.is_valid_gamestate(state):
-                        states.append(state)
-        return states
+        boat_counts = self.entities.boat_counts
+        return boat_counts["cannibal"], boat_counts["missionary"]
 
     @staticmethod
-    def is_valid_gamestate(gamestate):
+    def get_game_graph(max_missionaries=settings.MISSIONARIES, max_cannibals=settings.CANNIBALS,
+                       capacity=settings.BOAT_CAPACITY, lazy=False):
         """
-        Check if a given game state is valid.
-        :param gamestate: Tuple representing the current game state (cannibals
-        on the left, missionaries on the left, boat: 0: left 1: right).
-        :return: Boolean True if the game state is valid, False otherwise.
+        Generating the game graph.
+        :param max_missionaries: Integer representing the number of missionaries in the game.
+        :param max_cannibals: Integer representing the number of cannibals in the game.
+        :param capacity: Integer representing the boat capacity.
+        :param lazy: Boolean True to compute successors only when a state is visited.
+        :return: StateSpace object representing the game graph, indexable like
+        a dictionary mapping each game state to its next game states.
         """
-        max_cannibals = 3
-        max_missionaries = 3
+        if lazy:
+            return LazyStateSpace(max_missionaries, max_cannibals, capacity)
+        return StateSpace(max_missionaries, max_cannibals, capacity)
 
-        left_cannibals, left_missionaries, boat = gamestate
-        if left_cannibals < 0 or left_missionaries < 0:
-            return False
 
-        right_cannibals = max_cannibals - left_cannibals
-        right_missionaries = max_missionaries - left_missionaries
-        if right_cannibals < 0 or right_missionaries < 0:
-            return False
+class SpatialGrid:
+    """
+    Uniform grid over the screen used to find the hitbox under a point.
+    Every cell lists the hitboxes overlapping it in the order they were inserted,
+    so a query only tests the few hitboxes of one cell.
+    Attributes:
+        cell_size: Integer representing the width and height of a cell in pixels.
+        cells: Dictionary mapping cell coordinates (column, row) to lists of tuples (name, rect).
+    """
 
-        # Check left shore
-        if left_cannibals > left_missionaries > 0:
-            return False
-        if right_cannibals > right_missionaries > 0:
-            return False
+    def __init__(self, cell_size=settings.HOVER_GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
 
-        return True
+    def clear(self):
+        """
+        Remove every hitbox from the grid.
+        :return: None
+        """
+        self.cells.clear()
+
+    def insert(self, name, rect):
+        """
+        Add a hitbox to every cell it overlaps.
+        :param name: String representing the name of the hitbox owner.
+        :param rect: Rect object representing the hitbox.
+        :return: None
+        """
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        size = self.cell_size
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self.cells.setdefault((column, row), []).append((name, rect))
+
+    def query(self, point):
+        """
+        Find the first inserted hitbox containing a point.
+        :param point: Tuple representing the point (x, y).
+        :return: String representing the name of the hitbox owner, or None if no hitbox contains the point.
+        """
+        cell = (int(point[0] // self.cell_size), int(point[1] // self.cell_size))
+        for name, rect in self.cells.get(cell, ()):
+            if rect.collidepoint(point):
+                return name
+        return None
 
 
 class CollisionManager:
     """
     A class to handle collision detection between game entities and UI elements.
     Provides methods to check for collisions and identify hovered buttons or entities.
+    Attributes:
+        entity_grid: SpatialGrid object holding the hitboxes of the entities and the boat.
+        grid_key: Tuple (layout version, boat position) the grid was built for,
+        or None before the first hover query.
     """
 
+    BUTTONS = {
+        "menu": ("menu_start", "menu_rules", "menu_quit"),
+        "pause": ("pause_resume", "pause_quit", "pause_rules")
+    }
+
+    def __init__(self):
+        self.entity_grid = SpatialGrid()
+        self.grid_key = None
+
     @staticmethod
     def check_collision(entity1, entity2, boat_pos=None):
         """
@@ -251,8 +321,7 @@ class CollisionManager:
         """
         return entity1.get_hitbox(boat_pos).colliderect(entity2.get_hitbox(boat_pos))
 
-    @staticmethod
-    def get_hovered_button(menu_state, mouse_pos, action):
+    def get_hovered_button(self, menu_state, mouse_pos, action):
         """
         Check if the mouse is hovering over any button in the menu state.
         :param menu_state: MenuState object representing the current menu state.
@@ -260,34 +329,38 @@ class CollisionManager:
         :param action: Current action being performed (menu or pause).
         :return: String representing the name of the button hovered over, or None if no button is hovered over.
         """
-        for key, value in menu_state.buttons.items():
-            if value.rect.collidepoint(mouse_pos) and action == "menu" \
-                    and key in ["menu_start", "menu_rules", "menu_quit"]:
-                return key
-            elif value.rect.collidepoint(mouse_pos) and action == "pause" \
-                    and key in ["pause_resume", "pause_quit", "pause_rules"]:
+        for key in self.BUTTONS.get(action, ()):
+            if menu_state.buttons[key].rect.collidepoint(mouse_pos):
                 return key
         return None
 
-    @staticmethod
-    def get_hovered_entity(game_state, mouse_pos):
+    def update_entity_grid(self, entities):
+        """
+        Rebuild the hitbox grid if an entity changed shore or boarded since the last
+        build, or if the boat moved. Positions set while a cannibal walks to its
+        missionary are not tracked, hovering is not checked during the lose animation.
+        :param entities: EntityManager object holding the entities and the boat.
+        :return: None
+        """
+        boat_pos = entities.boat.get_position()
+        key = (entities.layout_version, boat_pos)
+        if key == self.grid_key:
+            return
+        self.entity_grid.clear()
+        for entity in entities.get_all_entities():
+            self.entity_grid.insert(entity.name, entity.get_hitbox(boat_pos))
+        self.entity_grid.insert("boat", entities.boat.get_hitbox())
+        self.grid_key = key
+
+    def get_hovered_entity(self, game_state, mouse_pos):
         """
         Check if the mouse is hovering over any entity on the boat or the water.
         :param game_state: GameState object representing the current game state.
         :param mouse_pos: Tuple representing the position of the mouse cursor (x, y).
         :return: String representing the name of the entity hovered over, or None if no entity is hovered over.
         """
-        for entity in game_state.entities.get_all_entities():
-            if entity.on_boat:
-                boat_pos = game_state.entities.boat.get_position()
-                rect = entity.get_hitbox(boat_pos)
-            else:
-                rect = entity.get_hitbox()
-            if rect.collidepoint(mouse_pos):
-                return entity.name
-        if game_state.entities.boat.get_hitbox(None).collidepoint(mouse_pos):
-            return "boat"
-        return None
+        self.update_entity_grid(game_state.entities)
+        return self.entity_grid.query(mouse_pos)
 
 
 class EntityManager:
@@ -299,24 +372,42 @@ class EntityManager:
         boat: Boat object representing the boat.
         ferry_moving: String representing the side of the shore the ferry is moving to,
         or None if the ferry is not moving.
+        layout_version: Integer increased every time an entity boards, leaves the boat
+        or changes shore, or the boat moves.
+        entity_order: Dictionary mapping entity names to the order they were created in.
+        shore_names: Dictionary mapping each shore ("left" or "right") to the set of names
+        of the entities standing on it.
+        shore_counts: Dictionary mapping each shore to a dictionary of the number of
+        cannibals and missionaries there, counting the boat passengers at the shore of the boat.
+        boat_counts: Dictionary mapping "cannibal" and "missionary" to the number on the boat.
     """
 
-    def __init__(self):
-        self.ents = {
-            "cannibal1": self.add_entity("cannibal", "cannibal1", 0),
-            "cannibal2": self.add_entity("cannibal", "cannibal2", 1),
-            "cannibal3": self.add_entity("cannibal", "cannibal3", 2),
-            "missionary1": self.add_entity("missionary", "missionary1", 3),
-            "missionary2": self.add_entity("missionary", "missionary2", 4),
-            "missionary3": self.add_entity("missionary", "missionary3", 5)
-        }
-        self.boat = Boat(settings.BOAT_LEFT_POS)
+    def __init__(self, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                 capacity=settings.BOAT_CAPACITY):
+        self.ents = {}
+        for index in range(cannibals):
+            name = f"cannibal{index + 1}"
+            self.ents[name] = self.add_entity("cannibal", name, index)
+        for index in range(missionaries):
+            name = f"missionary{index + 1}"
+            self.ents[name] = self.add_entity("missionary", name, cannibals + index)
+        self.boat = Boat(settings.BOAT_LEFT_POS, capacity)
         self.ferry_moving = None
+        self.layout_version = 0
 
-    def move_to_missionary(self, cannibal):
+        self.entity_order = {name: index for index, name in enumerate(self.ents)}
+        self.shore_names = {"left": set(self.ents), "right": set()}
+        self.shore_counts = {
+            "left": {"cannibal": cannibals, "missionary": missionaries},
+            "right": {"cannibal": 0, "missionary": 0}
+        }
+        self.boat_counts = {"cannibal": 0, "missionary": 0}
+
+    def move_to_missionary(self, cannibal, dt=settings.SIMULATION_STEP):
         """
-        Move the cannibal to the position of its assigned missionary to eat by its step.
+        Move the cannibal towards its assigned missionary to eat at its speed.
         :param cannibal: Entity object that represents the cannibal to move.
+        :param dt: (optional) Float representing the duration of the simulation step in seconds.
         :return: None
         """
         if cannibal.movement is None:
@@ -325,13 +416,14 @@ class EntityManager:
 
             angle = atan2((miss_pos[1] - cannibal_pos[1]), (miss_pos[0] - cannibal_pos[0]))
             cannibal.movement = (
-                cos(angle) * cannibal.step,
-                sin(angle) * cannibal.step
+                cos(angle) * cannibal.speed,
+                sin(angle) * cannibal.speed
             )
 
-        cannibal.move(
-            cannibal.movement
-        )
+        cannibal.move((
+            cannibal.movement[0] * dt,
+            cannibal.movement[1] * dt
+        ))
 
     def is_ferry_done(self):
         """
@@ -351,63 +443,88 @@ class EntityManager:
     def stop_ferry(self):
         """
         Stop the ferry movement and update the boat state accordingly.
+        The passengers are counted on the new shore from now on.
         :return: None
         """
+        left_shore, arrival_shore = self.boat.which_shore, self.ferry_moving
+        if arrival_shore is not None and arrival_shore != left_shore:
+            for type_of_entity, count in self.boat_counts.items():
+                self.shore_counts[left_shore][type_of_entity] -= count
+                self.shore_counts[arrival_shore][type_of_entity] += count
         self.boat.which_shore = self.ferry_moving
         self.ferry_moving = None
+        self.layout_version += 1
 
-    def ferry(self):
+    def ferry(self, dt=settings.SIMULATION_STEP):
         """
         Check whether the ferry has reached the other side of the shore.
+        :param dt: (optional) Float representing the duration of the simulation step in seconds.
         :return: Boolean True if the ferry has reached the other side of the shore, False otherwise.
         """
         boat_pos = self.boat.get_position()
         if self.ferry_moving == "left":
             if boat_pos[0] >= settings.BOAT_LEFT_POS[0]:
-                self.move_boat("left")
+                self.move_boat("left", dt)
                 return False
         else:
             if boat_pos[0] <= settings.BOAT_RIGHT_POS[0]:
-                self.move_boat("right")
+                self.move_boat("right", dt)
                 return False
         # Arrived at the shore
         return True
 
-    def move_boat(self, side):
+    def move_boat(self, side, dt=settings.SIMULATION_STEP):
         """
         Move the boat to the specified side of the shore.
         :param side: String representing the side of the shore to move to ("left" or "right").
+        :param dt: (optional) Float representing the duration of the simulation step in seconds.
         :return: None
         """
         if side == "left":
             self.boat.pos = (
-                self.boat.pos[0] - self.boat.speed,
+                self.boat.pos[0] - self.boat.speed * dt,
                 self.boat.pos[1]
             )
         else:
             self.boat.pos = (
-                self.boat.pos[0] + self.boat.speed,
+                self.boat.pos[0] + self.boat.speed * dt,
                 self.boat.pos[1]
             )
+        self.layout_version += 1
+
+    def save_positions(self):
+        """
+        Remember the positions of the boat and the entities before a simulation step,
+        so that rendering can interpolate between two steps.
+        :return: None
+        """
+        self.boat.prev_pos = self.boat.pos
+        for entity in self.ents.values():
+            entity.prev_pos = entity.pos
 
     def move_entity_to_boat(self, entity_name):
         """
         Move the specified entity onto the boat if there is space. Assign
-        the index of the entity on the boat to the entity object.
+        the lowest free index on the boat to the entity object.
         :param entity_name: String representing the name of the entity to move.
         :return: None
         """
         held_entities = self.boat.held_entities
-        if len(held_entities) == 2:
+        if len(held_entities) >= self.boat.capacity:
             return  # Boat is full
-        if len(held_entities) == 1:
-            other_index = self.ents[held_entities[0]].get_index_on_boat()
-            self.boat.held_entities.append(entity_name)
-            self.ents[entity_name].move_to_boat(1 - other_index)
-
-        if len(held_entities) == 0:
-            self.boat.held_entities.append(entity_name)
-            self.ents[entity_name].move_to_boat(0)
+        taken_indexes = [self.ents[name].get_index_on_boat() for name in held_entities]
+        index = 0
+        while index in taken_indexes:
+            index += 1
+        entity = self.ents[entity_name]
+        if not entity.on_boat:
+            self.shore_names[entity.which_shore].discard(entity_name)
+            self.shore_counts[entity.which_shore][entity.type] -= 1
+            self.shore_counts[self.boat.which_shore][entity.type] += 1
+            self.boat_counts[entity.type] += 1
+        self.boat.held_entities.append(entity_name)
+        entity.move_to_boat(index)
+        self.layout_version += 1
 
     def remove_entity_from_boat(self, entity_name):
         """
@@ -415,8 +532,35 @@ class EntityManager:
         :param entity_name: String representing the name of the entity to remove.
         :return: None
         """
-        self.ents[entity_name].remove_from_boat(self.boat.which_shore)
+        entity = self.ents[entity_name]
+        entity.remove_from_boat(self.boat.which_shore)
         self.boat.held_entities.remove(entity_name)
+        self.shore_names[self.boat.which_shore].add(entity_name)
+        self.boat_counts[entity.type] -= 1
+        self.layout_version += 1
+
+    def get_names_on_shore(self, side):
+        """
+        Get the names of the entities on a shore, including the boat passengers if the boat is there.
+        :param side: String representing the shoreside ("left" or "right").
+        :return: Two lists of entity names: cannibals and missionaries, in the order the entities were created.
+        """
+        names = list(self.shore_names[side])
+        if self.boat.which_shore == side:
+            names.extend(self.boat.held_entities)
+        names.sort(key=self.entity_order.__getitem__)
+        cannibals = [name for name in names if self.ents[name].type == "cannibal"]
+        missionaries = [name for name in names if self.ents[name].type == "missionary"]
+        return cannibals, missionaries
+
+    def count_on_shore(self, side):
+        """
+        Get the number of entities on a shore, including the boat passengers if the boat is there.
+        :param side: String representing the shoreside ("left" or "right").
+        :return: Tuple (cannibals, missionaries) representing the counts.
+        """
+        counts = self.shore_counts[side]
+        return counts["cannibal"], counts["missionary"]
 
     def get_entities_on_boat(self):
         """
@@ -440,14 +584,15 @@ class EntityManager:
         Create and return a new entity object.
         :param type_of_entity: String representing the type of entity ("cannibal" or "missionary").
         :param name: String representing the name of the entity.
-        :param pos_index: Position index of the entity on the shore.
+        :param pos_index: Position index of the entity on the shore, wraps around
+        when there are more entities than shore positions.
         :return: Entity object representing the newly created entity.
         """
         entity = Entity(
             name,
             type_of_entity,
-            settings.ENTITY_LEFT_POSITIONS[pos_index],
-            settings.ENTITY_RIGHT_POSITIONS[pos_index]
+            settings.ENTITY_LEFT_POSITIONS[pos_index % len(settings.ENTITY_LEFT_POSITIONS)],
+            settings.ENTITY_RIGHT_POSITIONS[pos_index % len(settings.ENTITY_RIGHT_POSITIONS)]
         )
         return entity
 
@@ -459,18 +604,33 @@ class Boat:
         pos: Tuple representing the position of the boat (x, y).
         held_entities: List of strings representing the names of entities currently on the boat.
         which_shore: String representing the side of the shore the boat is on ("left" or "right").
-        speed: Integer representing the speed of the boat in pixels per frame.
-        sprite_name: List of strings representing the names of the sprites used to render the boat.
+        prev_pos: Tuple representing the position of the boat before the last simulation step.
+        speed: Integer representing the speed of the boat in pixels per second.
+        capacity: Integer representing the maximum number of entities on the boat.
+        sprite_name: Tuple of strings representing the names of the sprites used to render the boat.
         name: String representing the name of the boat ("boat").
+        hitbox: Rect object caching the hitbox of the boat, or None before it is first needed.
+        hitbox_pos: Tuple representing the position of the boat the cached hitbox was made for.
+        hitbox_version: Integer increased every time the hitbox changes.
     """
 
-    def __init__(self, pos):
+    __slots__ = (
+        "pos", "prev_pos", "held_entities", "which_shore", "speed", "capacity", "sprite_name", "name",
+        "hitbox", "hitbox_pos", "hitbox_version"
+    )
+
+    def __init__(self, pos, capacity=settings.BOAT_CAPACITY):
         self.pos = pos
+        self.prev_pos = pos
         self.held_entities = []
         self.which_shore = "left"  # holds entity names on the boat
         self.speed = settings.BOAT_SPEED
-        self.sprite_name = ["BOAT_1"]
+        self.capacity = capacity
+        self.sprite_name = ("BOAT_1",)
         self.name = "boat"
+        self.hitbox = None
+        self.hitbox_pos = None
+        self.hitbox_version = 0
 
     def get_entity_pos(self, index):
         """
@@ -494,14 +654,27 @@ class Boat:
         """
         return self.pos
 
+    def get_render_position(self, boat_pos=None, alpha=1.0):
+        """
+        Get the position of the boat between the last two simulation steps.
+        :param boat_pos: Not used for the boat, included for compatibility with other entity methods.
+        :param alpha: Float between 0 and 1 representing how far the frame is past the previous step.
+        :return: Tuple representing the interpolated position of the boat (x, y).
+        """
+        return interpolate(self.prev_pos, self.pos, alpha)
+
     def get_hitbox(self, boat_pos=None):
         """
-        Create and return a rectangle representing the hitbox of the boat.
+        Get the rectangle representing the hitbox of the boat. It is created again only
+        after the boat has moved, the returned rectangle must not be modified.
         :param boat_pos: Not used for the boat, included for compatibility with other entity methods.
-        :return: Pygame Rect object representing the hitbox of the boat.
+        :return: Rect object representing the hitbox of the boat.
         """
-        rect = pygame.Rect(self.get_position(), settings.BOAT_SPRITE_SCALE)
-        return rect
+        if self.hitbox is None or self.hitbox_pos != self.pos:
+            self.hitbox = Rect(self.get_position(), settings.BOAT_SPRITE_SCALE)
+            self.hitbox_pos = self.pos
+            self.hitbox_version += 1
+        return self.hitbox
 
 
 class Entity:
@@ -512,7 +685,8 @@ class Entity:
         name: String representing the name of the entity.
         type: String representing the type of entity ("cannibal" or "missionary").
 
-        sprite_name: List of strings representing the names of the sprites used to render the entity.
+        sprite_name: Tuple of strings representing the names of the sprites used to render the entity,
+        the tuples are shared by all entities of a type.
         on_boat: Boolean representing whether the entity is currently on the boat.
         hovered_over: Boolean representing whether the mouse cursor is hovering over the entity.
 
@@ -521,23 +695,37 @@ class Entity:
         right_shore_pos: Tuple representing the position of the entity on the right side of the shore (x, y).
         pos: Tuple representing the position of the entity (x, y), used the a cannibal eats a missionary.
 
-        movement: Tuple representing the movement vector of the entity (dx, dy), used to move a cannibal.
-        step: Integer representing the number of pixels the entity moves each frame when moving to
+        prev_pos: Tuple representing `pos` before the last simulation step.
+
+        movement: Tuple representing the velocity of the entity (dx, dy) in pixels per second,
+        used to move a cannibal.
+        speed: Integer representing the number of pixels the entity moves each second when moving to
         its assigned missionary.
 
         missionary_to_eat: String representing the name of the missionary the entity is assigned to eat.
+
+        hitbox: Rect object caching the hitbox of the entity, or None if it has to be created again.
+        hitbox_boat_pos: Tuple representing the position of the boat the cached hitbox was made for.
+        hitbox_version: Integer increased every time the hitbox changes.
     """
 
+    # no per-instance dictionary, crowds of thousands of entities stay small
+    __slots__ = (
+        "index_boat_pos", "name", "type", "sprite_name", "on_boat", "hovered_over",
+        "which_shore", "left_shore_pos", "right_shore_pos", "pos", "prev_pos", "movement",
+        "speed", "missionary_to_eat", "hitbox", "hitbox_boat_pos", "hitbox_version"
+    )
+
     def __init__(self, name, type_of_entity, left_shore_pos, right_shore_pos):
         self.index_boat_pos = None
         self.name = name
         self.type = type_of_entity
 
-        self.sprite_name = []
+        self.sprite_name = ()
         if type_of_entity == "cannibal":
-            self.sprite_name = ["CANNIBAL"]
+            self.sprite_name = ("CANNIBAL",)
         elif type_of_entity == "missionary":
-            self.sprite_name = ["MISSIONARY"]
+            self.sprite_name = ("MISSIONARY",)
 
         self.on_boat = False
         self.hovered_over = False
@@ -546,11 +734,16 @@ class Entity:
         self.left_shore_pos = left_shore_pos
         self.right_shore_pos = right_shore_pos
         self.pos = None
+        self.prev_pos = None
         self.movement = None
 
-        self.step = 1
+        self.speed = settings.ENTITY_SPEED
         self.missionary_to_eat = None
 
+        self.hitbox = None
+        self.hitbox_boat_pos = None
+        self.hitbox_version = 0
+
     def get_position(self, boat_pos=None):
         """
         Get the position of the entity depending on which side of the shore it is on
@@ -569,6 +762,18 @@ class Entity:
         else:
             return None
 
+    def get_render_position(self, boat_pos=None, alpha=1.0):
+        """
+        Get the position of the entity between the last two simulation steps.
+        :param boat_pos: Tuple representing the (interpolated) position of the boat (x, y),
+        used if the entity is on the boat.
+        :param alpha: Float between 0 and 1 representing how far the frame is past the previous step.
+        :return: Tuple representing the interpolated position of the entity (x, y).
+        """
+        if self.pos is not None and self.prev_pos is not None:
+            return interpolate(self.prev_pos, self.pos, alpha)
+        return self.get_position(boat_pos)
+
     def move_to_boat(self, index):
         """
         Move the entity onto the boat.
@@ -578,6 +783,7 @@ class Entity:
         self.which_shore = None
         self.on_boat = True
         self.index_boat_pos = index
+        self.invalidate_hitbox()
 
     def remove_from_boat(self, shore):
         """
@@ -588,6 +794,7 @@ class Entity:
         self.which_shore = shore
         self.on_boat = False
         self.index_boat_pos = None
+        self.invalidate_hitbox()
 
     def get_index_on_boat(self):
         """
@@ -596,13 +803,28 @@ class Entity:
         """
         return self.index_boat_pos
 
+    def invalidate_hitbox(self):
+        """
+        Drop the cached hitbox after the position, the shore or the boat seat of the entity changed.
+        :return: None
+        """
+        self.hitbox = None
+        self.hitbox_version += 1
+
     def get_hitbox(self, boat_pos=None):
         """
-        Create and return a rectangle representing the hitbox of the entity.
+        Get the rectangle representing the hitbox of the entity. It is created again only
+        after the entity has moved or, while it sits on the boat, after the boat has moved.
+        The returned rectangle must not be modified.
         :param boat_pos: Position of the boat (x, y), used to calculate
         the hitbox position if the entity is on the boat.
-        :return: Pygame Rect object representing the hitbox of the entity.
+        :return: Rect object representing the hitbox of the entity.
         """
+        if self.hitbox is not None:
+            if not self.on_boat or self.pos is not None or boat_pos == self.hitbox_boat_pos:
+                return self.hitbox
+            self.hitbox_version += 1  # carried by the boat
+
         pos = self.get_position(boat_pos)
 
         if self.on_boat:
@@ -613,8 +835,10 @@ class Entity:
         hitbox_size = (sprite_size[0], sprite_size[1])
         hitbox_pos = pos
 
-        rect = pygame.Rect(hitbox_pos, hitbox_size)
+        rect = Rect(hitbox_pos, hitbox_size)
         rect.scale_by_ip(settings.HITBOX_SCALE)
+        self.hitbox = rect
+        self.hitbox_boat_pos = boat_pos
         return rect
 
     def assign_missionary_to_eat(self, missionaries, missionaries_assigned):
@@ -639,10 +863,19 @@ class Entity:
         :param movement: Tuple representing the movement vector (dx, dy).
         :return: None
         """
-        self.pos = (
+        self.set_position((
             self.pos[0] + movement[0],
             self.pos[1] + movement[1]
-        )
+        ))
+
+    def set_position(self, pos):
+        """
+        Place the entity at a fixed position, used when a cannibal walks to a missionary.
+        :param pos: Tuple representing the position of the entity (x, y).
+        :return: None
+        """
+        self.pos = pos
+        self.invalidate_hitbox()
 
 
 class MenuState:
@@ -713,8 +946,8 @@ class Button:
     """
     Button class to represent a clickable button in the menu.
     Attributes:
-        rect (Rect): The rectangle (object from pygame)
-        representing the button.
+        rect (Rect): The rectangle (geometry.Rect, usable wherever
+        pygame expects a rect) representing the button.
         not_hover_color (tuple): The color of the button
         when not hovered over (R, G, B).
         hover_color (tuple): The color of the button
@@ -738,7 +971,7 @@ class Button:
         :param text_color: Color of the displayed text.
         :param font_size: Font size of the displayed text.
         """
-        self.rect = pygame.Rect(start_pos[0], start_pos[1], width, height)
+        self.rect = Rect(start_pos[0], start_pos[1], width, height)
         self.not_hover_color = not_hover_color
         self.hover_color = hover_color
         self.text = text
@@ -749,14 +982,14 @@ class Button:
     def get_dimensions(self):
         """
         Get the dimensions of the button.
-        :return: pygame Rect object representing button's dimensions.
+        :return: Rect object representing button's dimensions.
         """
         return self.rect
 
     def get_center(self):
         """
         Get the center position of the button.
-        :return: pygame Rect center variable (x, y).
+        :return: Rect center variable (x, y).
         """
         return self.rect.center
 
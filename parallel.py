@@ -0,0 +1,335 @@
+"""
+Process pool execution layer for large puzzle instances.
+Shards the state space or a batch of games across worker processes.
+The packed arrays live in shared memory, so tasks only carry
+the names of the shared blocks and the bounds of their shard.
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, compress
+from multiprocessing import shared_memory
+import numpy as np
+import settings
+from state_space import StateSpace, LazyStateSpace
+from batch_validator import BatchValidator, BatchResult
+from analytics import aggregate_log, get_puzzle_tables
+from game_log import GameLogReader
+
+
+INT_SIZE = array("i").itemsize
+
+
+def mark_valid(size, shard, valid_name):
+    """
+    Worker task: mark the valid states of a shard.
+    :param size: Tuple (missionaries, cannibals, capacity) representing the puzzle size.
+    :param shard: Tuple (first, last) representing the range of packed states to process.
+    :param valid_name: String representing the name of the shared block of validity bytes.
+    :return: None
+    """
+    graph = LazyStateSpace(*size, cache_size=0)
+    valid_block = shared_memory.SharedMemory(name=valid_name)
+    valid = valid_block.buf
+    try:
+        for packed in range(*shard):
+            cannibals, missionaries, _ = graph.unpack(packed)
+            if graph.is_valid_shores(cannibals, missionaries):
+                valid[packed] = 1
+    finally:
+        del valid
+        valid_block.close()
+
+
+def count_successors(size, shard, valid_name, offsets_name):
+    """
+    Worker task: store the number of successors of every valid state of a shard.
+    :param size: Tuple (missionaries, cannibals, capacity) representing the puzzle size.
+    :param shard: Tuple (first, last) representing the range of packed states to process.
+    :param valid_name: String representing the name of the shared block of validity bytes.
+    :param offsets_name: String representing the name of the shared block of offsets, the
+    number of successors of a state is written in the slot after it.
+    :return: None
+    """
+    valid_block = shared_memory.SharedMemory(name=valid_name)
+    offsets_block = shared_memory.SharedMemory(name=offsets_name)
+    valid = valid_block.buf
+    offsets = offsets_block.buf.cast("i")
+    graph = StateSpace(*size, arrays=(valid, None, None, None))
+    try:
+        for packed in range(*shard):
+            if valid[packed]:
+                offsets[packed + 1] = len(graph.compute_successors(packed))
+    finally:
+        del valid, offsets, graph
+        valid_block.close()
+        offsets_block.close()
+
+
+def fill_successors(size, shard, valid_name, offsets_name, targets_name):
+    """
+    Worker task: write the successors of the states of a shard at their offsets.
+    :param size: Tuple (missionaries, cannibals, capacity) representing the puzzle size.
+    :param shard: Tuple (first, last) representing the range of packed states to process.
+    :param valid_name: String representing the name of the shared block of validity bytes.
+    :param offsets_name: String representing the name of the shared block of offsets.
+    :param targets_name: String representing the name of the shared block of successors.
+    :return: None
+    """
+    valid_block = shared_memory.SharedMemory(name=valid_name)
+    offsets_block = shared_memory.SharedMemory(name=offsets_name)
+    targets_block = shared_memory.SharedMemory(name=targets_name)
+    valid = valid_block.buf
+    offsets = offsets_block.buf.cast("i")
+    targets = targets_block.buf.cast("i")
+    graph = StateSpace(*size, arrays=(valid, None, None, None))
+    try:
+        for packed in range(*shard):
+            start, end = offsets[packed], offsets[packed + 1]
+            if start != end:
+                targets[start:end] = array("i", graph.compute_successors(packed))
+    finally:
+        del valid, offsets, targets, graph
+        valid_block.close()
+        offsets_block.close()
+        targets_block.close()
+
+
+def validate_shard(size, shard, shape, names):
+    """
+    Worker task: validate the games (rows) of a shard and write the results in shared memory.
+    :param size: Tuple (missionaries, cannibals, capacity) representing the puzzle size.
+    :param shard: Tuple (first, last) representing the range of rows to process.
+    :param shape: Tuple (games, steps) representing the shape of the moves array.
+    :param names: Dictionary mapping array names to the names of their shared blocks.
+    :return: None
+    """
+    blocks = {key: shared_memory.SharedMemory(name=name) for key, name in names.items()}
+    arrays = result = None
+    try:
+        arrays = attach_result_arrays(blocks, shape)
+        first, last = shard
+        result = BatchValidator(*size).validate(arrays["moves"][first:last])
+        arrays["states"][first:last] = result.states
+        arrays["first_illegal"][first:last] = result.first_illegal
+        arrays["won"][first:last] = result.won
+        arrays["lost"][first:last] = result.lost
+        arrays["moves_made"][first:last] = result.moves_made
+    finally:
+        del arrays, result  # views must be released before the blocks are closed
+        for block in blocks.values():
+            block.close()
+
+
+def aggregate_shard(path, shard):
+    """
+    Worker task: aggregate the statistics of a range of the records of a game log.
+    The log is memory-mapped by every worker, so only the bounds are sent.
+    :param path: String representing the path of the game log.
+    :param shard: Tuple (first, last) representing the range of records to process.
+    :return: GameStats object of the shard.
+    """
+    return aggregate_log(path, *shard)
+
+
+def attach_result_arrays(blocks, shape):
+    """
+    Create NumPy views over the shared blocks of a validation batch.
+    :param blocks: Dictionary mapping array names to SharedMemory objects.
+    :param shape: Tuple (games, steps) representing the shape of the moves array.
+    :return: Dictionary mapping array names to NumPy arrays backed by the shared blocks.
+    """
+    games, steps = shape
+    return {
+        "moves": np.ndarray((games, steps), dtype=np.uint8, buffer=blocks["moves"].buf),
+        "states": np.ndarray((games, steps + 1), dtype=np.int32, buffer=blocks["states"].buf),
+        "first_illegal": np.ndarray(games, dtype=np.int32, buffer=blocks["first_illegal"].buf),
+        "won": np.ndarray(games, dtype=bool, buffer=blocks["won"].buf),
+        "lost": np.ndarray(games, dtype=bool, buffer=blocks["lost"].buf),
+        "moves_made": np.ndarray(games, dtype=np.int32, buffer=blocks["moves_made"].buf),
+    }
+
+
+def split(count, shards):
+    """
+    Split a range into contiguous shards of nearly equal length.
+    :param count: Integer representing the length of the range.
+    :param shards: Integer representing the number of shards.
+    :return: List of tuples (first, last) representing the non-empty shards.
+    """
+    shards = max(1, min(shards, count))
+    bounds = [count * index // shards for index in range(shards + 1)]
+    return [(first, last) for first, last in zip(bounds, bounds[1:]) if first < last]
+
+
+class ParallelPool:
+    """
+    Runs the graph builder and the batch validator on a pool of worker processes.
+    Use it as a context manager so that the workers are shut down afterwards.
+    Attributes:
+        workers: Integer representing the number of worker processes.
+        shards_per_worker: Integer representing how many shards each worker gets on average,
+        more shards balance uneven work better.
+        executor: ProcessPoolExecutor object running the tasks.
+    """
+
+    def __init__(self, workers=settings.PARALLEL_WORKERS,
+                 shards_per_worker=settings.PARALLEL_SHARDS_PER_WORKER):
+        self.workers = workers or os.cpu_count() or 1
+        self.shards_per_worker = shards_per_worker
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Shut the worker processes down.
+        :return: None
+        """
+        self.executor.shutdown()
+
+    def run(self, task, puzzle, shards, *args):
+        """
+        Run a task on every shard and wait for all of them, raising the first error.
+        :param task: Worker function taking the puzzle size, the shard and `args`.
+        :param puzzle: Tuple (missionaries, cannibals, capacity) representing the puzzle size.
+        :param shards: List of tuples (first, last) representing the shards.
+        :param args: Remaining arguments of the task, names of shared blocks and shapes.
+        :return: None
+        """
+        futures = [self.executor.submit(task, puzzle, shard, *args) for shard in shards]
+        for future in futures:
+            future.result()
+
+    def build_graph(self, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                    capacity=settings.BOAT_CAPACITY):
+        """
+        Build the complete game graph with the state space split across the workers.
+        Workers mark the valid states and count their successors, the offsets are then
+        summed up and the workers write the successors into one shared array.
+        :param missionaries: Integer representing the number of missionaries in the game.
+        :param cannibals: Integer representing the number of cannibals in the game.
+        :param capacity: Integer representing the boat capacity.
+        :return: StateSpace object representing the game graph.
+        """
+        puzzle = (missionaries, cannibals, capacity)
+        size = (cannibals + 1) * (missionaries + 1) * 2
+        shards = split(size, self.workers * self.shards_per_worker)
+
+        valid_block = shared_memory.SharedMemory(create=True, size=size)
+        offsets_block = shared_memory.SharedMemory(create=True, size=(size + 1) * INT_SIZE)
+        targets_block = None
+        try:
+            valid_block.buf[:size] = bytes(size)
+            offsets_block.buf[:(size + 1) * INT_SIZE] = bytes((size + 1) * INT_SIZE)
+            self.run(mark_valid, puzzle, shards, valid_block.name)
+            self.run(count_successors, puzzle, shards, valid_block.name, offsets_block.name)
+
+            offsets = array("i")
+            offsets.frombytes(offsets_block.buf[:(size + 1) * INT_SIZE])
+            offsets = array("i", accumulate(offsets))
+            offsets_block.buf[:(size + 1) * INT_SIZE] = offsets.tobytes()
+
+            edges = offsets[size]
+            targets_block = shared_memory.SharedMemory(create=True, size=max(edges, 1) * INT_SIZE)
+            self.run(fill_successors, puzzle, shards, valid_block.name, offsets_block.name,
+                     targets_block.name)
+
+            valid = bytearray(valid_block.buf[:size])
+            targets = array("i")
+            targets.frombytes(targets_block.buf[:edges * INT_SIZE])
+        finally:
+            for block in (valid_block, offsets_block, targets_block):
+                if block is not None:
+                    block.close()
+                    block.unlink()
+
+        states = array("i", compress(range(size), valid))
+        return StateSpace(missionaries, cannibals, capacity, arrays=(valid, states, offsets, targets))
+
+    def validate(self, moves, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                 capacity=settings.BOAT_CAPACITY):
+        """
+        Validate a batch of games with the rows split across the workers.
+        :param moves: 2-D integer array of packed moves, one row per game.
+        :param missionaries: Integer representing the number of missionaries in the game.
+        :param cannibals: Integer representing the number of cannibals in the game.
+        :param capacity: Integer representing the boat capacity.
+        :return: BatchResult object holding the states and outcomes of every game.
+        """
+        moves = np.asarray(moves, dtype=np.uint8)
+        if moves.ndim != 2:
+            raise ValueError("Moves must be a 2-D array with one row per game")
+        games, steps = moves.shape
+        byte_sizes = {
+            "moves": games * steps,
+            "states": games * (steps + 1) * INT_SIZE,
+            "first_illegal": games * INT_SIZE,
+            "won": games,
+            "lost": games,
+            "moves_made": games * INT_SIZE,
+        }
+        blocks = {}
+        arrays = None
+        try:
+            for key, byte_size in byte_sizes.items():
+                blocks[key] = shared_memory.SharedMemory(create=True, size=max(byte_size, 1))
+            arrays = attach_result_arrays(blocks, moves.shape)
+            arrays["moves"][:] = moves
+
+            names = {key: block.name for key, block in blocks.items()}
+            shards = split(games, self.workers * self.shards_per_worker)
+            self.run(validate_shard, (missionaries, cannibals, capacity), shards, moves.shape, names)
+
+            result = BatchResult(
+                arrays["states"].copy(),
+                arrays["first_illegal"].copy(),
+                arrays["won"].copy(),
+                arrays["lost"].copy(),
+                arrays["moves_made"].copy()
+            )
+        finally:
+            del arrays
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+        return result
+
+    def aggregate_log(self, path):
+        """
+        Aggregate the statistics of a game log with the records split across the workers.
+        :param path: String representing the path of the game log.
+        :return: GameStats object of every record.
+        """
+        with GameLogReader(path) as reader:
+            records = len(reader)
+            get_puzzle_tables(reader.size)  # builds and caches the distance table once, the workers load it
+        shards = split(records, self.workers * self.shards_per_worker) or [(0, 0)]
+        futures = [self.executor.submit(aggregate_shard, path, shard) for shard in shards]
+        stats = futures[0].result()
+        for future in futures[1:]:
+            stats.merge(future.result())
+        return stats
+
+
+if __name__ == "__main__":
+    import time
+    from batch_validator import random_move_lists, to_array
+
+    batch = to_array(random_move_lists(200000, 40), 40)
+    for worker_count in sorted({1, max(1, (os.cpu_count() or 1) // 2), os.cpu_count() or 1}):
+        with ParallelPool(worker_count) as pool:
+            started = time.perf_counter()
+            graph = pool.build_graph(1000, 500, 4)
+            built = time.perf_counter() - started
+
+            started = time.perf_counter()
+            pool.validate(batch)
+            validated = time.perf_counter() - started
+        print(f"{worker_count} workers: {len(graph) / built:,.0f} states/s built, "
+              f"{len(batch) / validated:,.0f} games/s validated")
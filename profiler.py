@@ -0,0 +1,152 @@
+"""
+Frame-time instrumentation for the game loop.
+Splits every frame into phases timed with a high-resolution clock and
+keeps the most recent frames in ring buffers for percentile statistics.
+"""
+
+import csv
+import json
+from array import array
+from math import ceil
+from time import perf_counter
+import settings
+
+
+PHASES = ("simulate", "render", "hover", "events", "tick")
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of sorted values.
+    :param values: Sorted list of floats.
+    :param fraction: Float between 0 and 1 representing the percentile (0.95 for p95).
+    :return: Float representing the percentile, 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    rank = max(1, ceil(len(values) * fraction))
+    return values[rank - 1]
+
+
+class FrameProfiler:
+    """
+    Times the phases of the game loop frame by frame.
+    `mark` adds the time since the previous mark to a phase, so the loop only
+    marks the end of every phase. Nothing is timed while the controller has no profiler.
+    Attributes:
+        size: Integer representing the number of frames kept.
+        phases: Tuple of strings representing the names of the phases.
+        samples: Dictionary mapping "frame" and every phase to an array of durations in seconds,
+        used as a ring buffer.
+        current: Dictionary mapping every phase to the seconds spent in it during the current frame.
+        count: Integer representing the number of frames recorded.
+        frame_started: Float representing the time stamp of the start of the current frame.
+        last_mark: Float representing the time stamp of the last mark.
+        overlay: Boolean True if the statistics are shown on screen.
+        overlay_lines: List of strings representing the last computed overlay text.
+    """
+
+    def __init__(self, size=settings.PROFILE_HISTORY, phases=PHASES):
+        self.size = size
+        self.phases = phases
+        self.samples = {name: array("d", bytes(8 * size)) for name in ("frame",) + phases}
+        self.current = dict.fromkeys(phases, 0.0)
+        self.count = 0
+        self.frame_started = self.last_mark = perf_counter()
+        self.overlay = False
+        self.overlay_lines = []
+
+    def begin_frame(self):
+        """
+        Start timing a frame.
+        :return: None
+        """
+        self.frame_started = self.last_mark = perf_counter()
+
+    def mark(self, phase):
+        """
+        End a phase: add the time since the previous mark to it.
+        :param phase: String representing the name of the phase.
+        :return: None
+        """
+        now = perf_counter()
+        self.current[phase] += now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self):
+        """
+        Store the timings of the frame in the ring buffers.
+        :return: None
+        """
+        index = self.count % self.size
+        self.samples["frame"][index] = perf_counter() - self.frame_started
+        for phase in self.phases:
+            self.samples[phase][index] = self.current[phase]
+            self.current[phase] = 0.0
+        self.count += 1
+        if self.overlay and self.count % settings.PROFILE_OVERLAY_REFRESH == 0:
+            self.overlay_lines = self.format_stats()
+
+    def get_samples(self, name):
+        """
+        Get the stored durations of the frame or a phase, oldest first.
+        :param name: String "frame" or the name of a phase.
+        :return: List of floats representing durations in seconds.
+        """
+        values = self.samples[name]
+        if self.count <= self.size:
+            return list(values[:self.count])
+        index = self.count % self.size
+        return list(values[index:]) + list(values[:index])
+
+    def get_stats(self):
+        """
+        Compute the statistics of the stored frames.
+        :return: Dictionary mapping "frame" and every phase to a dictionary with the
+        mean, p50, p95 and p99 durations in seconds.
+        """
+        stats = {}
+        for name in ("frame",) + self.phases:
+            values = sorted(self.get_samples(name))
+            stats[name] = {
+                "mean": sum(values) / len(values) if values else 0.0,
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "p99": percentile(values, 0.99)
+            }
+        return stats
+
+    def format_stats(self):
+        """
+        Format the statistics for the on-screen overlay.
+        :return: List of strings, one per line.
+        """
+        stats = self.get_stats()
+        frame = stats["frame"]
+        lines = [f"frame p50 {frame['p50'] * 1000:.2f} p95 {frame['p95'] * 1000:.2f} "
+                 f"p99 {frame['p99'] * 1000:.2f} ms"]
+        for phase in self.phases:
+            lines.append(f"{phase} p50 {stats[phase]['p50'] * 1000:.2f} p95 {stats[phase]['p95'] * 1000:.2f} ms")
+        return lines
+
+    def dump(self, path):
+        """
+        Write the stored frames to a file, as CSV if the path ends with ".csv",
+        otherwise as JSON with the statistics.
+        :param path: String representing the path of the file.
+        :return: None
+        """
+        names = ("frame",) + self.phases
+        columns = [self.get_samples(name) for name in names]
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(names)
+                writer.writerows(zip(*columns))
+            return
+        with open(path, "w") as file:
+            json.dump({
+                "frames": self.count,
+                "stats": self.get_stats(),
+                "samples": dict(zip(names, columns))
+            }, file)
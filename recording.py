@@ -0,0 +1,291 @@
+"""
+Recording and replay of the player input.
+The controller reads the events, the mouse position and the frame times through an
+input source: LiveInput reads them from pygame, InputRecorder also writes them to a
+binary log and InputReplayer feeds a log back, so a session plays out exactly the same
+again and can be used as a benchmark or a regression test.
+
+Log layout, little endian: the header (MAGIC, version as B), then for every frame
+the frame time (d), the mouse position (hh) and the number of events (H), followed
+by the events as their type (H) and key or button (i).
+"""
+
+import time
+import struct
+import pygame
+import settings
+
+
+MAGIC = b"CMIN"
+VERSION = 1
+HEADER = struct.Struct("<4sB")
+FRAME = struct.Struct("<dhhH")
+EVENT = struct.Struct("<Hi")
+
+KEY_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
+BUTTON_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+
+def get_event_value(event):
+    """
+    Get the only attribute of an event the controller reads.
+    :param event: Pygame event.
+    :return: Integer representing the key of key events, the button of mouse button events, 0 otherwise.
+    """
+    if event.type in KEY_EVENTS:
+        return event.key
+    if event.type in BUTTON_EVENTS:
+        return event.button
+    return 0
+
+
+def make_event(event_type, value):
+    """
+    Create the pygame event of a recorded type and value.
+    :param event_type: Integer representing the pygame event type.
+    :param value: Integer representing the key or the button of the event.
+    :return: Pygame event.
+    """
+    if event_type in KEY_EVENTS:
+        return pygame.event.Event(event_type, key=value)
+    if event_type in BUTTON_EVENTS:
+        return pygame.event.Event(event_type, button=value)
+    return pygame.event.Event(event_type)
+
+
+class LiveInput:
+    """
+    Input of the player, read from pygame.
+    Attributes:
+        replaying: Boolean True if the input comes from a log instead of the player.
+        throttled: Boolean True if the game runs at real speed (frame rate and end-of-game delay).
+        pending_events: List of pygame events taken from the queue by `wait_for_event`, not returned yet.
+    """
+
+    def __init__(self):
+        self.replaying = False
+        self.throttled = True
+        self.pending_events = []
+
+    def get_frame_time(self, frame_time):
+        """
+        Get the duration of the previous frame the simulation advances by.
+        :param frame_time: Float representing the measured seconds since the start of the previous frame.
+        :return: Float representing the seconds to simulate.
+        """
+        return frame_time
+
+    def get_mouse_pos(self):
+        """
+        Get the position of the mouse cursor.
+        :return: Tuple representing the position of the mouse cursor (x, y).
+        """
+        return pygame.mouse.get_pos()
+
+    def get_events(self):
+        """
+        Get the events of the frame, the pending ones first.
+        :return: List of pygame events.
+        """
+        events = self.pending_events + pygame.event.get()
+        self.pending_events = []
+        return events
+
+    def wait_for_event(self, timeout):
+        """
+        Sleep until the next event arrives. The event is kept for `get_events` instead of
+        being posted again, which would put it behind the events queued after it.
+        :param timeout: Integer representing the longest wait in milliseconds.
+        :return: None
+        """
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.pending_events.append(event)
+
+    def end_frame(self):
+        """
+        Called by the game loop after every frame.
+        :return: None
+        """
+
+    def is_finished(self):
+        """
+        Check whether the input ran out.
+        :return: Boolean True if there is no input left, False otherwise.
+        """
+        return False
+
+    def close(self):
+        """
+        Called by the game loop when it stops.
+        :return: None
+        """
+
+
+class InputRecorder(LiveInput):
+    """
+    Input of the player, read from pygame and written to a log frame by frame.
+    Attributes:
+        file: Binary file object of the log.
+        frame_time: Float representing the frame time of the current frame, None before it is read.
+        mouse_pos: Tuple representing the last mouse position read.
+        events: List of pygame events read in the current frame.
+        frames: Integer representing the number of frames written.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: String representing the path of the log, an existing file is overwritten.
+        """
+        super().__init__()
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.frame_time = None
+        self.mouse_pos = (0, 0)
+        self.events = []
+        self.frames = 0
+
+    def get_frame_time(self, frame_time):
+        self.frame_time = frame_time
+        return frame_time
+
+    def get_mouse_pos(self):
+        self.mouse_pos = pygame.mouse.get_pos()
+        return self.mouse_pos
+
+    def get_events(self):
+        events = super().get_events()
+        self.events.extend(events)
+        return events
+
+    def end_frame(self):
+        """
+        Write the input of the current frame to the log.
+        :return: None
+        """
+        if self.frame_time is None:
+            return
+        self.file.write(FRAME.pack(self.frame_time, *self.mouse_pos, len(self.events)))
+        for event in self.events:
+            self.file.write(EVENT.pack(event.type, get_event_value(event)))
+        self.frame_time = None
+        self.events = []
+        self.frames += 1
+
+    def close(self):
+        """
+        Write the last frame, the game loop can stop in the middle of one, and close the log.
+        :return: None
+        """
+        self.end_frame()
+        self.file.close()
+
+
+class InputReplayer(LiveInput):
+    """
+    Input read from a log written by InputRecorder. The recorded frame times are
+    simulated instead of the measured ones, so the replay does not depend on the speed
+    of the machine. Live events are discarded while replaying.
+    Attributes:
+        frames: List of tuples (frame time, mouse position, events) representing the recorded frames.
+        index: Integer representing the index of the frame being replayed.
+        events_read: Boolean True if the events of the current frame were returned already.
+        frame_started: Float representing the time stamp of the start of the current frame.
+    """
+
+    def __init__(self, path, throttled=True):
+        """
+        :param path: String representing the path of the log.
+        :param throttled: (optional) Boolean True to replay at the recorded speed,
+        False to replay as fast as possible.
+        """
+        super().__init__()
+        self.replaying = True
+        self.throttled = throttled
+        self.frames = self.load(path)
+        self.index = 0
+        self.events_read = False
+        self.frame_started = time.perf_counter()
+
+    @staticmethod
+    def load(path):
+        """
+        Read a log.
+        :param path: String representing the path of the log.
+        :return: List of tuples (frame time, mouse position, events) representing the frames.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < HEADER.size or HEADER.unpack_from(data) != (MAGIC, VERSION):
+            raise ValueError(f"{path} is not an input log of version {VERSION}")
+
+        frames = []
+        offset = HEADER.size
+        while offset < len(data):
+            frame_time, x, y, count = FRAME.unpack_from(data, offset)
+            offset += FRAME.size
+            events = [make_event(*EVENT.unpack_from(data, offset + index * EVENT.size)) for index in range(count)]
+            offset += count * EVENT.size
+            frames.append((frame_time, (x, y), events))
+        return frames
+
+    def get_frame_time(self, frame_time):
+        return self.frames[self.index][0]
+
+    def get_mouse_pos(self):
+        return self.frames[self.index][1]
+
+    def get_events(self):
+        pygame.event.clear()  # keeps the window responsive
+        if self.events_read:
+            return []
+        self.events_read = True
+        return self.frames[self.index][2]
+
+    def end_frame(self):
+        """
+        Move on to the next recorded frame.
+        :return: None
+        """
+        self.index += 1
+        self.events_read = False
+
+    def is_finished(self):
+        return self.index >= len(self.frames)
+
+    def wait(self):
+        """
+        Wait until the next frame starts, as long as the recorded frame took when throttled.
+        :return: None
+        """
+        if self.throttled and self.index < len(self.frames):
+            delay = self.frame_started + self.frames[self.index][0] - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.frame_started = time.perf_counter()
+
+
+def replay_session(path, view, throttled=False):
+    """
+    Play a recorded session on a new model.
+    :param path: String representing the path of the log.
+    :param view: View object to render with.
+    :param throttled: (optional) Boolean True to replay at the recorded speed.
+    :return: Dictionary with the number of frames replayed, the last action,
+    the last game state as a list and the number of moves made.
+    """
+    from model import Model
+    from controller import Controller
+
+    settings.GAME_STARTED = False
+    settings.LOST = False
+    model = Model()
+    replayer = InputReplayer(path, throttled)
+    controller = Controller(model, view, replayer)
+    controller.run()
+    return {
+        "frames": replayer.index,
+        "action": controller.action,
+        "gamestate": list(model.game_state.gamestate),
+        "moves_made": model.game_state.moves_made
+    }
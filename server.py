@@ -0,0 +1,231 @@
+"""
+Session server hosting many headless games at once on asyncio.
+Clients send one JSON request per line over a local socket and get one JSON
+response per line back. Every session is a HeadlessGame, and all of them share
+one frozen game graph and distance table built when the server starts.
+
+Requests ("id" is optional and echoed back):
+    {"op": "new"}                                   -> session, state, moves_made, outcome
+    {"op": "move", "session": 1, "move": [1, 1]}    -> session, legal, outcome, state, moves_made
+    {"op": "state", "session": 1}                   -> session, state, moves_made, outcome
+    {"op": "close", "session": 1}                   -> session, closed
+Errors are answered with {"error": message}.
+"""
+
+import asyncio
+import json
+import settings
+from model import GameState
+from headless import HeadlessGame
+from distance_table import DistanceTable
+
+
+class RequestError(Exception):
+    """
+    A request that cannot be answered, sent back to the client as an error.
+    """
+
+
+class SessionServer:
+    """
+    Hosts puzzle sessions and answers the requests of the clients.
+    Requests are handled one at a time on the event loop, a move only takes
+    microseconds, so there is nothing to await while the game logic runs.
+    Attributes:
+        size: Tuple (missionaries, cannibals, capacity) representing the puzzle size.
+        game_graph: StateSpace object shared by every session, read-only.
+        distance_table: DistanceTable object shared by every session.
+        sessions: Dictionary mapping session ids to HeadlessGame objects.
+        next_session: Integer representing the id of the next session.
+        max_sessions: Integer representing the largest number of open sessions.
+        requests: Integer representing the number of requests answered.
+        server: asyncio Server object, None before `start`.
+    """
+
+    def __init__(self, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                 capacity=settings.BOAT_CAPACITY, max_sessions=settings.SERVER_MAX_SESSIONS):
+        self.size = (missionaries, cannibals, capacity)
+        self.game_graph = GameState.get_game_graph(missionaries, cannibals, capacity).freeze()
+        self.distance_table = DistanceTable(self.game_graph)
+        self.sessions = {}
+        self.next_session = 1
+        self.max_sessions = max_sessions
+        self.requests = 0
+        self.server = None
+
+    async def start(self, host=settings.SERVER_HOST, port=settings.SERVER_PORT, path=None):
+        """
+        Start listening for clients.
+        :param host: (optional) String representing the address to listen on.
+        :param port: (optional) Integer representing the TCP port to listen on.
+        :param path: (optional) String representing the path of a Unix socket to listen on instead.
+        :return: None
+        """
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_client, path, limit=settings.SERVER_LINE_LIMIT)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port, limit=settings.SERVER_LINE_LIMIT)
+
+    async def serve_forever(self):
+        """
+        Answer clients until the task is cancelled.
+        :return: None
+        """
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def handle_client(self, reader, writer):
+        """
+        Answer the requests of one connection until the client closes it. A request line
+        longer than SERVER_LINE_LIMIT is answered with an error and closes the connection,
+        the rest of the line cannot be told apart from the next request.
+        :param reader: asyncio StreamReader of the connection.
+        :param writer: asyncio StreamWriter of the connection.
+        :return: None
+        """
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write((json.dumps({"error": "Request too long"}) + "\n").encode())
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                writer.write(self.handle_line(line))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def handle_line(self, line):
+        """
+        Answer one request line.
+        :param line: Bytes of the JSON request.
+        :return: Bytes of the JSON response, ending with a newline.
+        """
+        request = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("Request must be a JSON object")
+            response = self.handle_request(request)
+        except (ValueError, RequestError) as error:
+            response = {"error": str(error)}
+        if "id" in request:
+            response["id"] = request["id"]
+        self.requests += 1
+        return (json.dumps(response) + "\n").encode()
+
+    def handle_request(self, request):
+        """
+        Dispatch a request to its operation.
+        :param request: Dictionary representing the request.
+        :return: Dictionary representing the response.
+        """
+        op = request.get("op")
+        if op == "new":
+            return self.new_session()
+        if op not in ("move", "state", "close"):
+            raise RequestError(f"Unknown operation: {op}")
+
+        session = request.get("session")
+        game = self.get_session(session)
+        if op == "move":
+            return self.move(session, game, request.get("move"))
+        if op == "state":
+            return self.get_state(session, game)
+        del self.sessions[session]
+        return {"session": session, "closed": True}
+
+    def get_session(self, session):
+        """
+        Find the game of a session.
+        :param session: Session id from the request.
+        :return: HeadlessGame object of the session.
+        """
+        if not isinstance(session, int) or isinstance(session, bool) or session not in self.sessions:
+            raise RequestError(f"Unknown session: {json.dumps(session)}")
+        return self.sessions[session]
+
+    def new_session(self):
+        """
+        Open a session on the shared game graph.
+        :return: Dictionary representing the response.
+        """
+        if len(self.sessions) >= self.max_sessions:
+            raise RequestError("Too many sessions")
+        session = self.next_session
+        self.next_session += 1
+        self.sessions[session] = HeadlessGame(*self.size, self.game_graph, self.distance_table)
+        return self.get_state(session, self.sessions[session])
+
+    def move(self, session, game, move):
+        """
+        Make a move in a session.
+        :param session: Integer representing the id of the session.
+        :param game: HeadlessGame object of the session.
+        :param move: List [cannibals moved, missionaries moved] from the request.
+        :return: Dictionary representing the response.
+        """
+        if game.game_state.outcome != "pass":
+            raise RequestError("The game is over")
+        if (not isinstance(move, list) or len(move) != 2 or
+                not all(isinstance(value, int) and not isinstance(value, bool) and value >= 0 for value in move)):
+            raise RequestError("Move must be a list [cannibals, missionaries]")
+        outcome = game.play_move(tuple(move))
+        response = self.get_state(session, game)
+        response.update(legal=outcome != "invalid", outcome=outcome)
+        return response
+
+    @staticmethod
+    def get_state(session, game):
+        """
+        Describe a session.
+        :param session: Integer representing the id of the session.
+        :param game: HeadlessGame object of the session.
+        :return: Dictionary representing the response.
+        """
+        state = game.game_state.gamestate
+        if game.game_state.outcome == "lose":
+            # the boat is not unloaded after the losing move, report the state it reached
+            cannibals, missionaries, boat = game.states[-1]
+            moved_cannibals, moved_missionaries = game.game_state.move_history[-1]
+            direction = 1 if boat else -1
+            state = (cannibals + direction * moved_cannibals, missionaries + direction * moved_missionaries, 1 - boat)
+        return {
+            "session": session,
+            "state": state,
+            "moves_made": game.game_state.moves_made,
+            "outcome": game.game_state.outcome
+        }
+
+
+async def main(host=settings.SERVER_HOST, port=settings.SERVER_PORT, path=None):
+    """
+    Run the session server.
+    :param host: (optional) String representing the address to listen on.
+    :param port: (optional) Integer representing the TCP port to listen on.
+    :param path: (optional) String representing the path of a Unix socket to listen on instead.
+    :return: None
+    """
+    session_server = SessionServer()
+    await session_server.start(host, port, path)
+    print(f"Serving {session_server.size} sessions on {path or f'{host}:{port}'}")
+    await session_server.serve_forever()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host puzzle sessions over newline-delimited JSON")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
@@ -6,10 +6,65 @@ cannibals and missionaries game.
 GAME_STARTED = False
 LOST = False
 
+# puzzle size
+MISSIONARIES = 3
+CANNIBALS = 3
+BOAT_CAPACITY = 2
+
+# game graph
+LAZY_GAME_GRAPH = False  # compute successors on demand instead of building the whole graph
+GAME_GRAPH_CACHE_SIZE = 4096  # states memoized by the lazy game graph
+
+# solver
+SOLVER_STRATEGY = "astar"  # "bfs", "bidirectional" or "astar"
+SOLVER_STATS_HISTORY = 100  # number of recent queries kept in Solver.stats
+DISTANCE_CACHE_DIR = ".cache"  # directory of the cached distance tables, None disables caching
+RATE_MOVES = True  # label every move as optimal or suboptimal
+
+# game log
+GAME_LOG_PATH = None  # file finished games are appended to, None disables the log
+GAME_LOG_MAX_MOVES = 64  # move slots of a record, longer games keep their first moves
+GAME_LOG_CHUNK_SIZE = 65536  # records per chunk when scanning a log
+GAME_STATS_HISTOGRAM_SIZE = 256  # bins of the moves made histogram, the last one collects longer games
+
+# session server
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_MAX_SESSIONS = 100000  # open sessions at most, new sessions are refused beyond
+SERVER_LINE_LIMIT = 65536  # longest request line in bytes, longer ones close the connection
+LOAD_SESSIONS = 10000  # sessions played by load_generator.py
+LOAD_CONNECTIONS = 50  # concurrent connections of load_generator.py
+
+# parallel execution
+PARALLEL_WORKERS = None  # worker processes, None uses every core
+PARALLEL_SHARDS_PER_WORKER = 4
+
+# benchmarks
+BENCHMARK_SIZES = [(3, 3, 2), (50, 50, 4), (200, 200, 6)]  # (missionaries, cannibals, capacity) of the graph benchmarks
+BENCHMARK_REPEATS = 5  # timed runs per benchmark, the fastest one is compared with the baseline
+BENCHMARK_MIN_TIME = 0.05  # seconds, a timed run repeats the benchmark until it took at least this long
+BENCHMARK_BASELINE_PATH = "benchmark_baseline.json"
+BENCHMARK_THRESHOLD = 0.25  # slowdown against the baseline that fails the run (0.25 = 25% slower)
+BENCHMARK_THRESHOLDS = {"assets.": 0.5}  # thresholds of the benchmarks whose name starts with a key
+
 SIZE = (1600, 900)
 SCREEN_TITLE = "cannibals and missionaries"
 FRAMERATE = 60
+SIMULATION_RATE = 60  # simulation steps per second, independent of FRAMERATE
+SIMULATION_STEP = 1 / SIMULATION_RATE  # seconds
+MAX_FRAME_TIME = 0.25  # seconds of simulation caught up after a slow frame at most
+REALTIME_SIMULATION = True  # False runs exactly one simulation step per frame, as fast as possible
+ADAPTIVE_FRAMERATE = True  # sleep until the next input event while nothing animates
+IDLE_WAIT_TIMEOUT = 500  # milliseconds, longest sleep before rendering again
+REPORT_IDLE_STATS = False  # print the idle CPU savings when the game loop ends
+PROFILE_FRAMES = False  # time the phases of every frame from the start, F3 toggles the overlay anyway
+PROFILE_HISTORY = 600  # frames kept for the frame-time statistics
+PROFILE_OVERLAY_REFRESH = 30  # frames between two updates of the overlay text
+PROFILE_OVERLAY_POS = (SIZE[0] - 330, 20)  # top left corner of the overlay
+PROFILE_OVERLAY_FONT_SIZE = 16
+PROFILE_DUMP_PATH = None  # file the frame timings are written to on exit, ".csv" or ".json"
 SCREEN_DIM = 100
+DIRTY_RECT_RENDERING = False  # redraw and push only the changed parts of the game screen
 
 # game end
 GAME_WIN = "You won"
@@ -22,6 +77,9 @@ GAME_END_POS = (SIZE[0] / 2, SIZE[1] / 2)
 GAME_END_MOVES_MADE_POS = (GAME_END_POS[0], GAME_END_POS[1] + 100)
 MOVES_MADE_POS = (100, 50)
 MOVES_MADE_FONT_SIZE = 20
+LOADING_TEXT = "Loading"
+LOADING_TEXT_POS = (SIZE[0] / 2, SIZE[1] - 50)
+LOADING_FONT_SIZE = 20
 
 # sprites
 BACKGROUND_PATH = {
@@ -44,14 +102,22 @@ ENTITY_ON_BOAT_SCALE = (130, 130)
 BOAT_SPRITE_SCALE = (200, 100)
 BACKGROUND_SPRITE_SCALE = SIZE
 HITBOX_SCALE = 0.7
+ON_BOAT_SPRITE_SUFFIX = "_ON_BOAT"  # name suffix of the sprites cropped to ENTITY_ON_BOAT_SCALE
+SPRITE_CACHE_DIR = ".cache"  # directory of the cached sprite atlas, None disables caching
+ASYNC_ASSET_LOADING = True  # show the menu first and load the other sprites in a background thread
+PLACEHOLDER_COLOR = (255, 255, 255, 60)  # drawn in place of sprites that are still loading
+HOVER_GRID_CELL_SIZE = 64  # pixels, cell size of the grid used to find the hovered entity
 
 # boat settings
-BOAT_SPEED = 10
+BOAT_SPEED = 600  # pixels per second
 BOAT_MOVE_LEFT = (-30, 0)
 BOAT_MOVE_RIGHT = (40, -30)
 BOAT_LEFT_POS = (527 + BOAT_MOVE_LEFT[0], 444 + BOAT_MOVE_LEFT[1])
 BOAT_RIGHT_POS = (850 + BOAT_MOVE_RIGHT[0], 444 + BOAT_MOVE_RIGHT[1])
 
+# entity settings
+ENTITY_SPEED = 60  # pixels per second, used when a cannibal walks to a missionary
+
 # rendering entities in the boat
 DIST_FROM_EDGE_OF_BOAT = 0
 DIST_BETWEEN_ENTS_IN_BOAT = 0
@@ -88,7 +154,7 @@ ENTITY_RIGHT_POSITIONS = [
 
 # rules
 RULES = ["The task is to move all of them to right side of the river rules: ",
-         "1. The boat can carry at most two people ",
+         f"1. The boat can carry at most {BOAT_CAPACITY} people ",
          "2. If cannibals num greater than missionaries then the cannibals would eat the missionaries ",
          "3. The boat cannot cross the river by itself with no people on board"]
 RULES_START_POS = (SIZE[0] / 2, SIZE[1] / 3)
@@ -116,3 +182,4 @@ MENU_BUTTON_START_POS_Y = SIZE[1] / 2 - BUTTON_HEIGHT
 TEXT_COLOR = (255, 255, 255)  # white
 FONT_SIZE = 50
 FONT = "Poppins-Light.ttf"
+TEXT_CACHE_SIZE = 64  # rendered text surfaces kept by the view
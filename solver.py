@@ -0,0 +1,238 @@
+"""
+Solver for the cannibals and missionaries puzzle.
+Searches the game graph for the shortest sequence of moves
+that leads to the winning game state.
+"""
+
+import heapq
+from collections import deque
+from time import perf_counter
+import settings
+
+
+class SearchStats:
+    """
+    Statistics of a single solver query.
+    Attributes:
+        strategy: String representing the search strategy used ("bfs", "bidirectional" or "astar").
+        nodes_expanded: Integer representing the number of states whose successors were generated.
+        elapsed: Float representing the duration of the query in seconds.
+        path_length: Integer representing the number of moves in the found path, or None if none was found.
+    """
+
+    def __init__(self, strategy, nodes_expanded, elapsed, path_length):
+        self.strategy = strategy
+        self.nodes_expanded = nodes_expanded
+        self.elapsed = elapsed
+        self.path_length = path_length
+
+    def __repr__(self):
+        return (f"SearchStats(strategy={self.strategy!r}, nodes_expanded={self.nodes_expanded}, "
+                f"elapsed={self.elapsed * 1000:.3f}ms, path_length={self.path_length})")
+
+
+class Solver:
+    """
+    Finds optimal solutions over a game graph (StateSpace or LazyStateSpace).
+    Every move can be undone by the same move in the opposite direction, so the
+    graph is undirected and the searches from the goal can reuse the successors.
+    Attributes:
+        game_graph: StateSpace object representing the game graph to search.
+        strategy: String representing the default search strategy ("bfs", "bidirectional" or "astar").
+        last_stats: SearchStats object of the last query, or None before the first query.
+        stats: Deque of SearchStats objects of the most recent queries.
+    """
+
+    STRATEGIES = ("bfs", "bidirectional", "astar")
+
+    def __init__(self, game_graph, strategy=settings.SOLVER_STRATEGY):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown search strategy: {strategy}")
+        self.game_graph = game_graph
+        self.strategy = strategy
+        self.last_stats = None
+        self.stats = deque(maxlen=settings.SOLVER_STATS_HISTORY)
+
+    def shortest_path(self, gamestate, strategy=None):
+        """
+        Find the shortest sequence of game states from a game state to the winning game state.
+        :param gamestate: Tuple representing the game state to start from.
+        :param strategy: (optional) String representing the search strategy, defaults to `self.strategy`.
+        :return: List of tuples representing the game states from `gamestate` to the goal
+        (both included), or None if the goal cannot be reached.
+        """
+        strategy = strategy or self.strategy
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown search strategy: {strategy}")
+        if gamestate not in self.game_graph:
+            return None
+
+        graph = self.game_graph
+        start = graph.pack(gamestate)
+        goal = graph.pack(graph.goal)
+
+        started = perf_counter()
+        if strategy == "bfs":
+            path, expanded = self.bfs(start, goal)
+        elif strategy == "bidirectional":
+            path, expanded = self.bidirectional_bfs(start, goal)
+        else:
+            path, expanded = self.astar(start, goal)
+        elapsed = perf_counter() - started
+
+        self.last_stats = SearchStats(
+            strategy,
+            expanded,
+            elapsed,
+            None if path is None else len(path) - 1
+        )
+        self.stats.append(self.last_stats)
+
+        if path is None:
+            return None
+        return [graph.unpack(packed) for packed in path]
+
+    def next_best_move(self, gamestate, strategy=None):
+        """
+        Find the first move of an optimal solution from a game state.
+        :param gamestate: Tuple representing the current game state.
+        :param strategy: (optional) String representing the search strategy, defaults to `self.strategy`.
+        :return: Tuple representing the move (cannibals moved, missionaries moved),
+        or None if the game is already won or cannot be won.
+        """
+        path = self.shortest_path(gamestate, strategy)
+        if path is None or len(path) < 2:
+            return None
+        return self.game_graph.move_between(path[0], path[1])
+
+    def heuristic(self, packed):
+        """
+        Estimate the number of moves left from a packed state. Every crossing to the right
+        shore carries at most `capacity` people, so the estimate never exceeds the real cost.
+        :param packed: Integer representing the packed state.
+        :return: Integer representing the lower bound of moves left.
+        """
+        cannibals, missionaries, _ = self.game_graph.unpack(packed)
+        return -(-(cannibals + missionaries) // self.game_graph.capacity)
+
+    def bfs(self, start, goal):
+        """
+        Breadth-first search from the start to the goal.
+        :param start: Integer representing the packed start state.
+        :param goal: Integer representing the packed goal state.
+        :return: Tuple (list of packed states on the path or None, number of expanded states).
+        """
+        successor_ids = self.game_graph.successor_ids
+        parents = {start: None}
+        queue = deque([start])
+        expanded = 0
+        while queue:
+            packed = queue.popleft()
+            if packed == goal:
+                return self.build_path(parents, goal), expanded
+            expanded += 1
+            for next_packed in successor_ids(packed):
+                if next_packed not in parents:
+                    parents[next_packed] = packed
+                    queue.append(next_packed)
+        return None, expanded
+
+    def bidirectional_bfs(self, start, goal):
+        """
+        Breadth-first search from both the start and the goal, one whole layer at a time,
+        always growing the smaller frontier.
+        :param start: Integer representing the packed start state.
+        :param goal: Integer representing the packed goal state.
+        :return: Tuple (list of packed states on the path or None, number of expanded states).
+        """
+        if start == goal:
+            return [start], 0
+
+        successor_ids = self.game_graph.successor_ids
+        forward = {start: None}
+        backward = {goal: None}
+        forward_frontier = [start]
+        backward_frontier = [goal]
+        expanded = 0
+
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, parents, other = forward_frontier, forward, backward
+            else:
+                frontier, parents, other = backward_frontier, backward, forward
+
+            next_frontier = []
+            meeting = None
+            for packed in frontier:
+                expanded += 1
+                for next_packed in successor_ids(packed):
+                    if next_packed in parents:
+                        continue
+                    parents[next_packed] = packed
+                    if next_packed in other:
+                        meeting = next_packed
+                        break
+                    next_frontier.append(next_packed)
+                if meeting is not None:
+                    break
+
+            if meeting is not None:
+                path = self.build_path(forward, meeting)
+                node = backward[meeting]
+                while node is not None:
+                    path.append(node)
+                    node = backward[node]
+                return path, expanded
+
+            if parents is forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+        return None, expanded
+
+    def astar(self, start, goal):
+        """
+        A* search from the start to the goal using `heuristic`.
+        :param start: Integer representing the packed start state.
+        :param goal: Integer representing the packed goal state.
+        :return: Tuple (list of packed states on the path or None, number of expanded states).
+        """
+        successor_ids = self.game_graph.successor_ids
+        heuristic = self.heuristic
+        parents = {start: None}
+        costs = {start: 0}
+        queue = [(heuristic(start), 0, start)]  # ties go to the deeper state
+        closed = set()
+        expanded = 0
+        while queue:
+            _, negative_cost, packed = heapq.heappop(queue)
+            cost = -negative_cost
+            if packed == goal:
+                return self.build_path(parents, goal), expanded
+            if packed in closed:
+                continue
+            closed.add(packed)
+            expanded += 1
+            for next_packed in successor_ids(packed):
+                next_cost = cost + 1
+                if next_cost < costs.get(next_packed, next_cost + 1):
+                    costs[next_packed] = next_cost
+                    parents[next_packed] = packed
+                    heapq.heappush(queue, (next_cost + heuristic(next_packed), -next_cost, next_packed))
+        return None, expanded
+
+    @staticmethod
+    def build_path(parents, end):
+        """
+        Walk the parent links back from the end of a search.
+        :param parents: Dictionary mapping each packed state to the packed state it was reached from.
+        :param end: Integer representing the last packed state of the path.
+        :return: List of packed states from the root of the search to `end`.
+        """
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        path.reverse()
+        return path
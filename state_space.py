@@ -0,0 +1,334 @@
+"""
+State-space engine for the cannibals and missionaries puzzle.
+Enumerates the valid game states and the transitions between them
+for any number of missionaries, cannibals and any boat capacity.
+"""
+
+from array import array
+from functools import lru_cache
+import settings
+
+
+MAX_MOVE_SIDE = 15  # largest number of cannibals or missionaries in a packed move
+
+
+def generate_moves(capacity):
+    """
+    Generate every move the boat can make with the given capacity.
+    :param capacity: Integer representing the maximum number of people on the boat.
+    :return: List of tuples representing the moves (cannibals moved, missionaries moved).
+    """
+    moves = []
+    for people in range(1, capacity + 1):
+        for cannibals in range(people, -1, -1):
+            moves.append((cannibals, people - cannibals))
+    return moves
+
+
+def encode_move(move):
+    """
+    Pack a move into one byte, cannibals in the high nibble and missionaries in the low nibble.
+    The code 0 is never a legal move, so it can mark the end of a move sequence.
+    :param move: Tuple representing the move (cannibals moved, missionaries moved).
+    :return: Integer between 0 and 255 representing the packed move.
+    """
+    cannibals, missionaries = move
+    if not (0 <= cannibals <= MAX_MOVE_SIDE and 0 <= missionaries <= MAX_MOVE_SIDE):
+        raise ValueError(f"Move does not fit in one byte: {move}")
+    return (cannibals << 4) | missionaries
+
+
+def decode_move(code):
+    """
+    Unpack a move packed by `encode_move`.
+    :param code: Integer between 0 and 255 representing the packed move.
+    :return: Tuple representing the move (cannibals moved, missionaries moved).
+    """
+    return code >> 4, code & 0x0F
+
+
+class StateSpace:
+    """
+    Complete transition graph of a puzzle instance.
+
+    A game state (cannibals on the left, missionaries on the left, boat: 0: left 1: right)
+    is packed into a single integer, see `pack`. The successors of every packed state
+    are stored in flat arrays (compressed sparse rows), so that graphs with millions
+    of states fit in memory.
+
+    Attributes:
+        missionaries: Integer representing the number of missionaries in the game.
+        cannibals: Integer representing the number of cannibals in the game.
+        capacity: Integer representing the boat capacity.
+        moves: List of tuples representing all moves the boat can make.
+        move_offsets: List of tuples (cannibals moved, missionaries moved, packed offset).
+        size: Integer representing the number of packed states (valid or not).
+        start: Tuple representing the starting game state.
+        goal: Tuple representing the winning game state.
+        valid: Bytearray marking every valid packed state with 1.
+        states: Array of all valid packed states in ascending order.
+        offsets: Array mapping a packed state to the start of its successors in `targets`.
+        targets: Array of packed successor states.
+    """
+
+    def __init__(self, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                 capacity=settings.BOAT_CAPACITY, arrays=None):
+        """
+        :param missionaries: Integer representing the number of missionaries in the game.
+        :param cannibals: Integer representing the number of cannibals in the game.
+        :param capacity: Integer representing the boat capacity.
+        :param arrays: (optional) Tuple (valid, states, offsets, targets) of arrays built
+        elsewhere, e.g. by the parallel builder, used instead of building the graph.
+        """
+        self.missionaries = missionaries
+        self.cannibals = cannibals
+        self.capacity = capacity
+        self.moves = generate_moves(capacity)
+        self.move_offsets = [
+            (move[0], move[1], (move[0] * (missionaries + 1) + move[1]) * 2)
+            for move in self.moves
+        ]
+        self.size = (cannibals + 1) * (missionaries + 1) * 2
+        self.start = (cannibals, missionaries, 0)
+        self.goal = (0, 0, 1)
+        if arrays is None:
+            self.build()
+        else:
+            self.valid, self.states, self.offsets, self.targets = arrays
+
+    def build(self):
+        """
+        Enumerate all valid states and fill the successor arrays.
+        :return: None
+        """
+        self.valid = valid = bytearray(self.size)
+        self.states = states = array("i")
+        self.offsets = array("i", bytes(4 * (self.size + 1)))
+        self.targets = array("i")
+        for packed in self.iter_valid_states():
+            valid[packed] = 1
+            states.append(packed)
+
+        offsets = self.offsets
+        targets = self.targets
+        filled = 0
+        for packed in states:
+            # invalid states in between have no successors
+            offsets[filled:packed + 1] = array("i", [len(targets)]) * (packed + 1 - filled)
+            targets.extend(self.compute_successors(packed))
+            filled = packed + 1
+        offsets[filled:] = array("i", [len(targets)]) * (self.size + 1 - filled)
+
+    def freeze(self):
+        """
+        Make the arrays of the graph read-only, so that one graph can be shared safely,
+        e.g. by every session of the server. Writing to them raises a TypeError.
+        Only for complete graphs, a LazyStateSpace has no arrays.
+        :return: StateSpace object, self.
+        """
+        self.moves = tuple(self.moves)
+        self.move_offsets = tuple(self.move_offsets)
+        self.valid = memoryview(self.valid).toreadonly()
+        self.states = memoryview(self.states).toreadonly()
+        self.offsets = memoryview(self.offsets).toreadonly()
+        self.targets = memoryview(self.targets).toreadonly()
+        return self
+
+    def iter_valid_states(self):
+        """
+        Generate the packed representation of every valid game state in ascending order.
+        :return: Generator of integers representing the valid packed states.
+        """
+        for cannibal in range(self.cannibals + 1):
+            for missionary in range(self.missionaries + 1):
+                if self.is_valid_shores(cannibal, missionary):
+                    packed = (cannibal * (self.missionaries + 1) + missionary) * 2
+                    yield packed
+                    yield packed + 1
+
+    def compute_successors(self, packed):
+        """
+        Compute the packed successors of a packed state.
+        Moves are applied as offsets in the packed representation.
+        :param packed: Integer representing a valid packed state.
+        :return: List of integers representing the packed successor states.
+        """
+        shores, boat = divmod(packed, 2)
+        cannibals, missionaries = divmod(shores, self.missionaries + 1)
+        valid = self.valid
+        if boat == 0:
+            return [
+                packed - offset + 1
+                for move_cannibals, move_missionaries, offset in self.move_offsets
+                if move_cannibals <= cannibals and move_missionaries <= missionaries
+                and valid[packed - offset + 1]
+            ]
+        free_cannibals = self.cannibals - cannibals
+        free_missionaries = self.missionaries - missionaries
+        return [
+            packed + offset - 1
+            for move_cannibals, move_missionaries, offset in self.move_offsets
+            if move_cannibals <= free_cannibals and move_missionaries <= free_missionaries
+            and valid[packed + offset - 1]
+        ]
+
+    def is_valid_shores(self, left_cannibals, left_missionaries):
+        """
+        Check if nobody gets eaten on either shore.
+        :param left_cannibals: Integer representing the number of cannibals on the left shore.
+        :param left_missionaries: Integer representing the number of missionaries on the left shore.
+        :return: Boolean True if the shores are safe, False otherwise.
+        """
+        right_cannibals = self.cannibals - left_cannibals
+        right_missionaries = self.missionaries - left_missionaries
+        if left_cannibals > left_missionaries > 0:
+            return False
+        if right_cannibals > right_missionaries > 0:
+            return False
+        return True
+
+    def is_valid_gamestate(self, gamestate):
+        """
+        Check if a given game state is valid.
+        :param gamestate: Tuple representing the game state (cannibals
+        on the left, missionaries on the left, boat: 0: left 1: right).
+        :return: Boolean True if the game state is valid, False otherwise.
+        """
+        left_cannibals, left_missionaries, boat = gamestate
+        if not 0 <= left_cannibals <= self.cannibals:
+            return False
+        if not 0 <= left_missionaries <= self.missionaries:
+            return False
+        if boat not in (0, 1):
+            return False
+        return self.is_valid_shores(left_cannibals, left_missionaries)
+
+    def pack(self, gamestate):
+        """
+        Pack a game state into a single integer.
+        :param gamestate: Tuple representing the game state (cannibals, missionaries, boat).
+        :return: Integer representing the packed game state.
+        """
+        cannibals, missionaries, boat = gamestate
+        return (cannibals * (self.missionaries + 1) + missionaries) * 2 + boat
+
+    def unpack(self, packed):
+        """
+        Unpack an integer into a game state.
+        :param packed: Integer representing the packed game state.
+        :return: Tuple representing the game state (cannibals, missionaries, boat).
+        """
+        shores, boat = divmod(packed, 2)
+        cannibals, missionaries = divmod(shores, self.missionaries + 1)
+        return cannibals, missionaries, boat
+
+    def successor_ids(self, packed):
+        """
+        Get the packed successors of a packed state.
+        :param packed: Integer representing a packed state.
+        :return: Array of integers representing the packed successor states.
+        """
+        return self.targets[self.offsets[packed]:self.offsets[packed + 1]]
+
+    @staticmethod
+    def move_between(gamestate, next_gamestate):
+        """
+        Get the move that leads from one game state to another.
+        :param gamestate: Tuple representing the current game state.
+        :param next_gamestate: Tuple representing the next game state.
+        :return: Tuple representing the move (cannibals moved, missionaries moved).
+        """
+        return (
+            abs(gamestate[0] - next_gamestate[0]),
+            abs(gamestate[1] - next_gamestate[1])
+        )
+
+    def next_states(self, gamestate):
+        """
+        Get the next possible game states from a given game state.
+        :param gamestate: Tuple representing the current game state.
+        :return: Dictionary mapping each legal move to its resulting game state.
+        """
+        if gamestate not in self:
+            raise KeyError(gamestate)
+        next_states = {}
+        for packed in self.successor_ids(self.pack(gamestate)):
+            next_state = self.unpack(packed)
+            next_states[self.move_between(gamestate, next_state)] = next_state
+        return next_states
+
+    def __getitem__(self, gamestate):
+        return self.next_states(gamestate)
+
+    def __contains__(self, gamestate):
+        return self.is_valid_gamestate(gamestate) and bool(self.valid[self.pack(gamestate)])
+
+    def __iter__(self):
+        for packed in self.states:
+            yield self.unpack(packed)
+
+    def __len__(self):
+        return len(self.states)
+
+
+class LazyStateSpace(StateSpace):
+    """
+    Transition graph of a puzzle instance that is built on demand.
+
+    Nothing is enumerated up front. The successors of a state are computed the
+    first time the state is visited and memoized in a bounded LRU cache, so
+    memory only grows with the states actually visited.
+
+    Attributes:
+        cache_size: Integer representing the maximum number of memoized states.
+        successor_ids: LRU cached function returning the packed successors of a packed state.
+    """
+
+    def __init__(self, missionaries=settings.MISSIONARIES, cannibals=settings.CANNIBALS,
+                 capacity=settings.BOAT_CAPACITY, cache_size=settings.GAME_GRAPH_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.successor_ids = lru_cache(maxsize=cache_size)(self.compute_successors)
+        super().__init__(missionaries, cannibals, capacity)
+
+    def build(self):
+        """
+        Nothing is built up front, successors are computed on demand.
+        :return: None
+        """
+        return
+
+    def compute_successors(self, packed):
+        """
+        Compute the packed successors of a packed state.
+        :param packed: Integer representing a valid packed state.
+        :return: Tuple of integers representing the packed successor states.
+        """
+        cannibals, missionaries, boat = self.unpack(packed)
+        direction = -1 if boat == 0 else 1
+        successors = []
+        for move_cannibals, move_missionaries in self.moves:
+            next_state = (
+                cannibals + move_cannibals * direction,
+                missionaries + move_missionaries * direction,
+                1 - boat
+            )
+            if self.is_valid_gamestate(next_state):
+                successors.append(self.pack(next_state))
+        return tuple(successors)
+
+    def cache_info(self):
+        """
+        Get the hit and miss statistics of the successor cache.
+        :return: Named tuple (hits, misses, maxsize, currsize).
+        """
+        return self.successor_ids.cache_info()
+
+    def __contains__(self, gamestate):
+        return self.is_valid_gamestate(gamestate)
+
+    def __iter__(self):
+        for packed in self.iter_valid_states():
+            yield self.unpack(packed)
+
+    def __len__(self):
+        return sum(1 for _ in self.iter_valid_states())
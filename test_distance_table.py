@@ -0,0 +1,42 @@
+"""
+Building and caching of the distance table.
+"""
+
+import os
+import multiprocessing
+from state_space import StateSpace
+from distance_table import DistanceTable
+
+PROCESSES = 8
+ROUNDS = 50
+
+
+def build_tables(graph, cache_dir, barrier, results):
+    for round_index in range(ROUNDS):
+        barrier.wait()  # every process builds and saves the table at the same time
+        try:
+            results.put(bytes(DistanceTable(graph, os.path.join(cache_dir, str(round_index))).distances))
+        except OSError as error:
+            results.put(error)
+
+
+def test_concurrent_builds_on_an_empty_cache(tmp_path):
+    graph = StateSpace(200, 200, 3)
+    context = multiprocessing.get_context("fork")
+    barrier, results = context.Barrier(PROCESSES), context.Queue()
+    processes = [
+        context.Process(target=build_tables, args=(graph, str(tmp_path), barrier, results))
+        for _ in range(PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    tables = [results.get(timeout=60) for _ in range(PROCESSES * ROUNDS)]
+    for process in processes:
+        process.join()
+
+    expected = bytes(DistanceTable(graph, None).distances)
+    assert tables == [expected] * (PROCESSES * ROUNDS)
+    for round_index in range(ROUNDS):
+        cache_dir = os.path.join(tmp_path, str(round_index))
+        assert os.listdir(cache_dir) == ["distances_200_200_3.bin"]
+        assert bytes(DistanceTable(graph, cache_dir).load()) == expected
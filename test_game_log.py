@@ -0,0 +1,87 @@
+"""
+Round trips of games through GameLogWriter and GameLogReader.
+"""
+
+import numpy as np
+import pytest
+from state_space import encode_move
+from batch_validator import BatchValidator
+from game_log import GameLogWriter, GameLogReader, OUTCOMES, HEADER
+from headless import HeadlessGame
+
+SOLUTION = [(2, 0), (1, 0), (2, 0), (1, 0), (0, 2), (1, 1), (0, 2), (1, 0), (2, 0), (1, 0), (2, 0)]
+
+
+def write_batch(path, move_lists, max_moves=16):
+    moves = np.zeros((len(move_lists), max_moves), dtype=np.uint8)
+    for row, move_list in enumerate(move_lists):
+        moves[row, :len(move_list)] = [encode_move(move) if move else 0 for move in move_list]
+    with GameLogWriter(path, max_moves=max_moves) as writer:
+        writer.write_batch(moves, BatchValidator().validate(moves))
+
+
+def test_won_game_keeps_only_the_moves_up_to_the_win(tmp_path):
+    path = tmp_path / "games.log"
+    write_batch(path, [SOLUTION + [(1, 0), (2, 0)]])
+    with GameLogReader(path) as reader:
+        assert OUTCOMES[reader.outcomes[0]] == "win"
+        assert reader.lengths[0] == reader.moves_made[0] == len(SOLUTION)
+        assert list(reader.moves[0]) == [encode_move(move) for move in SOLUTION] + [0] * 5
+
+
+def test_moves_after_a_gap_are_not_stored(tmp_path):
+    path = tmp_path / "games.log"
+    write_batch(path, [[(1, 1), None, (1, 0)]])
+    with GameLogReader(path) as reader:
+        assert OUTCOMES[reader.outcomes[0]] == "pass"
+        assert reader.lengths[0] == reader.moves_made[0] == 1
+        assert list(reader.moves[0][:3]) == [encode_move((1, 1)), 0, 0]
+
+
+def test_lost_and_invalid_games_keep_their_last_move(tmp_path):
+    path = tmp_path / "games.log"
+    write_batch(path, [[(1, 1), (0, 1), (0, 2)], [(1, 1), (3, 0)]])
+    with GameLogReader(path) as reader:
+        assert [OUTCOMES[outcome] for outcome in reader.outcomes] == ["lose", "invalid"]
+        assert list(reader.lengths) == [3, 2]
+        assert list(reader.moves_made) == [3, 1]
+
+
+def test_game_state_hook_matches_the_batch(tmp_path):
+    hooked, batched = tmp_path / "hooked.log", tmp_path / "batched.log"
+    with GameLogWriter(hooked, max_moves=16) as writer:
+        HeadlessGame(game_log=writer).play(SOLUTION)
+        HeadlessGame(game_log=writer).play([(1, 1), (0, 1), (0, 2)])
+    write_batch(batched, [SOLUTION, [(1, 1), (0, 1), (0, 2)]])
+    assert hooked.read_bytes() == batched.read_bytes()
+
+
+def test_truncated_record_is_ignored(tmp_path):
+    path = tmp_path / "games.log"
+    write_batch(path, [SOLUTION, SOLUTION])
+    path.write_bytes(path.read_bytes()[:-5])
+    with GameLogReader(path) as reader:
+        assert len(reader) == 1
+        assert OUTCOMES[reader.outcomes[0]] == "win"
+
+
+def test_header_mismatch_is_rejected(tmp_path):
+    path = tmp_path / "games.log"
+    write_batch(path, [SOLUTION], max_moves=16)
+    with pytest.raises(ValueError):
+        GameLogWriter(path, max_moves=32)
+    with pytest.raises(ValueError):
+        GameLogWriter(path, missionaries=4, cannibals=4, max_moves=16)
+
+    path.write_bytes(b"XXXX" + path.read_bytes()[4:])
+    with pytest.raises(ValueError):
+        GameLogReader(path)
+    path.write_bytes(b"\0" * (HEADER.size - 1))
+    with pytest.raises(ValueError):
+        GameLogReader(path)
+
+
+def test_puzzles_with_larger_moves_are_not_logged(tmp_path):
+    with pytest.raises(ValueError):
+        GameLogWriter(tmp_path / "games.log", missionaries=40, cannibals=40, capacity=20)
+    assert HeadlessGame(40, 40, 20).play_move((16, 0)) == "pass"
@@ -3,6 +3,12 @@ View component of the MVC architecture for the game.
 Handles all rendering and visual presentation using Pygame.
 """
 
+import os
+import time
+import queue
+import hashlib
+import threading
+from collections import OrderedDict, Counter
 import pygame
 import settings
 
@@ -17,7 +23,19 @@ class View:
         menu_renderer (MenuRenderer): Helper for rendering menu elements.
         game_renderer (GameRenderer): Helper for rendering game entities.
         sprite_loader (SpriteLoader): Manages loading and storage of sprites.
+        fonts (FontRegistry): Opens every font file and size once.
+        text_cache (TextCache): Caches rendered text surfaces.
         font (pygame.font.Font): Default font for rendering text.
+        dim_overlay (pygame.Surface): Semi-transparent black surface used to dim the screen.
+        compositor (LayerCompositor): Caches the finished menu, pause and rules screens.
+        dirty_renderer (DirtyRectRenderer): Redraws only the changed parts of the game screen,
+        None when dirty-rect rendering is disabled.
+        last_frame (tuple): Action and layer key of the last rendered frame.
+        started (float): Time stamp of the creation of the view.
+        time_to_first_frame (float): Seconds from the creation of the view to the first
+        frame on screen, None before it.
+        startup_timings (dict): Seconds spent in each startup step ("pygame.init",
+        "set_mode" and "assets").
     """
 
     def __init__(self):
@@ -25,40 +43,144 @@ class View:
         Initializes the Pygame environment, sets up the display window,
         and instantiates necessary renderers and asset loaders.
         """
+        self.started = time.perf_counter()
+        self.time_to_first_frame = None
+        self.startup_timings = {}
         pygame.init()
+        self.startup_timings["pygame.init"] = time.perf_counter() - self.started
+
+        step_started = time.perf_counter()
         self.screen = pygame.display.set_mode(
             settings.SIZE
         )
         pygame.display.set_caption(settings.SCREEN_TITLE)
+        self.startup_timings["set_mode"] = time.perf_counter() - step_started
 
         self.menu_renderer = MenuRenderer()
         self.game_renderer = GameRenderer()
-        self.sprite_loader = SpriteLoader()
-        self.font = pygame.font.Font(settings.FONT, settings.FONT_SIZE)
+        step_started = time.perf_counter()
+        if settings.ASYNC_ASSET_LOADING:
+            self.sprite_loader = AssetManager()
+            self.sprite_loader.add_progress_callback(self.on_assets_loaded)
+        else:
+            self.sprite_loader = SpriteLoader()
+        self.startup_timings["assets"] = time.perf_counter() - step_started
+        self.fonts = FontRegistry()
+        self.text_cache = TextCache(self.fonts)
+        self.font = self.fonts.get(settings.FONT, settings.FONT_SIZE)
 
-    def render(self, game_state, menu_state, action, moves_made):
+        self.dim_overlay = pygame.Surface(settings.SIZE)
+        self.dim_overlay.fill("black")
+        self.dim_overlay.set_alpha(settings.SCREEN_DIM)
+        self.compositor = LayerCompositor()
+        self.dirty_renderer = DirtyRectRenderer() if settings.DIRTY_RECT_RENDERING else None
+        self.last_frame = None
+
+    def render(self, game_state, menu_state, action, moves_made, alpha=1.0, overlay=None):
         """
         Main rendering method called every frame.
         Delegates rendering to specific methods based on the current game action.
+        The menu, pause and rules screens are drawn once and then reused from
+        the compositor until what they show changes.
         :param game_state: GameState object containing game data.
         :param menu_state: MenuState object containing menu button data.
         :param action: String representing the current game action.
         :param moves_made: Integer counter for the number of moves made.
+        :param alpha: (optional) Float between 0 and 1 used to interpolate moving
+        objects between the last two simulation steps.
+        :param overlay: (optional) List of strings drawn on top of the frame (frame-time statistics).
         :return: None
         """
+        self.sprite_loader.poll()
+        layer_key = self.get_layer_key(game_state, menu_state, action)
+        if self.dirty_renderer is not None:
+            if action in ["listen", "ferry", "win", "lose"]:
+                self.render_dirty(game_state, menu_state, action, moves_made, alpha, overlay)
+                return
+            self.dirty_renderer.reset()
+            frame = (action, layer_key, tuple(overlay) if overlay else None)
+            if self.last_frame == frame:
+                return  # nothing changed since the last frame
+            self.last_frame = frame
+
+        if layer_key is not None and self.compositor.blit(self.screen, action, layer_key):
+            if overlay:
+                self.render_overlay(overlay)
+            self.flip()
+            return
+
         self.render_background()
 
         if action == "menu":
             self.render_menu(menu_state)
+            if self.sprite_loader.is_loading():
+                self.render_loading()
 
         elif action in ["listen", "ferry", "pause", "win", "lose"]:
-            self.render_game_actions(game_state, menu_state, action, moves_made)
+            self.render_game_actions(game_state, menu_state, action, moves_made, alpha=alpha)
 
         elif action == "rules":
             self.render_rules()
 
+        if layer_key is not None:
+            self.compositor.store(self.screen, action, layer_key)
+        if overlay:
+            self.render_overlay(overlay)
         self.flip()
 
+    def render_dirty(self, game_state, menu_state, action, moves_made, alpha=1.0, overlay=None):
+        """
+        Renders the game screen in dirty-rect mode: the frame is recorded, compared with
+        the previous one and only the changed regions are redrawn and pushed to the display.
+        :param game_state: GameState object containing game data.
+        :param menu_state: MenuState object containing menu button data.
+        :param action: String representing the current game action.
+        :param moves_made: Integer counter for the number of moves made.
+        :param alpha: (optional) Float between 0 and 1 used to interpolate moving objects.
+        :param overlay: (optional) List of strings drawn on top of the frame.
+        :return: None
+        """
+        self.last_frame = None
+        recorder = DrawRecorder()
+        self.render_game_actions(game_state, menu_state, action, moves_made, recorder, alpha)
+        if overlay:
+            self.render_overlay(overlay, recorder)
+        rects = self.dirty_renderer.draw(
+            self.screen,
+            self.sprite_loader.sprites["BACKGROUND1"],
+            recorder.commands
+        )
+        if rects:
+            pygame.display.update(rects)
+
+    @staticmethod
+    def get_layer_key(game_state, menu_state, action):
+        """
+        Describe everything the menu, pause or rules screen shows, so that a cached
+        screen is only reused while it is still up to date.
+        :param game_state: GameState object containing game data.
+        :param menu_state: MenuState object containing menu button data.
+        :param action: String representing the current game action.
+        :return: Tuple representing the content of the screen, or None for screens that are not cached.
+        """
+        if action == "rules":
+            return ()
+        if action == "menu":
+            return tuple(
+                button.color for name, button in menu_state.buttons.items() if name.startswith("menu")
+            )
+        if action == "pause":
+            boat_pos = game_state.entities.boat.get_position()
+            return (
+                tuple(button.color for name, button in menu_state.buttons.items() if name.startswith("pause")),
+                boat_pos,
+                tuple(
+                    (entity.get_position(boat_pos), entity.sprite_name[0])
+                    for entity in game_state.entities.ents.values()
+                )
+            )
+        return None
+
     def render_menu(self, menu_state):
         """
         Renders the main menu screen with a dimmed background.
@@ -69,10 +191,53 @@ class View:
         self.menu_renderer.render_menu(
             menu_state,
             self.screen,
-            pygame.font.Font(settings.BUTTON_FONT, settings.BUTTON_FONT_SIZE)
+            self.text_cache
+        )
+
+    def render_loading(self):
+        """
+        Loading screen hook: shows how many images are ready while the rest load in the background.
+        :return: None
+        """
+        self.display_text(
+            f"{settings.LOADING_TEXT} {self.sprite_loader.loaded}/{self.sprite_loader.total}",
+            settings.LOADING_TEXT_POS,
+            settings.TEXT_COLOR,
+            settings.LOADING_FONT_SIZE,
+            settings.FONT
         )
 
-    def render_game_actions(self, game_state, menu_state, action, moves_made):
+    def render_overlay(self, lines, target=None):
+        """
+        Draws lines of text in the overlay corner, used for the frame-time statistics.
+        :param lines: List of strings, one per line.
+        :param target: (optional) Surface or DrawRecorder to draw the text on, defaults to the screen.
+        :return: None
+        """
+        if target is None:
+            target = self.screen
+        x, y = settings.PROFILE_OVERLAY_POS
+        for line in lines:
+            text_surface = self.text_cache.render(
+                line, settings.FONT, settings.PROFILE_OVERLAY_FONT_SIZE, settings.TEXT_COLOR
+            )
+            target.blit(text_surface, (x, y))
+            y += text_surface.get_height()
+
+    def on_assets_loaded(self, loaded, total):
+        """
+        Progress callback of the asset manager. Drops the cached screens, which still show
+        placeholders or an old loading progress.
+        :param loaded: Integer representing the number of images ready.
+        :param total: Integer representing the number of images.
+        :return: None
+        """
+        self.compositor.invalidate()
+        self.last_frame = None
+        if self.dirty_renderer is not None:
+            self.dirty_renderer.reset()
+
+    def render_game_actions(self, game_state, menu_state, action, moves_made, target=None, alpha=1.0):
         """
         Renders the active game state, including entities and UI elements.
         Handles rendering for 'listen', 'ferry', 'pause', 'win', and 'lose' actions.
@@ -80,15 +245,19 @@ class View:
         :param menu_state: MenuState object containing menu button data.
         :param action: String representing the current game action.
         :param moves_made: Integer counter for the number of moves made.
+        :param target: (optional) Surface or DrawRecorder to draw the game on, defaults to the screen.
+        :param alpha: (optional) Float between 0 and 1 used to interpolate moving objects.
         :return: None
         """
-        self.game_renderer.render(game_state, self.screen, self.sprite_loader)
+        if target is None:
+            target = self.screen
+        self.game_renderer.render(game_state, target, self.sprite_loader, alpha)
         if action == "pause":
             self.render_dim()
             self.menu_renderer.render_pause(
                 menu_state,
                 self.screen,
-                pygame.font.Font(settings.BUTTON_FONT, settings.BUTTON_FONT_SIZE)
+                self.text_cache
             )
         else:
             self.display_text(
@@ -96,7 +265,8 @@ class View:
                 settings.MOVES_MADE_POS,
                 settings.TEXT_COLOR,
                 settings.MOVES_MADE_FONT_SIZE,
-                settings.FONT
+                settings.FONT,
+                target
             )
 
     def render_rules(self):
@@ -106,6 +276,7 @@ class View:
         self.render_dim()
         self.menu_renderer.render_rules(
             self.screen,
+            self.text_cache,
             settings.RULES_START_POS,
             settings.TEXT_COLOR,
             settings.RULES_FONT_SIZE,
@@ -119,10 +290,7 @@ class View:
         Draws a semi-transparent black overlay on the screen to dim the background.
         Used for menus and overlays.
         """
-        dim_overlay = pygame.Surface(settings.SIZE)
-        dim_overlay.fill("black")
-        dim_overlay.set_alpha(settings.SCREEN_DIM)
-        self.screen.blit(dim_overlay, (0, 0))
+        self.screen.blit(self.dim_overlay, (0, 0))
 
     def render_end(self, end: str, moves_made):
         """
@@ -167,15 +335,17 @@ class View:
             (0, 0)
         )
 
-    @staticmethod
-    def flip():
+    def flip(self):
         """
         Flip the display with the pygame display flip method.
+        Records the time to the first frame.
         :return: None
         """
         pygame.display.flip()
+        if self.time_to_first_frame is None:
+            self.time_to_first_frame = time.perf_counter() - self.started
 
-    def display_text(self, text, pos, color, size, font):
+    def display_text(self, text, pos, color, size, font, target=None):
         """
         Renders and blits text onto the screen at a specified position.
         :param text: String of text to be displayed.
@@ -183,12 +353,234 @@ class View:
         :param color: Color of the text.
         :param size: Size of the font.
         :param font: String representing the font file path.
+        :param target: (optional) Surface or DrawRecorder to draw the text on, defaults to the screen.
         :return: None
         """
-        py_font = pygame.font.Font(font, size)
-        text_surface = py_font.render(text, True, color)
+        if target is None:
+            target = self.screen
+        text_surface = self.text_cache.render(text, font, size, color)
         text_box = text_surface.get_rect(center=pos)
-        self.screen.blit(text_surface, text_box)
+        target.blit(text_surface, text_box)
+
+
+class DrawRecorder:
+    """
+    Stands in for the screen and records blits instead of drawing them.
+    Attributes:
+        commands: List of tuples (surface, destination rect, area) in drawing order.
+    """
+
+    def __init__(self):
+        self.commands = []
+
+    def blit(self, surface, dest, area=None):
+        """
+        Record a blit with the same arguments as pygame.Surface.blit.
+        :param surface: Pygame Surface object to draw.
+        :param dest: Position (x, y) or Rect of the top left corner.
+        :param area: (optional) Rect representing the part of the surface to draw.
+        :return: None
+        """
+        if isinstance(dest, pygame.Rect):
+            dest = dest.topleft
+        size = surface.get_size() if area is None else pygame.Rect(area).size
+        self.commands.append((surface, pygame.Rect(dest, size), area))
+
+
+class DirtyRectRenderer:
+    """
+    Compares the recorded blits of a frame with the previous frame and redraws only
+    the regions that changed, restoring them from the background first.
+    Attributes:
+        previous: List of the recorded blits of the previous frame, or None when the
+        whole screen has to be redrawn.
+    """
+
+    def __init__(self):
+        self.previous = None
+
+    def reset(self):
+        """
+        Force a full redraw on the next frame, e.g. after another screen was shown.
+        :return: None
+        """
+        self.previous = None
+
+    def draw(self, screen, background, commands):
+        """
+        Draw a frame, updating only what changed since the previous one.
+        :param screen: Pygame screen object.
+        :param background: Pygame Surface object of the background.
+        :param commands: List of tuples (surface, destination rect, area) recorded by a DrawRecorder.
+        :return: List of Rect objects representing the regions of the screen that were redrawn.
+        """
+        previous, self.previous = self.previous, commands
+        if previous is None:
+            screen.blit(background, (0, 0))
+            for surface, rect, area in commands:
+                screen.blit(surface, rect, area)
+            return [screen.get_rect()]
+
+        old = Counter(self.signature(command) for command in previous)
+        new = Counter(self.signature(command) for command in commands)
+        changed = [pygame.Rect(signature[1]) for signature in ((old - new) + (new - old)).elements()]
+        dirty = self.merge(changed, screen.get_rect())
+
+        for dirty_rect in dirty:
+            screen.set_clip(dirty_rect)
+            screen.blit(background, dirty_rect, dirty_rect)
+            for surface, rect, area in commands:
+                if rect.colliderect(dirty_rect):
+                    screen.blit(surface, rect, area)
+        screen.set_clip(None)
+        return dirty
+
+    @staticmethod
+    def signature(command):
+        """
+        Describe a recorded blit with hashable values.
+        :param command: Tuple (surface, destination rect, area).
+        :return: Tuple (surface, rect tuple, area tuple or None).
+        """
+        surface, rect, area = command
+        return surface, tuple(rect), None if area is None else tuple(pygame.Rect(area))
+
+    @staticmethod
+    def merge(rects, bounds):
+        """
+        Clip rectangles to the screen and join the overlapping ones.
+        :param rects: List of Rect objects.
+        :param bounds: Rect object representing the screen.
+        :return: List of non-overlapping Rect objects.
+        """
+        merged = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if rect.width == 0 or rect.height == 0:
+                continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+
+class LayerCompositor:
+    """
+    Keeps a copy of the finished frame of the static screens (menu, pause, rules),
+    so showing them again costs a single blit.
+    Attributes:
+        layers: Dictionary mapping screen names to tuples (key, surface), the key
+        describes what the cached surface shows.
+    """
+
+    def __init__(self):
+        self.layers = {}
+
+    def blit(self, screen, name, key):
+        """
+        Draw the cached screen if it is still up to date.
+        :param screen: Pygame screen object.
+        :param name: String representing the name of the screen ("menu", "pause" or "rules").
+        :param key: Tuple describing what the screen should show.
+        :return: Boolean True if the cached screen was drawn, False if it has to be rendered.
+        """
+        layer = self.layers.get(name)
+        if layer is None or layer[0] != key:
+            return False
+        screen.blit(layer[1], (0, 0))
+        return True
+
+    def store(self, screen, name, key):
+        """
+        Cache the frame that was just rendered.
+        :param screen: Pygame screen object holding the rendered screen.
+        :param name: String representing the name of the screen.
+        :param key: Tuple describing what the screen shows.
+        :return: None
+        """
+        self.layers[name] = (key, screen.copy())
+
+    def invalidate(self, name=None):
+        """
+        Drop a cached screen, or all of them.
+        :param name: (optional) String representing the name of the screen, None drops every screen.
+        :return: None
+        """
+        if name is None:
+            self.layers.clear()
+        else:
+            self.layers.pop(name, None)
+
+
+class FontRegistry:
+    """
+    Opens every font file once per size instead of on every frame.
+    Attributes:
+        fonts: Dictionary mapping tuples (font file path, size) to pygame Font objects.
+    """
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, path, size):
+        """
+        Get the font for a font file and size, opening it on first use.
+        :param path: String representing the font file path.
+        :param size: Integer representing the font size.
+        :return: Pygame Font object.
+        """
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(path, size)
+            self.fonts[key] = font
+        return font
+
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces, so unchanged text is rasterized only once.
+    Attributes:
+        fonts: FontRegistry object providing the fonts.
+        max_size: Integer representing the maximum number of cached surfaces.
+        surfaces: Ordered dictionary mapping (text, font path, size, color, antialias)
+        to rendered surfaces, least recently used first.
+        hits: Integer representing the number of renders served from the cache.
+        misses: Integer representing the number of renders that rasterized text.
+    """
+
+    def __init__(self, fonts, max_size=settings.TEXT_CACHE_SIZE):
+        self.fonts = fonts
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font, size, color, antialias=True):
+        """
+        Get the surface of a rendered text, rendering it only if it is not cached.
+        :param text: String of text to be rendered.
+        :param font: String representing the font file path.
+        :param size: Integer representing the font size.
+        :param color: Color of the text.
+        :param antialias: (optional) Boolean True to render with antialiasing.
+        :return: Pygame Surface object with the rendered text.
+        """
+        key = (text, font, size, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(font, size).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
 
 
 class MenuRenderer:
@@ -196,27 +588,28 @@ class MenuRenderer:
     Handles the rendering of menu-related elements, such as buttons and rule text.
     """
 
-    def render_menu(self, menu_state, screen, font: pygame.font.Font):
+    def render_menu(self, menu_state, screen, text_cache):
         """
         Renders the buttons for the main menu (Start, Rules, Quit).
         """
-        self.show_button(menu_state.buttons["menu_start"], font, screen)
-        self.show_button(menu_state.buttons["menu_rules"], font, screen)
-        self.show_button(menu_state.buttons["menu_quit"], font, screen)
+        self.show_button(menu_state.buttons["menu_start"], text_cache, screen)
+        self.show_button(menu_state.buttons["menu_rules"], text_cache, screen)
+        self.show_button(menu_state.buttons["menu_quit"], text_cache, screen)
 
-    def render_pause(self, menu_state, screen, font: pygame.font.Font):
+    def render_pause(self, menu_state, screen, text_cache):
         """
         Renders the buttons for the pause menu (Resume, Quit, Rules).
         """
-        self.show_button(menu_state.buttons["pause_resume"], font, screen)
-        self.show_button(menu_state.buttons["pause_quit"], font, screen)
-        self.show_button(menu_state.buttons["pause_rules"], font, screen)
+        self.show_button(menu_state.buttons["pause_resume"], text_cache, screen)
+        self.show_button(menu_state.buttons["pause_quit"], text_cache, screen)
+        self.show_button(menu_state.buttons["pause_rules"], text_cache, screen)
 
     @staticmethod
-    def render_rules(screen, pos, color, size, font, text_height, text_spacing):
+    def render_rules(screen, text_cache, pos, color, size, font, text_height, text_spacing):
         """
         Renders the list of game rules on the screen.
         :param screen: Pygame screen object.
+        :param text_cache: TextCache object used to render the text.
         :param pos: Tuple representing the (x, y) position for the text center.
         :param color: Color of the text.
         :param size: Size of the font.
@@ -225,27 +618,26 @@ class MenuRenderer:
         :param text_spacing: Spacing between lines of text.
         :return: None
         """
-        py_font = pygame.font.Font(font, size)
         multiplier = 1
         for line in settings.RULES:
-            text_surface = py_font.render(line, True, color)
+            text_surface = text_cache.render(line, font, size, color)
             text_box = text_surface.get_rect(
                 center=(pos[0], pos[1] + text_height * multiplier + text_spacing * multiplier))
             screen.blit(text_surface, text_box)
             multiplier += 1
 
     @staticmethod
-    def show_button(btn, button_font, screen):
+    def show_button(btn, text_cache, screen):
         """
         Draws a single button with its text onto the screen.
         :param btn: Button object representing the button to be rendered.
-        :param button_font: Pygame font object used to render the button text.
+        :param text_cache: TextCache object used to render the button text.
         :param screen: Screen object on which to render the button.
         :return: None
         """
         pygame.draw.rect(screen, btn.color, btn.get_dimensions())
 
-        text_surface = button_font.render(btn.text, False, btn.text_color)
+        text_surface = text_cache.render(btn.text, settings.BUTTON_FONT, btn.font_size, btn.text_color, False)
         text_box = text_surface.get_rect()
         text_box.center = btn.get_center()
         screen.blit(text_surface, text_box)
@@ -256,51 +648,55 @@ class GameRenderer:
     Handles the rendering of gameplay elements, including the boat and characters (entities).
     """
 
-    def render(self, game_state, screen, sprite_loader):
+    def render(self, game_state, screen, sprite_loader, alpha=1.0):
         """
         Orchestrates the rendering of all game entities and the boat.
         :param game_state: GameState object containing game data.
         :param screen: Pygame screen object.
         :param sprite_loader: SpriteLoader object used to load and cache game assets.
+        :param alpha: (optional) Float between 0 and 1 used to interpolate moving objects.
         :return: None
         """
-        self.render_entities(game_state, screen, sprite_loader)
+        self.render_entities(game_state, screen, sprite_loader, alpha)
 
         # render boat
-        self.render_boat(game_state.entities.boat, screen, sprite_loader, game_state)
+        self.render_boat(game_state.entities.boat, screen, sprite_loader, game_state, alpha)
 
-    def render_boat(self, boat, screen, sprite_loader, game_state):
+    def render_boat(self, boat, screen, sprite_loader, game_state, alpha=1.0):
         """
         Renders the boat and any entities currently on board.
         :param boat: Boat object representing the boat to be rendered.
         :param screen: Pygame screen object.
         :param sprite_loader: SpriteLoader object used to load and cache game assets.
         :param game_state: GameState object containing game data.
+        :param alpha: (optional) Float between 0 and 1 used to interpolate moving objects.
         :return: None
         """
         self.render_entity(
-            game_state.entities.boat, screen, sprite_loader
+            game_state.entities.boat, screen, sprite_loader, alpha=alpha
         )
+        boat_pos = boat.get_render_position(alpha=alpha)
         entities_on_boat = boat.get_held_entity_names()
         for name in entities_on_boat:
             entity = game_state.entities.ents[name]
-            self.render_entity(entity, screen, sprite_loader, True, entity.get_index_on_boat(), boat.get_position())
+            self.render_entity(entity, screen, sprite_loader, True, entity.get_index_on_boat(), boat_pos, alpha)
 
-    def render_entities(self, game_state, screen, sprite_loader):
+    def render_entities(self, game_state, screen, sprite_loader, alpha=1.0):
         """
         Renders all entities that are currently on the shores (not on the boat).
         :param game_state: GameState object containing game data.
         :param screen: Pygame screen object.
         :param sprite_loader: SpriteLoader object used to load and cache game assets.
+        :param alpha: (optional) Float between 0 and 1 used to interpolate moving objects.
         :return: None
         """
         for entity in game_state.entities.ents.values():
             if entity.on_boat:
                 continue
-            self.render_entity(entity, screen, sprite_loader)
+            self.render_entity(entity, screen, sprite_loader, alpha=alpha)
 
     @staticmethod
-    def render_entity(entity, screen, sprite_loader, on_boat=False, index=None, boat_pos=None):
+    def render_entity(entity, screen, sprite_loader, on_boat=False, index=None, boat_pos=None, alpha=1.0):
         """
         Draws a single entity's sprite at its current position.
         Handles scaling differences for entities on the boat vs. on shore.
@@ -310,25 +706,22 @@ class GameRenderer:
         :param on_boat: (optional) Boolean flag indicating whether the entity is on the boat.
         :param index: (optional) Integer representing the index of the entity on the boat.
         :param boat_pos: (optional) Tuple representing the position of the boat (x, y).
+        :param alpha: (optional) Float between 0 and 1 used to interpolate moving objects.
         :return:
         """
-        image = sprite_loader.sprites[
-            entity.sprite_name[0]
-        ]
         if not on_boat:
             screen.blit(
-                image,
-                entity.get_position(),
+                sprite_loader.sprites[entity.sprite_name[0]],
+                entity.get_render_position(alpha=alpha),
             )
         else:
-            if entity.missionary_to_eat is not None:
-                rect = pygame.Rect((0, 0), settings.ENTITY_SPRITE_SCALE)
-            else:
-                rect = pygame.Rect((0, 0), settings.ENTITY_ON_BOAT_SCALE)
+            # a cannibal eating on the boat is drawn whole, the others use the cropped variant
+            name = entity.sprite_name[0]
+            if entity.missionary_to_eat is None:
+                name += settings.ON_BOAT_SPRITE_SUFFIX
             screen.blit(
-                image,
-                entity.get_position(boat_pos),
-                area=rect
+                sprite_loader.sprites[name],
+                entity.get_render_position(boat_pos, alpha)
             )
 
         # render hitboxes
@@ -344,30 +737,163 @@ class GameRenderer:
 class SpriteLoader:
     """
     Responsible for loading and caching game assets (sprites) from disk.
+    Every sprite, including the cropped variants drawn on the boat, is packed into one
+    atlas surface. The scaled atlas is cached on disk keyed by the modification times
+    of the images and the target scales, so later launches skip decoding and scaling.
+    Attributes:
+        sprites: Dictionary mapping sprite names to Pygame Surface objects (subsurfaces of the atlas).
+        atlas: Pygame Surface object holding every sprite.
+        regions: Dictionary mapping sprite names to Rect objects representing their place in the atlas.
+        cache_path: String representing the path of the cache file, or None if caching is disabled.
+        cache_key: Bytes of the fingerprint of the images and scales the atlas is made from.
     """
 
-    def __init__(self):
-        self.sprites = {}
-        for name in settings.ENTITY_ASSET_PATHS.keys():
-            self.sprites[name] = self.load_sprite(
-                settings.ENTITY_ASSET_PATHS[name],
-                "entity"
-            )
+    SCALES = {
+        "entity": settings.ENTITY_SPRITE_SCALE,
+        "boat": settings.BOAT_SPRITE_SCALE,
+        "background": settings.BACKGROUND_SPRITE_SCALE
+    }
 
-        for name in settings.BOAT_ASSET_PATHS.keys():
-            self.sprites[name] = self.load_sprite(
-                settings.BOAT_ASSET_PATHS[name],
-                "boat"
-            )
+    def __init__(self, cache_dir=settings.SPRITE_CACHE_DIR):
+        sources = self.get_sources()
+        self.regions, atlas_size = self.pack(sources)
+        self.cache_path = None
+        if cache_dir is not None:
+            self.cache_path = os.path.join(cache_dir, "sprites.atlas")
 
-        for name in settings.BACKGROUND_PATH.keys():
-            self.sprites[name] = self.load_sprite(
-                settings.BACKGROUND_PATH[name],
-                "background"
-            )
+        self.cache_key = self.get_cache_key(sources, atlas_size)
+        self.atlas = self.load_atlas(atlas_size, self.cache_key)
+        if self.atlas is None:
+            self.atlas = self.build_atlas(sources, atlas_size)
+            self.save_atlas(self.cache_key)
+        self.sprites = {name: self.atlas.subsurface(rect) for name, rect in self.regions.items()}
 
     @staticmethod
-    def load_sprite(path, sprite_type):
+    def get_sources():
+        """
+        List the sprites of the atlas.
+        :return: List of tuples (name, path, sprite type, crop size or None).
+        """
+        sources = []
+        for name, path in settings.ENTITY_ASSET_PATHS.items():
+            sources.append((name, path, "entity", None))
+            sources.append((name + settings.ON_BOAT_SPRITE_SUFFIX, path, "entity", settings.ENTITY_ON_BOAT_SCALE))
+        for name, path in settings.BOAT_ASSET_PATHS.items():
+            sources.append((name, path, "boat", None))
+        for name, path in settings.BACKGROUND_PATH.items():
+            sources.append((name, path, "background", None))
+        return sources
+
+    def pack(self, sources):
+        """
+        Place the sprites in rows as wide as the widest sprite, the tallest first.
+        :param sources: List of tuples (name, path, sprite type, crop size or None).
+        :return: Tuple (dictionary mapping sprite names to Rect objects, atlas size (width, height)).
+        """
+        sizes = {name: crop or self.SCALES[sprite_type] for name, _, sprite_type, crop in sources}
+        width = max(size[0] for size in sizes.values())
+        regions = {}
+        x = y = row_height = 0
+        for name in sorted(sizes, key=lambda key: -sizes[key][1]):
+            size = sizes[name]
+            if x + size[0] > width:
+                x, y, row_height = 0, y + row_height, 0
+            regions[name] = pygame.Rect((x, y), size)
+            x += size[0]
+            row_height = max(row_height, size[1])
+        return regions, (width, y + row_height)
+
+    def get_cache_key(self, sources, atlas_size):
+        """
+        Fingerprint the images and the scales the atlas is made from.
+        :param sources: List of tuples (name, path, sprite type, crop size or None).
+        :param atlas_size: Tuple representing the size of the atlas (width, height).
+        :return: Bytes of the fingerprint.
+        """
+        parts = [atlas_size]
+        for name, path, sprite_type, crop in sources:
+            parts.append((name, path, os.stat(path).st_mtime_ns, self.SCALES[sprite_type], crop,
+                          tuple(self.regions[name])))
+        return hashlib.sha1(repr(parts).encode()).digest()
+
+    def load_atlas(self, atlas_size, cache_key):
+        """
+        Load the atlas pixels from the cache file if it was made from the same images and scales.
+        :param atlas_size: Tuple representing the size of the atlas (width, height).
+        :param cache_key: Bytes of the fingerprint of the images and scales.
+        :return: Pygame Surface object representing the atlas, or None on a cache miss.
+        """
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return None
+        with open(self.cache_path, "rb") as file:
+            data = file.read()
+        pixels = data[len(cache_key):]
+        if data[:len(cache_key)] != cache_key or len(pixels) != atlas_size[0] * atlas_size[1] * 4:
+            return None
+        return pygame.image.frombytes(pixels, atlas_size, "RGBA").convert_alpha()
+
+    def build_atlas(self, sources, atlas_size):
+        """
+        Load, scale and crop every sprite and copy it into a new atlas.
+        :param sources: List of tuples (name, path, sprite type, crop size or None).
+        :param atlas_size: Tuple representing the size of the atlas (width, height).
+        :return: Pygame Surface object representing the atlas.
+        """
+        atlas = pygame.Surface(atlas_size, pygame.SRCALPHA).convert_alpha()
+        atlas.fill((0, 0, 0, 0))
+        images = {}
+        for name, path, sprite_type, crop in sources:
+            if path not in images:
+                images[path] = self.load_sprite(path, sprite_type)
+            self.copy_sprite(atlas, images[path], name, crop)
+        return atlas
+
+    def copy_sprite(self, atlas, image, name, crop):
+        """
+        Copy a scaled image into the region of a sprite in the atlas.
+        :param atlas: Pygame Surface object representing the atlas.
+        :param image: Pygame Surface object representing the scaled image.
+        :param name: String representing the name of the sprite.
+        :param crop: Tuple representing the size of the top left part of the image to copy, or None for all of it.
+        :return: None
+        """
+        region = self.regions[name]
+        area = None if crop is None else pygame.Rect((0, 0), crop)
+        atlas.fill((0, 0, 0, 0), region)
+        # adding to the cleared region copies the pixels as they are, alpha included
+        atlas.blit(image, region, area, pygame.BLEND_RGBA_ADD)
+
+    def save_atlas(self, cache_key):
+        """
+        Write the atlas pixels to the cache file.
+        :param cache_key: Bytes of the fingerprint of the images and scales.
+        :return: None
+        """
+        if self.cache_path is None:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        temporary_path = self.cache_path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(cache_key)
+            file.write(pygame.image.tobytes(self.atlas, "RGBA"))
+        os.replace(temporary_path, self.cache_path)
+
+    def is_loading(self):
+        """
+        Check whether sprites are still being loaded.
+        :return: Boolean False, the sprite loader loads every sprite up front.
+        """
+        return False
+
+    def poll(self):
+        """
+        Finish the sprites loaded since the last call.
+        :return: Integer representing the number of images finished, always 0 as every sprite is loaded up front.
+        """
+        return 0
+
+    @classmethod
+    def load_sprite(cls, path, sprite_type):
         """
         Loads an image from a file path, converts it for Pygame, and scales it according to its type.
         :param path: String of a file path to the image asset.
@@ -376,21 +902,142 @@ class SpriteLoader:
         """
         image = pygame.image.load(path)
         image = image.convert_alpha()
+        return pygame.transform.smoothscale(image, cls.SCALES[sprite_type])
 
-        if sprite_type == "entity":
-            image = pygame.transform.smoothscale(
-                image,
-                settings.ENTITY_SPRITE_SCALE
-            )
-        elif sprite_type == "boat":
-            image = pygame.transform.smoothscale(
-                image,
-                settings.BOAT_SPRITE_SCALE
-            )
-        else:
-            image = pygame.transform.smoothscale(
-                image,
-                settings.BACKGROUND_SPRITE_SCALE
-            )
 
-        return image
+class AssetManager(SpriteLoader):
+    """
+    Sprite loader that lets the menu show up before every sprite is ready.
+    On a cache miss the menu-critical sprites are loaded right away and the other images
+    are decoded and scaled by a background thread. `poll`, called every frame on the main
+    thread, converts the finished images and copies them into the atlas. Until then their
+    atlas regions hold a placeholder, which the renderers draw like any other sprite.
+    Attributes:
+        critical: Tuple of strings representing the names of the sprites needed by the menu.
+        pending: Dictionary mapping the paths of the images still loading to their sources.
+        finished: Queue of tuples (path, scaled surface or exception) filled by the loading thread.
+        callbacks: List of functions called with (loaded, total) after every finished image.
+        loaded: Integer representing the number of images copied into the atlas.
+        total: Integer representing the number of images of the atlas.
+        thread: Thread object loading the images, or None if nothing was loaded in the background.
+    """
+
+    def __init__(self, cache_dir=settings.SPRITE_CACHE_DIR, critical=tuple(settings.BACKGROUND_PATH)):
+        self.critical = critical
+        self.pending = {}
+        self.finished = queue.Queue()
+        self.callbacks = []
+        self.loaded = 0
+        self.total = 0
+        self.thread = None
+        super().__init__(cache_dir)
+
+    def add_progress_callback(self, callback):
+        """
+        Register a function to call after every image finished loading.
+        :param callback: Function taking the number of loaded images and the total number of images.
+        :return: None
+        """
+        self.callbacks.append(callback)
+
+    def get_progress(self):
+        """
+        Get the share of the images that are ready.
+        :return: Float between 0 and 1.
+        """
+        if not self.pending:
+            return 1.0
+        return self.loaded / self.total
+
+    def build_atlas(self, sources, atlas_size):
+        """
+        Load the images of the menu-critical sprites, fill the other regions with a
+        placeholder and start loading their images in the background.
+        :param sources: List of tuples (name, path, sprite type, crop size or None).
+        :param atlas_size: Tuple representing the size of the atlas (width, height).
+        :return: Pygame Surface object representing the atlas.
+        """
+        atlas = pygame.Surface(atlas_size, pygame.SRCALPHA).convert_alpha()
+        atlas.fill((0, 0, 0, 0))
+
+        images = {}
+        for source in sources:
+            images.setdefault(source[1], []).append(source)
+        self.total = len(images)
+
+        background = []
+        for path, group in images.items():
+            sprite_type = group[0][2]
+            if any(name in self.critical for name, _, _, _ in group):
+                image = self.load_sprite(path, sprite_type)
+                for name, _, _, crop in group:
+                    self.copy_sprite(atlas, image, name, crop)
+                self.loaded += 1
+                continue
+            for name, _, _, _ in group:
+                atlas.fill(settings.PLACEHOLDER_COLOR, self.regions[name])
+            self.pending[path] = group
+            background.append((path, sprite_type))
+
+        if background:
+            self.thread = threading.Thread(target=self.load_images, args=(background,), daemon=True)
+            self.thread.start()
+        return atlas
+
+    def load_images(self, images):
+        """
+        Thread task: decode and scale images without touching the display.
+        :param images: List of tuples (path, sprite type).
+        :return: None
+        """
+        for path, sprite_type in images:
+            try:
+                image = pygame.image.load(path)
+                if image.get_bitsize() < 24:
+                    image = image.convert(32, pygame.SRCALPHA)  # smoothscale needs 24 or 32 bits
+                image = pygame.transform.smoothscale(image, self.SCALES[sprite_type])
+            except (pygame.error, OSError) as error:
+                image = error
+            self.finished.put((path, image))
+
+    def save_atlas(self, cache_key):
+        """
+        Write the atlas pixels to the cache file once every image is in it.
+        :param cache_key: Bytes of the fingerprint of the images and scales.
+        :return: None
+        """
+        if not self.pending:
+            super().save_atlas(cache_key)
+
+    def is_loading(self):
+        """
+        Check whether images are still being loaded in the background.
+        :return: Boolean True if some sprites still show a placeholder, False otherwise.
+        """
+        return bool(self.pending)
+
+    def poll(self):
+        """
+        Convert the images the background thread finished since the last call and copy them
+        into the atlas. Saves the atlas to the cache once the last image is in.
+        :return: Integer representing the number of images finished.
+        """
+        finished = 0
+        while True:
+            try:
+                path, image = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(image, Exception):
+                raise image
+            image = image.convert_alpha()
+            for name, _, _, crop in self.pending.pop(path):
+                self.copy_sprite(self.atlas, image, name, crop)
+            self.loaded += 1
+            finished += 1
+            for callback in self.callbacks:
+                callback(self.loaded, self.total)
+
+        if finished and not self.pending:
+            self.save_atlas(self.cache_key)
+        return finished